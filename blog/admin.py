@@ -1,5 +1,8 @@
+from collections import defaultdict
+
 from django.contrib import admin
 from django.utils.html import format_html
+from . import reactions
 from .models import (
     CustomUser,
     Profile,
@@ -20,7 +23,6 @@ admin.site.register(CustomUser)
 admin.site.register(Profile)
 admin.site.register(Category)
 admin.site.register(Comment)
-admin.site.register(Reaction)
 admin.site.register(BlogMedia)
 admin.site.register(Bookmark)
 admin.site.register(UserActivity)
@@ -63,6 +65,35 @@ class BlogAdmin(admin.ModelAdmin):
     featured_image_preview.short_description = 'Featured Image'
 
 
+# ----------------------------
+# REACTION ADMIN (writes go through reactions.py, which keeps ReactionCount exact)
+# ----------------------------
+@admin.register(Reaction)
+class ReactionAdmin(admin.ModelAdmin):
+    list_display = ('id', 'user', 'blog', 'reaction_type', 'created_at')
+    list_filter = ('reaction_type', 'created_at')
+    search_fields = ('user__username', 'blog__title')
+    raw_id_fields = ('user', 'blog')
+
+    def get_readonly_fields(self, request, obj=None):
+        # Moving a reaction to another user / blog = delete it and add a new one
+        return ('user', 'blog') if obj is not None else ()
+
+    def save_model(self, request, obj, form, change):
+        reactions.apply(obj.user_id, obj.blog_id, obj.reaction_type)
+        obj.pk = Reaction.objects.filter(user_id=obj.user_id, blog_id=obj.blog_id).values_list('pk', flat=True).first()
+
+    def delete_model(self, request, obj):
+        reactions.apply(obj.user_id, obj.blog_id, None)
+
+    def delete_queryset(self, request, queryset):
+        targets = defaultdict(dict)
+        for user_id, blog_id in queryset.values_list('user_id', 'blog_id'):
+            targets[user_id][blog_id] = None
+        for user_id, blogs in targets.items():
+            reactions.apply_many(user_id, blogs)
+
+
 # ----------------------------
 # NOTIFICATION ADMIN ENHANCEMENT
 # ----------------------------
@@ -6,3 +6,4 @@ class BlogConfig(AppConfig):
 
     def ready(self):
         import blog.signals  # 👈 this auto-registers signals on startup
+        import blog.ratelimit  # registers the shared-cache check (blog.W001)
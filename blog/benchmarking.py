@@ -0,0 +1,61 @@
+import json
+import math
+import platform
+import subprocess
+from datetime import datetime, timezone
+
+
+# ==========================================================
+# 🔹 Shared helpers for the bench_* management commands
+# ==========================================================
+def percentile(sorted_samples, pct):
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_samples:
+        return None
+    rank = max(1, math.ceil(pct / 100 * len(sorted_samples)))
+    return sorted_samples[rank - 1]
+
+
+def summarize(samples_ms):
+    """Return count / mean / p50 / p95 / p99 / max (ms) for a list of samples."""
+    samples = sorted(samples_ms)
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "mean_ms": round(sum(samples) / len(samples), 3),
+        "p50_ms": round(percentile(samples, 50), 3),
+        "p95_ms": round(percentile(samples, 95), 3),
+        "p99_ms": round(percentile(samples, 99), 3),
+        "max_ms": round(samples[-1], 3),
+    }
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def build_report(name, results, **params):
+    """Wrap benchmark results with enough metadata to compare runs across commits."""
+    return {
+        "benchmark": name,
+        "revision": git_revision(),
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "python": platform.python_version(),
+        "params": params,
+        "results": results,
+    }
+
+
+def write_report(report, stdout, output=None):
+    """Print the JSON report and optionally save it to `output`."""
+    text = json.dumps(report, indent=2, default=str)
+    if output:
+        with open(output, "w") as fh:
+            fh.write(text + "\n")
+    stdout.write(text)
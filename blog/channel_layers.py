@@ -0,0 +1,61 @@
+import asyncio
+import time
+from copy import deepcopy
+
+from channels.layers import InMemoryChannelLayer
+
+
+# ==========================================================
+# 🔹 In-process channel layer (single node / tests)
+# ==========================================================
+class TunedInMemoryChannelLayer(InMemoryChannelLayer):
+    """
+    In-memory channel layer for single-process deployments and tests.
+
+    The stock InMemoryChannelLayer scans every channel and group on each
+    receive() / group_send() to expire old messages, and group_send() spawns
+    one task plus one deepcopy per member. With thousands of sockets that
+    turns every broadcast into O(clients²) work. This layer:
+    - runs the expiry sweep at most once per `clean_interval` seconds
+    - deep-copies the message once per group_send (not once per member)
+      and enqueues a shallow copy of it directly
+    """
+
+    def __init__(self, clean_interval=1.0, **kwargs):
+        super().__init__(**kwargs)
+        self.clean_interval = clean_interval
+        self._next_clean = 0.0
+
+    def _clean_expired(self):
+        now = time.time()
+        if now < self._next_clean:
+            return
+        self._next_clean = now + self.clean_interval
+        super()._clean_expired()
+
+    async def group_send(self, group, message):
+        assert isinstance(message, dict), "Message is not a dict"
+        self.require_valid_group_name(group)
+        self._clean_expired()
+
+        members = self.groups.get(group)
+        if not members:
+            return
+
+        expires = time.time() + self.expiry
+        payload = deepcopy(message)
+        for channel in list(members):
+            queue = self.channels.get(channel)
+            if queue is None:
+                queue = self.channels.setdefault(
+                    channel, asyncio.Queue(maxsize=self.get_capacity(channel))
+                )
+            try:
+                # Shallow copy: a handler that sets / pops top-level keys
+                # can't leak into other members' events, but nested values
+                # are shared by every member, so handlers must treat them as
+                # read-only (outbound._merge builds new dicts instead).
+                queue.put_nowait((expires, dict(payload)))
+            except asyncio.QueueFull:
+                # Same as the base layer: a full member is skipped.
+                continue
@@ -159,18 +159,35 @@
 #             "message": f"Reaction received: {data}"
 #         }))
 
+import asyncio
 import json
+from urllib.parse import parse_qs
 from channels.generic.websocket import AsyncWebsocketConsumer
 from channels.db import database_sync_to_async
-from .models import Reaction, Comment ,Notification
+from django.contrib.auth.models import AnonymousUser
+from .models import Blog, Comment ,Notification
+from . import notifications, presence, reaction_groups, reactions
+from .signals import comment_event
+from .outbound import OutboundQueueMixin
+from .ratelimit import RateLimitedConsumerMixin
 
 
 # ==============================================
 # 🔹 BLOG CONSUMER (For real-time blog updates)
 # ==============================================
-class BlogConsumer(AsyncWebsocketConsumer):
+class BlogConsumer(RateLimitedConsumerMixin, OutboundQueueMixin, AsyncWebsocketConsumer):
+    """
+    Viewers of one blog. Clients can react / comment over the socket:
+        {"action": "reaction", "reaction_type": "like"}   (null removes it)
+        {"action": "comment", "content": "..."}
+    The sender is always scope["user"]; each message is one thread-pool hop
+    (write + counters + author notification) and one delta broadcast.
+    Connections are counted in presence.py; viewers get "presence_update".
+    """
+    MAX_COMMENT_LENGTH = 5000
+
     async def connect(self):
-        self.blog_id = self.scope["url_route"]["kwargs"]["blog_id"]
+        self.blog_id = int(self.scope["url_route"]["kwargs"]["blog_id"])
         self.group_name = f"blog_{self.blog_id}"
 
         # Join WebSocket group for this blog
@@ -179,19 +196,49 @@ class BlogConsumer(AsyncWebsocketConsumer):
 
         print(f"✅ WebSocket connected → Blog ID: {self.blog_id}")
 
-        # Send initial data
-        summary = await self.get_reaction_summary()
-        comments = await self.get_comments()
+        # Count this viewer (cache only) and keep it counted while connected
+        self.presence_bucket = await presence.amark(self.blog_id)
+        self.heartbeat = asyncio.ensure_future(self.presence_heartbeat())
+
+        # Send initial data (one hop for everything)
+        self.blog, summary, comments = await self.get_initial_data()
         await self.send_json({
             "type": "initial_data",
             "reaction_summary": summary,
             "comments": comments,
+            "viewers": await presence.aviewers(self.blog_id),
         })
+        await self.publish_presence()
 
     async def disconnect(self, close_code):
+        heartbeat = getattr(self, "heartbeat", None)
+        if heartbeat is not None:
+            heartbeat.cancel()
+            await presence.aunmark(self.blog_id, self.presence_bucket)
+            await self.publish_presence()
         await self.channel_layer.group_discard(self.group_name, self.channel_name)
         print(f"❌ WebSocket disconnected → Blog ID: {self.blog_id}")
 
+    async def presence_heartbeat(self):
+        while True:
+            await asyncio.sleep(presence.seconds_to_next_bucket())
+            self.presence_bucket = await presence.amark(self.blog_id)
+            await self.publish_presence()
+
+    async def publish_presence(self):
+        count = await presence.aviewers(self.blog_id)
+        decision = await presence.ashould_broadcast(self.blog_id, count)
+        if decision == presence.SEND:
+            event = presence.presence_event(self.blog_id, count)
+            await self.channel_layer.group_send(self.group_name, {"type": "presence_update", "data": event})
+        elif decision == presence.FLUSH_LATER:
+            # Not tied to this socket: it still runs if the viewer leaves meanwhile
+            asyncio.ensure_future(self.flush_presence_later())
+
+    async def flush_presence_later(self):
+        await asyncio.sleep(presence.flush_delay())
+        await self.publish_presence()
+
     # ===================================================
     # 🔸 Handle incoming messages from React frontend
     # ===================================================
@@ -200,13 +247,34 @@ class BlogConsumer(AsyncWebsocketConsumer):
             data = json.loads(text_data)
             action = data.get("action")
 
-            if action == "reaction":
-                await self.save_reaction(data)
-                await self.broadcast_reaction_update()
+            if action not in ("reaction", "comment"):
+                return await self.send_error("unknown action")
+            user = self.scope.get("user")
+            if user is None or not user.is_authenticated:
+                return await self.send_error("authentication required")
+            if self.blog is None:
+                return await self.send_error("blog not found")
+            if not await self.take_token():
+                return await self.send_error("rate limited")
 
-            elif action == "comment":
-                await self.save_comment(data)
-                await self.broadcast_comment_update()
+            if action == "reaction":
+                reaction_type = data.get("reaction_type")
+                if reaction_type is not None and reaction_type not in reactions.SUMMARY_TYPES:
+                    return await self.send_error("invalid reaction type")
+                event = await self.save_reaction(user, reaction_type)
+
+            else:
+                content = data.get("content")
+                if not isinstance(content, str) or not content.strip():
+                    return await self.send_error("empty comment")
+                if len(content) > self.MAX_COMMENT_LENGTH:
+                    return await self.send_error("comment too long")
+                event = await self.save_comment(user, content.strip())
+
+            if event is not None:
+                await self.channel_layer.group_send(self.group_name, {"type": event["type"], "data": event})
+                if event["type"] == "reaction_update":
+                    await reaction_groups.publish(event, self.blog.category_id, self.channel_layer)
 
         except Exception as e:
             print(f"⚠️ Error processing WebSocket message: {e}")
@@ -215,17 +283,10 @@ class BlogConsumer(AsyncWebsocketConsumer):
     # 🔸 Database operations (run in sync context)
     # ===================================================
     @database_sync_to_async
-    def get_reaction_summary(self):
-        summary = {"like": 0, "love": 0, "laugh": 0, "angry": 0}
-        for r in Reaction.objects.filter(blog_id=self.blog_id):
-            if r.reaction_type in summary:
-                summary[r.reaction_type] += 1
-        return summary
-
-    @database_sync_to_async
-    def get_comments(self):
+    def get_initial_data(self):
+        blog = Blog.objects.filter(pk=self.blog_id).only("id", "author_id", "title", "category_id").first()
         comments = Comment.objects.filter(blog_id=self.blog_id).select_related("user").order_by("-created_at")[:10]
-        return [
+        return blog, reactions.reaction_summary(self.blog_id), [
             {
                 "id": c.id,
                 "content": c.content,
@@ -236,62 +297,41 @@ class BlogConsumer(AsyncWebsocketConsumer):
         ]
 
     @database_sync_to_async
-    def save_reaction(self, data):
-        user_id = data.get("user_id")
-        reaction_type = data.get("reaction_type")
-        Reaction.objects.update_or_create(
-            user_id=user_id, blog_id=self.blog_id, defaults={"reaction_type": reaction_type}
-        )
+    def save_reaction(self, user, reaction_type):
+        change = reactions.apply(user.id, self.blog_id, reaction_type)
+        if change.previous == change.current:
+            return None
+        reactions.notify_author(change, self.blog, user)
+        return reactions.reaction_event(change, user)
 
     @database_sync_to_async
-    def save_comment(self, data):
-        user_id = data.get("user_id")
-        content = data.get("content")
-        Comment.objects.create(user_id=user_id, blog_id=self.blog_id, content=content)
-
-    # ===================================================
-    # 🔸 Broadcast updates to all WebSocket clients
-    # ===================================================
-    async def broadcast_reaction_update(self):
-        summary = await self.get_reaction_summary()
-        await self.channel_layer.group_send(
-            self.group_name,
-            {
-                "type": "reaction_update",
-                "reaction_summary": summary,
-            },
-        )
-
-    async def broadcast_comment_update(self):
-        comments = await self.get_comments()
-        await self.channel_layer.group_send(
-            self.group_name,
-            {
-                "type": "comment_update",
-                "comments": comments,
-            },
-        )
+    def save_comment(self, user, content):
+        comment = Comment(user=user, blog=self.blog, content=content)
+        comment._skip_broadcast = True  # sent by receive() as a single delta
+        comment.save()
+        return comment_event(comment)
 
     # ===================================================
     # 🔸 Event Handlers → Receive broadcast from group
     # ===================================================
+    # Broadcasts carry {"data": {...}} (signals.py / receive above); older
+    # senders put reaction_summary / comments at the top level.
     async def reaction_update(self, event):
-        await self.send_json({
-            "type": "reaction_update",
-            "reaction_summary": event["reaction_summary"],
-        })
+        data = event.get("data") or {"reaction_summary": event.get("reaction_summary")}
+        await self.send_json({**data, "type": "reaction_update"})
 
     async def comment_update(self, event):
-        await self.send_json({
-            "type": "comment_update",
-            "comments": event["comments"],
-        })
+        data = event.get("data") or {"comments": event.get("comments")}
+        await self.send_json({**data, "type": "comment_update"})
+
+    async def presence_update(self, event):
+        await self.send_json(event["data"])
 
     # ===================================================
-    # 🔸 Utility method to send JSON
+    # 🔸 Utility method to send JSON (queued, see outbound.py)
     # ===================================================
-    async def send_json(self, data):
-        await self.send(text_data=json.dumps(data))
+    async def send_error(self, message):
+        await self.send_json({"type": "error", "error": message})
 
 
 # ==============================================
@@ -299,10 +339,18 @@ class BlogConsumer(AsyncWebsocketConsumer):
 # ==============================================
 
 
-class ReactionConsumer(AsyncWebsocketConsumer):
+class ReactionConsumer(RateLimitedConsumerMixin, OutboundQueueMixin, AsyncWebsocketConsumer):
+    MAX_MESSAGE_LENGTH = 500
+
     async def connect(self):
-        # Join global group for reactions
-        await self.channel_layer.group_add("reactions_group", self.channel_name)
+        # Join one shard of the global stream, or only the requested category topics
+        categories = reaction_groups.parse_categories(self.scope.get("query_string", b""))
+        if categories:
+            self.groups_joined = [reaction_groups.category_group(pk) for pk in categories]
+        else:
+            self.groups_joined = [reaction_groups.shard_group(self.channel_name)]
+        for group in self.groups_joined:
+            await self.channel_layer.group_add(group, self.channel_name)
         await self.accept()
         print("✅ WebSocket connected → Global Reaction Channel")
 
@@ -313,23 +361,24 @@ class ReactionConsumer(AsyncWebsocketConsumer):
         })
 
     async def disconnect(self, close_code):
-        # Leave group on disconnect
-        await self.channel_layer.group_discard("reactions_group", self.channel_name)
+        # Leave group(s) on disconnect
+        for group in getattr(self, "groups_joined", []):
+            await self.channel_layer.group_discard(group, self.channel_name)
         print("❌ WebSocket disconnected → Global Reaction Channel")
 
     async def receive(self, text_data):
         try:
+            user = self.scope.get("user")
+            if user is None or not user.is_authenticated:
+                return await self.send_json({"type": "error", "error": "authentication required"})
+            if not await self.take_token():
+                return await self.send_json({"type": "error", "error": "rate limited"})
+
             data = json.loads(text_data)
-            message = data.get("message", "")
+            message = str(data.get("message", ""))[:self.MAX_MESSAGE_LENGTH]
 
             # Broadcast message to all clients (optional — for testing)
-            await self.channel_layer.group_send(
-                "reactions_group",
-                {
-                    "type": "send_reaction_update",
-                    "value": {"message": message}
-                }
-            )
+            await reaction_groups.publish({"message": message}, channel_layer=self.channel_layer)
         except Exception as e:
             print(f"⚠️ Error in ReactionConsumer.receive: {e}")
 
@@ -340,17 +389,15 @@ class ReactionConsumer(AsyncWebsocketConsumer):
             "data": event.get("value", {}),
         })
 
-    async def send_json(self, data):
-        """Utility to send JSON data safely"""
-        await self.send(text_data=json.dumps(data))
 
 
-
-class NotificationConsumer(AsyncWebsocketConsumer):
+class NotificationConsumer(OutboundQueueMixin, AsyncWebsocketConsumer):
     async def connect(self):
         """
         Connect user to their own private notification channel.
         Example: ws://127.0.0.1:8000/ws/notifications/
+        Reconnect with ?since=<last seq seen> to get only missed notifications.
+        Live pushes can overlap the replay: clients drop seq <= last seen.
         """
         user = self.scope["user"]
 
@@ -359,17 +406,32 @@ class NotificationConsumer(AsyncWebsocketConsumer):
             print("❌ Unauthorized WebSocket connection attempt.")
             return
 
-        self.group_name = f"user_{user.id}_notifications"
+        self.group_name = notifications.group_name(user.id)
         await self.channel_layer.group_add(self.group_name, self.channel_name)
         await self.accept()
 
         print(f"✅ Notification WebSocket connected → User {user.username}")
 
+        query = parse_qs(self.scope.get("query_string", b"").decode(errors="ignore"))
+        since = notifications.parse_since((query.get("since") or [None])[0])
+        if since is not None:
+            # Resume: only what was sent while the socket was down
+            missed, truncated, unread = await self.get_missed_notifications(user.id, since)
+            await self.send_json({
+                "type": "resume",
+                "since": since,
+                "notifications": missed,
+                "truncated": truncated,
+                "unread_count": unread,
+            })
+            return
+
         # Send initial notifications (last 10)
-        notifications = await self.get_recent_notifications(user.id)
+        recent, unread = await self.get_recent_notifications(user.id)
         await self.send_json({
             "type": "initial_notifications",
-            "notifications": notifications
+            "notifications": recent,
+            "unread_count": unread,
         })
 
     async def disconnect(self, close_code):
@@ -380,18 +442,37 @@ class NotificationConsumer(AsyncWebsocketConsumer):
 
     async def receive(self, text_data):
         """
-        Optional: client can mark notifications as read from WebSocket directly.
+        Optional: client can mark notifications as read / delete them from WebSocket directly.
+            {"action": "mark_read", "notification_id": 5}
+            {"action": "mark_read" | "delete", "ids": [5, 6], "up_to_seq": 40}
+        Only the connected user's notifications are affected.
         """
         try:
             data = json.loads(text_data)
             action = data.get("action")
+            user_id = self.scope["user"].id
 
-            if action == "mark_read":
+            if action == "mark_read" and "notification_id" in data:
                 notification_id = data.get("notification_id")
-                await self.mark_as_read(notification_id)
+                unread = await self.apply_bulk(notifications.mark_read, user_id, [int(notification_id)], None)
                 await self.send_json({
                     "type": "notification_read",
                     "notification_id": notification_id,
+                    "unread_count": unread,
+                })
+
+            elif action in ("mark_read", "delete"):
+                try:
+                    ids, up_to_seq = notifications.parse_selection(data)
+                except ValueError as e:
+                    return await self.send_json({"type": "error", "error": str(e)})
+                apply = notifications.mark_read if action == "mark_read" else notifications.delete
+                unread = await self.apply_bulk(apply, user_id, ids, up_to_seq)
+                await self.send_json({
+                    "type": "notifications_read" if action == "mark_read" else "notifications_deleted",
+                    "ids": ids,
+                    "up_to_seq": up_to_seq,
+                    "unread_count": unread,
                 })
 
         except Exception as e:
@@ -402,21 +483,16 @@ class NotificationConsumer(AsyncWebsocketConsumer):
     # ===============================
     @database_sync_to_async
     def get_recent_notifications(self, user_id):
-        notifications = Notification.objects.filter(user_id=user_id).order_by("-created_at")[:10]
-        return [
-            {
-                "id": n.id,
-                "message": n.message,
-                "type": n.notification_type,
-                "is_read": n.is_read,
-                "created_at": n.created_at.strftime("%Y-%m-%d %H:%M"),
-            }
-            for n in notifications
-        ]
+        return notifications.recent(user_id), notifications.unread_count(user_id)
+
+    @database_sync_to_async
+    def get_missed_notifications(self, user_id, since):
+        return (*notifications.missed(user_id, since), notifications.unread_count(user_id))
 
     @database_sync_to_async
-    def mark_as_read(self, notification_id):
-        Notification.objects.filter(id=notification_id).update(is_read=True)
+    def apply_bulk(self, apply, user_id, ids, up_to_seq):
+        apply(user_id, ids, up_to_seq)
+        return notifications.unread_count(user_id)
 
     # ===============================
     # BROADCAST EVENT HANDLER
@@ -427,9 +503,6 @@ class NotificationConsumer(AsyncWebsocketConsumer):
         """
         await self.send_json({
             "type": "new_notification",
-            "notification": event["value"],
+            "notification": event.get("value") or event.get("data"),
         })
 
-    async def send_json(self, data):
-        await self.send(text_data=json.dumps(data))
-
@@ -0,0 +1,65 @@
+from django.db.models import Count, F, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+from .models import Bookmark, Profile
+
+
+# ==========================================================
+# 🔹 Denormalized Profile counters
+# ==========================================================
+# ProfileSerializer used to run followers.count(), following.count() and
+# bookmarks.count() for every profile it rendered. The counts now live on
+# Profile and are kept in sync from signals.py:
+#   - Profile.following m2m_changed → refresh_follow_counts() for both sides
+#   - Bookmark post_save / post_delete → adjust_bookmarks()
+#   - a Profile created after its user bookmarked something → fill_bookmarks()
+# Follow counts are recounted (one UPDATE with correlated subqueries) because
+# m2m remove/clear report the requested ids, not the rows actually deleted.
+
+FOLLOW_THROUGH = Profile.following.through
+
+
+def _through_count(field):
+    return Coalesce(Subquery(
+        FOLLOW_THROUGH.objects.filter(**{field: OuterRef('pk')}).order_by()
+        .values(field).annotate(n=Count('*')).values('n')
+    ), 0)
+
+
+def _bookmark_count():
+    return Coalesce(Subquery(
+        Bookmark.objects.filter(user_id=OuterRef('user_id')).order_by()
+        .values('user_id').annotate(n=Count('*')).values('n')
+    ), 0)
+
+
+def refresh_follow_counts(profile_ids):
+    Profile.objects.filter(pk__in=profile_ids).update(
+        followers_count=_through_count('to_profile_id'),
+        following_count=_through_count('from_profile_id'),
+    )
+
+
+def adjust_bookmarks(user_id, delta):
+    profiles = Profile.objects.filter(user_id=user_id)
+    if delta < 0:
+        # Never underflow (MySQL rejects negative values in unsigned columns)
+        profiles = profiles.filter(bookmarks_count__gte=-delta)
+    profiles.update(bookmarks_count=F('bookmarks_count') + delta)
+
+
+def fill_bookmarks(profile):
+    """Count bookmarks made before `profile` existed (profiles are created lazily)."""
+    count = Bookmark.objects.filter(user_id=profile.user_id).count()
+    if count:
+        Profile.objects.filter(pk=profile.pk).update(bookmarks_count=count)
+        profile.bookmarks_count = count
+
+
+def rebuild():
+    """Recount every profile (repair after raw SQL / bulk imports)."""
+    return Profile.objects.update(
+        followers_count=_through_count('to_profile_id'),
+        following_count=_through_count('from_profile_id'),
+        bookmarks_count=_bookmark_count(),
+    )
@@ -0,0 +1,34 @@
+import base64
+from datetime import datetime
+
+from django.db.models import Q
+
+
+# ==========================================================
+# 🔹 Keyset cursors on (timestamp, id)
+# ==========================================================
+# Opaque ?cursor= tokens for newest-first lists (feed, bookmarks, ...).
+# A page is "rows strictly before the last row of the previous page", so
+# deep pages cost the same as the first one, unlike OFFSET pagination.
+
+def encode_cursor(timestamp, pk):
+    raw = f"{timestamp.isoformat()}|{pk}".encode()
+    return base64.urlsafe_b64encode(raw).decode()
+
+
+def decode_cursor(cursor):
+    """(timestamp, pk), or raise ValueError for a malformed cursor."""
+    try:
+        timestamp, pk = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(timestamp), int(pk)
+    except (TypeError, UnicodeDecodeError, ValueError) as e:
+        raise ValueError("Invalid cursor") from e
+
+
+def before(timestamp, pk, time_field, id_field):
+    """Rows ordered after (timestamp, pk) in a (-time_field, -id_field) ordering."""
+    return Q(**{f"{time_field}__lt": timestamp}) | Q(**{time_field: timestamp, f"{id_field}__lt": pk})
+
+
+def at_or_before(timestamp, pk, time_field, id_field):
+    return Q(**{f"{time_field}__lt": timestamp}) | Q(**{time_field: timestamp, f"{id_field}__lte": pk})
@@ -0,0 +1,113 @@
+import weakref
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import SyncToAsync, ThreadSensitiveContext
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+# ==========================================================
+# 🔹 Persistent database connections (WSGI + ASGI)
+# ==========================================================
+# DATABASES sets CONN_MAX_AGE + CONN_HEALTH_CHECKS, so a thread keeps its
+# connection between requests (checked before reuse) instead of opening a new
+# one each time. Django keeps one connection per alias per *thread*:
+#   - WSGI workers serve every request on the same few threads, so that is
+#     enough there
+#   - under ASGI, Django gives every HTTP request its own new thread, and
+#     channels runs every database_sync_to_async call on one shared thread,
+#     so persistent connections either leak with their thread or are
+#     serialized behind one socket
+# DatabaseThreadPool (asgi.py) fixes the ASGI side: each HTTP request and
+# each WebSocket connection runs its sync code on one of DB_POOL_SIZE
+# long-lived threads (the least busy one), so a worker holds at most
+# DB_POOL_SIZE connections per alias and reuses them.
+#
+# The slot is picked by setting SyncToAsync.thread_sensitive_context, an
+# asgiref internal (3.3+, still there in 3.12). DatabaseThreadPool refuses to
+# start if it disappears instead of silently falling back to per-request
+# threads; DatabaseThreadPoolTests pins the behaviour. Django's native pool
+# (OPTIONS["pool"], 5.1+) is PostgreSQL-only, so it doesn't apply to MySQL.
+#
+# ConnectionStatsMiddleware counts connection opens per request (metrics()
+# for this process, X-DB-Connects header when DB_CONNECTS_HEADER is on).
+
+STATS = Counter()
+_slot_context = getattr(SyncToAsync, "thread_sensitive_context", None)
+_pools = weakref.WeakSet()
+_request_connects = ContextVar("request_connects", default=None)
+
+
+@receiver(connection_created)
+def count_connection(sender, connection, **kwargs):
+    STATS["connects"] += 1
+    holder = _request_connects.get()
+    if holder is not None:
+        holder[0] += 1
+
+
+class ConnectionStatsMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # A list, so opens inside sync_to_async (copied contexts) still count
+        holder = [0]
+        token = _request_connects.set(holder)
+        try:
+            response = self.get_response(request)
+        finally:
+            _request_connects.reset(token)
+
+        STATS["requests"] += 1
+        if holder[0]:
+            STATS["requests_that_connected"] += 1
+        if settings.DB_CONNECTS_HEADER:
+            response["X-DB-Connects"] = str(holder[0])
+        return response
+
+
+class DatabaseThreadPool:
+    """ASGI middleware: run each request's / socket's sync code on one of `size` threads."""
+
+    def __init__(self, app, size=None):
+        if _slot_context is None:
+            raise ImproperlyConfigured(
+                "DatabaseThreadPool needs asgiref's SyncToAsync.thread_sensitive_context (asgiref 3.3 - 3.12)"
+            )
+        self.app = app
+        self.size = size or settings.DB_POOL_SIZE
+        # Never entered, so asgiref keeps each slot's single-thread executor
+        # (and the connections of its thread) for the life of the process;
+        # Django's own per-request ThreadSensitiveContext nests into it.
+        self.slots = [ThreadSensitiveContext() for _ in range(self.size)]
+        self.load = [0] * self.size
+        _pools.add(self)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] not in ("http", "websocket"):
+            return await self.app(scope, receive, send)
+
+        index = min(range(self.size), key=self.load.__getitem__)
+        self.load[index] += 1
+        token = _slot_context.set(self.slots[index])
+        try:
+            return await self.app(scope, receive, send)
+        finally:
+            _slot_context.reset(token)
+            self.load[index] -= 1
+
+
+def metrics():
+    return {
+        "conn_max_age": settings.DATABASES["default"].get("CONN_MAX_AGE", 0),
+        "health_checks": settings.DATABASES["default"].get("CONN_HEALTH_CHECKS", False),
+        "pool_size": settings.DB_POOL_SIZE,
+        "pool_load": [list(pool.load) for pool in list(_pools)],
+        "requests": STATS["requests"],
+        "requests_that_connected": STATS["requests_that_connected"],
+        "connects": STATS["connects"],
+    }
@@ -0,0 +1,111 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.cache import cache
+from rest_framework_simplejwt.exceptions import TokenError
+from rest_framework_simplejwt.settings import api_settings as jwt_settings
+from rest_framework_simplejwt.tokens import AccessToken
+
+
+# ==========================================================
+# 🔹 Primary / replica routing
+# ==========================================================
+# With a "replica" alias in DATABASES (DB_REPLICA_HOST), reads made while
+# serving a GET / HEAD / OPTIONS request go to the replica; everything else
+# (writes, non-request code like commands, consumers and the scheduler)
+# stays on "default":
+#   - ReplicaRoutingMiddleware marks safe-method requests replica-eligible
+#   - the first write switches the rest of that request back to the
+#     primary (reads that follow it see it)
+#   - a user who just wrote (any unsafe method) is pinned to the primary
+#     for REPLICA_PIN_SECONDS, so they read their own writes while the
+#     replica catches up (the pin is kept in the cache, so settings.py
+#     refuses a replica without a shared one: CACHE_BACKEND=redis)
+# Without a replica alias the middleware and router are no-ops.
+
+PRIMARY = "default"
+REPLICA = "replica"
+
+_read_from = ContextVar("read_from", default=PRIMARY)
+
+
+def replica_configured():
+    return REPLICA in settings.DATABASES
+
+
+@contextmanager
+def reads_from(alias):
+    """Route reads in this block (this thread / task only) to `alias`."""
+    token = _read_from.set(alias if alias != REPLICA or replica_configured() else PRIMARY)
+    try:
+        yield
+    finally:
+        _read_from.reset(token)
+
+
+class PrimaryReplicaRouter:
+    def db_for_read(self, model, **hints):
+        return _read_from.get()
+
+    def db_for_write(self, model, **hints):
+        # Read-your-writes for the rest of this request
+        _read_from.set(PRIMARY)
+        return PRIMARY
+
+    def allow_relation(self, obj1, obj2, **hints):
+        return True  # same data on every alias
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == PRIMARY
+
+
+# ----------------------------------------------------------
+# Pinning a user to the primary after they write
+# ----------------------------------------------------------
+def _pin_key(request):
+    user = getattr(request, "user", None)
+    if user is not None and user.is_authenticated:
+        return f"db_pin:user:{user.pk}"
+    header = request.META.get("HTTP_AUTHORIZATION", "")
+    if header.startswith("Bearer "):
+        # JWT is authenticated later, by DRF; the signed claim is enough here
+        try:
+            return f"db_pin:user:{AccessToken(header[7:])[jwt_settings.USER_ID_CLAIM]}"
+        except (TokenError, KeyError):
+            pass
+    return f"db_pin:ip:{request.META.get('REMOTE_ADDR')}"
+
+
+def is_pinned(request):
+    try:
+        return bool(cache.get(_pin_key(request)))
+    except Exception:
+        return True  # when in doubt, read from the primary
+
+
+def pin(request):
+    try:
+        cache.set(_pin_key(request), 1, settings.REPLICA_PIN_SECONDS)
+    except Exception as e:
+        print(f"⚠️ Could not pin request to primary: {e}")
+
+
+class ReplicaRoutingMiddleware:
+    SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not replica_configured():
+            return self.get_response(request)
+
+        if request.method not in self.SAFE_METHODS:
+            response = self.get_response(request)
+            pin(request)  # request.user is the DRF-authenticated user by now
+            return response
+
+        alias = PRIMARY if is_pinned(request) else REPLICA
+        with reads_from(alias):
+            return self.get_response(request)
@@ -0,0 +1,187 @@
+import csv
+import json
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .models import Blog, Comment, CustomUser, Reaction
+
+
+# ==========================================================
+# 🔹 Streaming admin exports (NDJSON / CSV)
+# ==========================================================
+# admin/export/<kind>.<ndjson|csv> streams every matching row of blogs,
+# comments, reactions or users, instead of paging through the admin list
+# views 9 rows at a time (or loading all users into one list).
+#
+# Rows are read as .values() projections in keyset batches of
+# EXPORT_CHUNK_SIZE ("after the last row of the previous batch" on the
+# export's ordering + id). .iterator() would not keep memory flat here:
+# MySQL's driver buffers the whole result set on the client. Each batch is
+# one short query and one chunk of the response, so memory stays constant
+# whatever the table size.
+#
+# The body is read after the view (and ReplicaRoutingMiddleware) returned,
+# so the view passes the alias to read from. Under ASGI the body is an
+# async iterator that runs each batch query in the request's DB thread;
+# Django would otherwise read a sync iterator to the end before sending.
+
+FORMATS = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+BLOG_SORTS = {
+    "asc": "created_at",
+    "desc": "-created_at",
+    "a-z": "title",
+    "z-a": "-title",
+}
+
+
+# ----------------------------------------------------------
+# Filters (shared with the admin list views)
+# ----------------------------------------------------------
+def filter_blogs(blogs, params):
+    """?search= (title / author) and ?status=, as in admin_blog_list_view."""
+    search = params.get("search", "")
+    status = params.get("status", "")
+    if search:
+        blogs = blogs.filter(Q(title__icontains=search) | Q(author__username__icontains=search))
+    if status:
+        blogs = blogs.filter(status=status)
+    return blogs
+
+
+def blog_ordering(params):
+    """?sort= asc / desc / a-z / z-a; newest first otherwise."""
+    return BLOG_SORTS.get(params.get("sort", ""), "-created_at")
+
+
+# ----------------------------------------------------------
+# What each export contains: (header, values() lookup) columns,
+# the filtered queryset and its ordering
+# ----------------------------------------------------------
+EXPORTS = {
+    "blogs": {
+        "columns": (
+            ("id", "id"), ("title", "title"), ("status", "status"),
+            ("author_id", "author_id"), ("author", "author__username"),
+            ("category", "category__name"), ("views", "views"), ("likes", "likes"),
+            ("comments_count", "comments_count"), ("is_featured", "is_featured"),
+            ("is_approved", "is_approved"), ("is_flagged", "is_flagged"),
+            ("publish_at", "publish_at"), ("published_at", "published_at"),
+            ("created_at", "created_at"), ("updated_at", "updated_at"),
+        ),
+        "queryset": lambda params: filter_blogs(Blog.objects.all(), params),
+        "ordering": blog_ordering,
+    },
+    "comments": {
+        "columns": (
+            ("id", "id"), ("blog_id", "blog_id"), ("blog_title", "blog__title"),
+            ("user_id", "user_id"), ("user", "user__username"), ("parent_id", "parent_id"),
+            ("content", "content"), ("is_approved", "is_approved"), ("is_flagged", "is_flagged"),
+            ("created_at", "created_at"),
+        ),
+        "queryset": lambda params: Comment.objects.all(),
+        "ordering": lambda params: "-created_at",
+    },
+    "reactions": {
+        "columns": (
+            ("id", "id"), ("user_id", "user_id"), ("user", "user__username"),
+            ("blog_id", "blog_id"), ("blog_title", "blog__title"),
+            ("reaction_type", "reaction_type"), ("created_at", "created_at"),
+        ),
+        "queryset": lambda params: Reaction.objects.all(),
+        "ordering": lambda params: "-id",
+    },
+    "users": {
+        "columns": (
+            ("id", "id"), ("username", "username"), ("email", "email"), ("role", "role"),
+            ("is_active", "is_active"), ("email_verified", "email_verified"),
+            ("date_joined", "date_joined"), ("last_login", "last_login"),
+        ),
+        "queryset": lambda params: CustomUser.objects.all(),
+        "ordering": lambda params: "id",
+    },
+}
+
+
+# ----------------------------------------------------------
+# Keyset batches
+# ----------------------------------------------------------
+def _after(field, descending, value, pk):
+    """Rows after (value, pk) in a (field, id) ordering, both descending or both ascending."""
+    op = "lt" if descending else "gt"
+    if field == "id":
+        return Q(**{f"id__{op}": pk})
+    return Q(**{f"{field}__{op}": value}) | Q(**{field: value, f"id__{op}": pk})
+
+
+def batches(kind, params, using=None, chunk_size=None):
+    """Yield lists of {header: value} rows for export `kind`, EXPORT_CHUNK_SIZE at a time."""
+    spec = EXPORTS[kind]
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    ordering = spec["ordering"](params)
+    descending = ordering.startswith("-")
+    field = ordering.lstrip("-")
+
+    lookups = [lookup for _, lookup in spec["columns"]]
+    fetched = list(dict.fromkeys([*lookups, field, "id"]))
+    queryset = spec["queryset"](params).using(using).order_by(ordering, "-id" if descending else "id").values(*fetched)
+
+    last = None
+    while True:
+        batch = queryset if last is None else queryset.filter(_after(field, descending, *last))
+        rows = list(batch[:chunk_size])
+        if not rows:
+            return
+        yield [{header: row[lookup] for header, lookup in spec["columns"]} for row in rows]
+        if len(rows) < chunk_size:
+            return
+        last = (rows[-1][field], rows[-1]["id"])
+
+
+# ----------------------------------------------------------
+# Encoders
+# ----------------------------------------------------------
+class _Echo:
+    """csv.writer target that hands each line back instead of buffering it."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_value(value):
+    if value is None:
+        return ""
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, str) and value[:1] in ("=", "+", "-", "@"):
+        return "'" + value  # keep spreadsheets from running it as a formula
+    return value
+
+
+def encode(kind, fmt, params, using=None):
+    """The export as an iterator of text chunks (header line first for CSV)."""
+    if fmt == "csv":
+        writer = csv.writer(_Echo())
+        yield writer.writerow([header for header, _ in EXPORTS[kind]["columns"]])
+        for rows in batches(kind, params, using):
+            yield "".join(writer.writerow([_csv_value(v) for v in row.values()]) for row in rows)
+    else:
+        for rows in batches(kind, params, using):
+            yield "".join(json.dumps(row, cls=DjangoJSONEncoder, ensure_ascii=False) + "\n" for row in rows)
+
+
+async def aencode(kind, fmt, params, using=None):
+    """encode() for ASGI: each batch is read in the request's DB thread, one at a time."""
+    chunks = encode(kind, fmt, params, using)
+    next_chunk = sync_to_async(next)
+    while True:
+        chunk = await next_chunk(chunks, None)
+        if chunk is None:
+            return
+        yield chunk
@@ -0,0 +1,187 @@
+from django.contrib.contenttypes.models import ContentType
+from django.db import transaction
+from django.db.models import Count, Sum
+from taggit.models import Tag, TaggedItem
+
+from .models import Blog, Category, CategoryFacet, TagFacet
+
+
+# ==========================================================
+# 🔹 Facet counts for blog_list_view (?facets=true)
+# ==========================================================
+# Published-blog counts per category (CategoryFacet) and per (tag, category)
+# pair (TagFacet), so the list endpoint can show "Django (12)" next to each
+# filter without a GROUP BY over blogs × tags on every request.
+#
+# Counts are recomputed for just the affected keys (signals.py):
+#   - Blog post_save, when status or category changed (see Blog.facet_state)
+#   - m2m_changed on Blog.tags, for the added/removed tags
+#   - Blog / Category delete, and each scheduler batch (blogs_published)
+# `manage.py rebuild_facets` recomputes everything.
+#
+# Facets are disjunctive: category counts honour the tag filter and tag
+# counts honour the category filter, but neither counts its own selection,
+# so the client can switch to a sibling value. The tables can't answer for
+# search / author filters; those fall back to live_facet_counts().
+
+FACET_LIMIT = 20
+
+
+def blog_content_type():
+    return ContentType.objects.get_for_model(Blog)
+
+
+def filter_by_tags(queryset, tag_ids):
+    """
+    Blogs tagged with any of `tag_ids`, as a semi-join on taggit's tag_id
+    index. Unlike filter(tags__...) this can't duplicate rows, so no DISTINCT.
+    """
+    return queryset.filter(id__in=TaggedItem.objects.filter(
+        content_type=blog_content_type(), tag_id__in=tag_ids,
+    ).values('object_id'))
+
+
+def published_blogs():
+    return Blog.objects.filter(status='published').order_by()
+
+
+# ----------------------------------------------------------
+# Maintenance
+# ----------------------------------------------------------
+def refresh(category_ids=(), tag_ids=()):
+    """Recompute the CategoryFacet / TagFacet rows for the given keys."""
+    category_ids = {pk for pk in category_ids if pk is not None}
+    tag_ids = set(tag_ids)
+    if not category_ids and not tag_ids:
+        return
+
+    with transaction.atomic():
+        if category_ids:
+            # Row locks serialize concurrent refreshes of the same key
+            list(Category.objects.select_for_update().filter(pk__in=category_ids).values_list('pk', flat=True))
+            counts = (
+                published_blogs().filter(category_id__in=category_ids)
+                .values_list('category_id').annotate(count=Count('id'))
+            )
+            CategoryFacet.objects.filter(category_id__in=category_ids).delete()
+            CategoryFacet.objects.bulk_create(
+                CategoryFacet(category_id=pk, blog_count=count) for pk, count in counts
+            )
+
+        if tag_ids:
+            list(Tag.objects.select_for_update().filter(pk__in=tag_ids).values_list('pk', flat=True))
+            counts = (
+                published_blogs().filter(tags__id__in=tag_ids)
+                .values_list('tags__id', 'category_id').annotate(count=Count('id'))
+            )
+            TagFacet.objects.filter(tag_id__in=tag_ids).delete()
+            TagFacet.objects.bulk_create(
+                TagFacet(tag_id=tag_id, category_id=category_id, blog_count=count)
+                for tag_id, category_id, count in counts
+            )
+
+
+def refresh_blogs(blog_ids):
+    """Refresh every key the given blogs count towards (e.g. a publish batch)."""
+    blogs = Blog.objects.filter(id__in=blog_ids)
+    category_ids = blogs.values_list('category_id', flat=True).distinct()
+    tag_ids = TaggedItem.objects.filter(
+        content_type=blog_content_type(), object_id__in=blog_ids,
+    ).values_list('tag_id', flat=True).distinct()
+    refresh(category_ids=list(category_ids), tag_ids=list(tag_ids))
+
+
+def rebuild():
+    """Recompute both tables from scratch. Returns (category rows, tag rows)."""
+    categories = [
+        CategoryFacet(category_id=pk, blog_count=count)
+        for pk, count in published_blogs().filter(category__isnull=False)
+        .values_list('category_id').annotate(count=Count('id'))
+    ]
+    tags = [
+        TagFacet(tag_id=tag_id, category_id=category_id, blog_count=count)
+        for tag_id, category_id, count in published_blogs().filter(tags__isnull=False)
+        .values_list('tags__id', 'category_id').annotate(count=Count('id'))
+    ]
+    with transaction.atomic():
+        CategoryFacet.objects.all().delete()
+        TagFacet.objects.all().delete()
+        CategoryFacet.objects.bulk_create(categories, batch_size=1000)
+        TagFacet.objects.bulk_create(tags, batch_size=1000)
+    return len(categories), len(tags)
+
+
+# ----------------------------------------------------------
+# Reading
+# ----------------------------------------------------------
+def _category_rows(rows):
+    return [
+        {'id': pk, 'name': name, 'slug': slug, 'count': count}
+        for pk, name, slug, count in rows
+    ]
+
+
+def _tag_rows(rows):
+    return [{'id': pk, 'name': name, 'count': count} for pk, name, count in rows]
+
+
+def facet_counts(category_ids=None, tag_ids=None, limit=FACET_LIMIT):
+    """Facet counts from the precomputed tables (category / tag filters only)."""
+    if tag_ids is not None and len(tag_ids) > 1:
+        # Summing TagFacet rows would count a blog once per matched tag: count
+        # distinct blogs instead (semi-join on the tag index, no blogs × tags rows)
+        categories = (
+            filter_by_tags(published_blogs(), tag_ids).filter(category__isnull=False)
+            .values_list('category_id', 'category__name', 'category__slug')
+            .annotate(count=Count('id'))
+            .order_by('-count', 'category__name')
+        )
+    elif tag_ids is not None:
+        categories = (
+            TagFacet.objects.filter(tag_id__in=tag_ids, category__isnull=False)
+            .values_list('category_id', 'category__name', 'category__slug')
+            .annotate(count=Sum('blog_count'))
+            .order_by('-count', 'category__name')
+        )
+    else:
+        categories = (
+            CategoryFacet.objects.filter(blog_count__gt=0)
+            .values_list('category_id', 'category__name', 'category__slug', 'blog_count')
+            .order_by('-blog_count', 'category__name')
+        )
+
+    tags = TagFacet.objects.all()
+    if category_ids is not None:
+        tags = tags.filter(category_id__in=category_ids)
+    tags = tags.values_list('tag_id', 'tag__name').annotate(count=Sum('blog_count'))
+
+    return {
+        'categories': _category_rows(categories),
+        'tags': _tag_rows(tags.order_by('-count', 'tag__name')[:limit]),
+    }
+
+
+def live_facet_counts(queryset, category_ids=None, tag_ids=None, limit=FACET_LIMIT):
+    """
+    Facet counts by aggregating `queryset` (published blogs with the search /
+    author filters applied, but not the category / tag filters).
+    """
+    queryset = queryset.order_by()
+
+    for_categories = filter_by_tags(queryset, tag_ids) if tag_ids is not None else queryset
+    categories = (
+        for_categories.filter(category__isnull=False)
+        .values_list('category_id', 'category__name', 'category__slug')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'category__name')
+    )
+
+    for_tags = queryset.filter(category_id__in=category_ids) if category_ids is not None else queryset
+    tags = (
+        for_tags.filter(tags__isnull=False)
+        .values_list('tags__id', 'tags__name')
+        .annotate(count=Count('id'))
+        .order_by('-count', 'tags__name')[:limit]
+    )
+
+    return {'categories': _category_rows(categories), 'tags': _tag_rows(tags)}
@@ -0,0 +1,163 @@
+from collections import defaultdict
+
+from django.db.models import Count
+from rest_framework import serializers
+from taggit.models import TaggedItem
+
+from .models import Blog, BlogMedia, Bookmark, Comment, Reaction
+from .profiling import timed_serializer
+
+
+# ==========================================================
+# 🔹 Read-only fast path for BlogSerializer(many=True)
+# ==========================================================
+# BlogSerializer builds a field tree per blog (author, category, media,
+# tags, six method fields) and runs queries per blog for counts, reactions,
+# media and the user's reaction. For the hot list endpoints, serialize_blogs()
+# builds the same dicts from .values() rows plus one query per relation for
+# the whole page:
+#   - blog + author + category columns: blog_rows() (one query, paginatable)
+#   - tags, media, reactions, comment / bookmark counts: one query each
+# The output matches BlogSerializer field for field and in key order
+# (blog/tests.py FastBlogSerializerTests checks it); a field added to
+# BlogSerializer must be added here too. Writes and detail views keep
+# using BlogSerializer. serialize_blogs() is @timed_serializer, so profiled
+# requests still report its time as serializer_ms.
+
+BLOG_FIELDS = (
+    "id", "title", "content", "markdown_content", "status",
+    "featured_image", "attachments", "views", "likes", "comments_count", "is_featured",
+    "publish_at", "published_at", "created_at", "updated_at",
+    "author_id", "author__username", "author__email", "author__role", "author__email_verified",
+    "category_id", "category__name", "category__slug",
+)
+
+REACTION_SUMMARY_TYPES = ("like", "love", "laugh", "angry")
+
+# DRF's own field, so dates render exactly as in BlogSerializer (timezone, "Z")
+_datetime = serializers.DateTimeField()
+_featured_image_storage = Blog._meta.get_field("featured_image").storage
+_attachments_storage = Blog._meta.get_field("attachments").storage
+_media_storage = BlogMedia._meta.get_field("file").storage
+
+
+def blog_rows(queryset):
+    """`queryset` as the value dicts serialize_blogs() takes (slice / paginate it first)."""
+    return queryset.values(*BLOG_FIELDS)
+
+
+def _datetime_or_none(value):
+    return _datetime.to_representation(value) if value else None
+
+
+def _file_url(storage, name, request):
+    if not name:
+        return None
+    url = storage.url(name)
+    return request.build_absolute_uri(url) if request is not None else url
+
+
+def _tag_names(blog_ids):
+    # The query taggit's prefetch_related("tags") runs, so names come back in the same order
+    names = defaultdict(list)
+    tags = TaggedItem.tags_for(Blog, **{f"{TaggedItem.tag_relname()}__object_id__in": blog_ids}).extra(
+        select={"_blog_id": f"{TaggedItem._meta.db_table}.object_id"}
+    )
+    for tag in tags:
+        names[tag._blog_id].append(tag.name)
+    return names
+
+
+def _media(blog_ids, request):
+    media = defaultdict(list)
+    for row in BlogMedia.objects.filter(blog_id__in=blog_ids).order_by("blog_id", "id").values(
+        "id", "blog_id", "file", "uploaded_at"
+    ):
+        media[row["blog_id"]].append({
+            "id": row["id"],
+            "file": _file_url(_media_storage, row["file"], request),
+            "uploaded_at": _datetime_or_none(row["uploaded_at"]),
+        })
+    return media
+
+
+def _counts(model, blog_ids):
+    return dict(
+        model.objects.filter(blog_id__in=blog_ids).order_by()
+        .values_list("blog_id").annotate(count=Count("id"))
+    )
+
+
+@timed_serializer
+def serialize_blogs(rows, request=None):
+    """BlogSerializer(many=True).data for blog_rows() rows, in the same order."""
+    rows = list(rows)
+    if not rows:
+        return []
+    blog_ids = [row["id"] for row in rows]
+
+    tags = _tag_names(blog_ids)
+    media = _media(blog_ids, request)
+    comment_counts = _counts(Comment, blog_ids)
+    bookmark_counts = _counts(Bookmark, blog_ids)
+
+    reactions = defaultdict(list)
+    for row in Reaction.objects.filter(blog_id__in=blog_ids).order_by("blog_id", "id").values_list(
+        "blog_id", "id", "user_id", "reaction_type"
+    ):
+        reactions[row[0]].append(row[1:])
+
+    user = getattr(request, "user", None)
+    user_id = user.id if user is not None and user.is_authenticated else None
+
+    data = []
+    for row in rows:
+        blog_id = row["id"]
+        blog_reactions = reactions[blog_id]
+
+        summary = dict.fromkeys(REACTION_SUMMARY_TYPES, 0)
+        user_reaction = None
+        for _, reactor_id, reaction_type in blog_reactions:
+            summary[reaction_type] = summary.get(reaction_type, 0) + 1
+            if reactor_id == user_id and user_reaction is None:
+                user_reaction = reaction_type
+
+        data.append({
+            "id": blog_id,
+            "author": {
+                "id": row["author_id"],
+                "username": row["author__username"],
+                "email": row["author__email"],
+                "role": row["author__role"],
+                "email_verified": row["author__email_verified"],
+            },
+            "title": row["title"],
+            "content": row["content"],
+            "markdown_content": row["markdown_content"],
+            "category": {
+                "id": row["category_id"],
+                "name": row["category__name"],
+                "slug": row["category__slug"],
+            } if row["category_id"] is not None else None,
+            "tags": tags[blog_id],
+            "featured_image": _file_url(_featured_image_storage, row["featured_image"], request),
+            "attachments": _file_url(_attachments_storage, row["attachments"], request),
+            "status": row["status"],
+            "views": row["views"],
+            "likes": row["likes"],
+            "comments_count": row["comments_count"],
+            "is_featured": row["is_featured"],
+            "is_featured_display": "⭐ Featured" if row["is_featured"] else "Normal",
+            "publish_at": _datetime_or_none(row["publish_at"]),
+            "published_at": _datetime_or_none(row["published_at"]),
+            "created_at": _datetime_or_none(row["created_at"]),
+            "updated_at": _datetime_or_none(row["updated_at"]),
+            "media": media[blog_id],
+            "reactions": [reaction_id for reaction_id, _, _ in blog_reactions],
+            "total_reactions": len(blog_reactions),
+            "total_comments": comment_counts.get(blog_id, 0),
+            "total_bookmarks": bookmark_counts.get(blog_id, 0),
+            "reaction_summary": summary,
+            "user_reaction": user_reaction,
+        })
+    return data
@@ -0,0 +1,179 @@
+import heapq
+from collections import defaultdict
+
+from django.conf import settings
+from django.db.models import Count
+
+from .cursors import at_or_before, before, decode_cursor, encode_cursor
+from .models import Blog, FeedEntry, Profile
+
+
+# ==========================================================
+# 🔹 Home feed: fan-out-on-write timelines
+# ==========================================================
+# Clients used to build a home feed by calling blog_list_view?author= once
+# per followed author. Instead, each published blog is copied into every
+# follower's timeline (FeedEntry) once, and /api/feed/ reads one page of it
+# with a keyset cursor on (published_at, blog id) — O(page), not O(follows).
+#
+#   - publish (post_save transition / scheduler batch) → fan_out()
+#   - unpublish                                         → retract()
+#   - follow / unfollow (Profile.following m2m)        → backfill() / unfollow()
+#
+# Authors above FEED_CELEBRITY_THRESHOLD followers are not fanned out (one
+# publish would write that many rows); timeline() merges their recent posts
+# in at read time. Timelines are capped at FEED_MAX_ENTRIES: backfill() trims
+# the timelines it writes to, and `manage.py trim_feeds` (cron) trims the ones
+# fan-out pushed over the cap, so reading a timeline never writes. Published blogs without a published_at
+# (older rows, filled by migration 0013) are left out: the timeline is keyed on it.
+
+PAGE_SIZE = 20
+MAX_PAGE_SIZE = 50
+
+
+def celebrity_threshold():
+    return getattr(settings, "FEED_CELEBRITY_THRESHOLD", 1000)
+
+
+def follower_user_ids(author_id):
+    return Profile.objects.filter(following__user_id=author_id).values_list("user_id", flat=True)
+
+
+def celebrity_ids(author_ids):
+    """The subset of `author_ids` read at fan-out-on-read time."""
+    return set(
+        Profile.objects.filter(user_id__in=author_ids, followers_count__gt=celebrity_threshold())
+        .values_list("user_id", flat=True)
+    )
+
+
+def followed_celebrity_ids(user_id):
+    followed = Profile.objects.filter(followers__user_id=user_id).values_list("user_id", flat=True)
+    return celebrity_ids(followed)
+
+
+# ----------------------------------------------------------
+# Writes
+# ----------------------------------------------------------
+def fan_out(blog_ids):
+    """Push newly published blogs into their authors' followers' timelines."""
+    posts = defaultdict(list)
+    for blog_id, author_id, published_at in (
+        Blog.objects.filter(id__in=blog_ids, status="published", published_at__isnull=False)
+        .values_list("id", "author_id", "published_at")
+    ):
+        posts[author_id].append((blog_id, published_at))
+
+    skipped = celebrity_ids(posts)
+    created = 0
+    for author_id, blogs in posts.items():
+        if author_id in skipped:
+            continue
+        entries = [
+            FeedEntry(owner_id=owner_id, blog_id=blog_id, published_at=published_at)
+            for owner_id in follower_user_ids(author_id).iterator()
+            for blog_id, published_at in blogs
+        ]
+        FeedEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+        created += len(entries)
+    return created
+
+
+def retract(blog_ids):
+    """Remove unpublished blogs from every timeline (deletes cascade on their own)."""
+    FeedEntry.objects.filter(blog_id__in=blog_ids).delete()
+
+
+def backfill(pairs):
+    """Copy each followed author's recent posts into the new follower's timeline."""
+    pairs = list(pairs)
+    skipped = celebrity_ids({author_id for _, author_id in pairs})
+    limit = getattr(settings, "FEED_BACKFILL", 20)
+
+    entries = []
+    for owner_id, author_id in pairs:
+        if author_id in skipped or owner_id == author_id:
+            continue
+        recent = (
+            Blog.objects.filter(author_id=author_id, status="published", published_at__isnull=False)
+            .order_by("-published_at", "-id")
+            .values_list("id", "published_at")[:limit]
+        )
+        entries.extend(
+            FeedEntry(owner_id=owner_id, blog_id=blog_id, published_at=published_at)
+            for blog_id, published_at in recent
+        )
+    FeedEntry.objects.bulk_create(entries, batch_size=1000, ignore_conflicts=True)
+    for owner_id in {owner_id for owner_id, _ in pairs}:
+        trim(owner_id)
+
+
+def unfollow(pairs):
+    for owner_id, author_id in pairs:
+        FeedEntry.objects.filter(owner_id=owner_id, blog__author_id=author_id).delete()
+
+
+def max_entries():
+    return getattr(settings, "FEED_MAX_ENTRIES", 800)
+
+
+def trim(owner_id):
+    """Drop entries past the newest FEED_MAX_ENTRIES of a timeline."""
+    cap = max_entries()
+    boundary = list(
+        FeedEntry.objects.filter(owner_id=owner_id)
+        .order_by("-published_at", "-blog_id")
+        .values_list("published_at", "blog_id")[cap:cap + 1]
+    )
+    if boundary:
+        FeedEntry.objects.filter(owner_id=owner_id).filter(
+            at_or_before(*boundary[0], "published_at", "blog_id")
+        ).delete()
+
+
+def trim_all():
+    """Trim every timeline over the cap (fan-out only appends). Returns the owners trimmed."""
+    owners = list(
+        FeedEntry.objects.order_by().values("owner_id")
+        .annotate(entries=Count("id")).filter(entries__gt=max_entries())
+        .values_list("owner_id", flat=True)
+    )
+    for owner_id in owners:
+        trim(owner_id)
+    return owners
+
+
+# ----------------------------------------------------------
+# Reads
+# ----------------------------------------------------------
+def timeline(user_id, cursor=None, limit=PAGE_SIZE):
+    """
+    One page of `user_id`'s home feed, newest first.
+    Returns (blog ids, next cursor or None).
+    """
+    position = decode_cursor(cursor) if cursor else None
+
+    entries = FeedEntry.objects.filter(owner_id=user_id)
+    if position:
+        entries = entries.filter(before(*position, "published_at", "blog_id"))
+    rows = [entries.order_by("-published_at", "-blog_id").values_list("published_at", "blog_id")[:limit + 1]]
+
+    celebrities = followed_celebrity_ids(user_id)
+    if celebrities:
+        posts = Blog.objects.filter(author_id__in=celebrities, status="published", published_at__isnull=False)
+        if position:
+            posts = posts.filter(before(*position, "published_at", "id"))
+        rows.append(posts.order_by("-published_at", "-id").values_list("published_at", "id")[:limit + 1])
+
+    page = []
+    seen = set()
+    for published_at, blog_id in heapq.merge(*rows, reverse=True):
+        if blog_id in seen:
+            continue
+        seen.add(blog_id)
+        page.append((published_at, blog_id))
+        if len(page) > limit:
+            break
+
+    next_cursor = encode_cursor(*page[limit - 1]) if len(page) > limit else None
+    return [blog_id for _, blog_id in page[:limit]], next_cursor
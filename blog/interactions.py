@@ -0,0 +1,167 @@
+from collections import Counter
+
+from django.db import IntegrityError, transaction
+from django.db.models import Exists, F, OuterRef, Subquery
+
+from . import counters, reactions
+from .models import Blog, Bookmark, Reaction
+
+
+# ==========================================================
+# 🔹 Per-user interaction state for a page of blogs
+# ==========================================================
+# Feed cards need "did I bookmark / react to this?" for every blog on the
+# page. interaction_state() answers that for up to MAX_BATCH_IDS blogs in one
+# statement: the EXISTS / scalar subqueries are point lookups on the
+# (user, blog) unique indexes of Bookmark and Reaction.
+
+MAX_BATCH_IDS = 100
+
+
+def parse_blog_ids(values):
+    """
+    Blog ids from ?ids=1,2,3 (or repeated ?ids=) — de-duplicated, order kept.
+    Raises ValueError for non-integers or more than MAX_BATCH_IDS ids.
+    """
+    ids = []
+    for value in values:
+        ids.extend(int(part) for part in str(value).split(",") if part.strip())
+    ids = list(dict.fromkeys(ids))
+    if len(ids) > MAX_BATCH_IDS:
+        raise ValueError(f"At most {MAX_BATCH_IDS} ids per request")
+    return ids
+
+
+def interaction_state(user_id, blog_ids):
+    """{blog id: {"is_bookmarked": bool, "user_reaction": str | None}} for existing blogs."""
+    rows = (
+        Blog.objects.filter(id__in=blog_ids)
+        .annotate(
+            is_bookmarked=Exists(Bookmark.objects.filter(user_id=user_id, blog_id=OuterRef("pk"))),
+            user_reaction=Subquery(
+                Reaction.objects.filter(user_id=user_id, blog_id=OuterRef("pk")).values("reaction_type")[:1]
+            ),
+        )
+        .values_list("id", "is_bookmarked", "user_reaction")
+    )
+    return {
+        pk: {"is_bookmarked": is_bookmarked, "user_reaction": user_reaction}
+        for pk, is_bookmarked, user_reaction in rows
+    }
+
+
+# ==========================================================
+# 🔹 Batch ingest (reactions, bookmarks, views)
+# ==========================================================
+# Mobile clients queue interactions while offline and send them as one
+# array. Events carry the *resulting* state ("reaction_type": "like" / null,
+# "bookmarked": true / false) rather than "toggle", so a retried batch is
+# harmless. Per blog, the last event of each kind wins; views add up.
+#
+#   {"blog_id": 7, "type": "reaction", "reaction_type": "love"}
+#   {"blog_id": 7, "type": "bookmark", "bookmarked": true}
+#   {"blog_id": 7, "type": "view"}
+
+MAX_BATCH_EVENTS = 200
+EVENT_TYPES = ("reaction", "bookmark", "view")
+
+
+class InvalidEvent(ValueError):
+    def __init__(self, index, message):
+        super().__init__(f"events[{index}]: {message}")
+        self.index = index
+
+
+def collapse_events(events):
+    """Validate `events` and reduce them to (reaction targets, bookmark targets, view counts)."""
+    if not isinstance(events, list):
+        raise InvalidEvent(0, "expected a list of events")
+    if len(events) > MAX_BATCH_EVENTS:
+        raise InvalidEvent(MAX_BATCH_EVENTS, f"at most {MAX_BATCH_EVENTS} events per batch")
+
+    reaction_targets, bookmark_targets, views = {}, {}, Counter()
+    for index, event in enumerate(events):
+        if not isinstance(event, dict):
+            raise InvalidEvent(index, "expected an object")
+        blog_id = event.get("blog_id")
+        if not isinstance(blog_id, int) or isinstance(blog_id, bool):
+            raise InvalidEvent(index, "blog_id must be an integer")
+
+        kind = event.get("type")
+        if kind == "reaction":
+            reaction_type = event.get("reaction_type", ...)
+            if reaction_type is not None and reaction_type not in reactions.SUMMARY_TYPES:
+                raise InvalidEvent(index, "reaction_type must be one of "
+                                          f"{', '.join(reactions.SUMMARY_TYPES)} or null")
+            reaction_targets[blog_id] = reaction_type
+        elif kind == "bookmark":
+            bookmarked = event.get("bookmarked")
+            if not isinstance(bookmarked, bool):
+                raise InvalidEvent(index, "bookmarked must be true or false")
+            bookmark_targets[blog_id] = bookmarked
+        elif kind == "view":
+            views[blog_id] += 1
+        else:
+            raise InvalidEvent(index, f"type must be one of {', '.join(EVENT_TYPES)}")
+    return reaction_targets, bookmark_targets, views
+
+
+def _apply_bookmarks(user_id, targets):
+    if not targets:
+        return
+    existing = set(
+        Bookmark.objects.filter(user_id=user_id, blog_id__in=targets).values_list("blog_id", flat=True)
+    )
+    added = [blog_id for blog_id, wanted in targets.items() if wanted and blog_id not in existing]
+    removed = [blog_id for blog_id, wanted in targets.items() if not wanted and blog_id in existing]
+
+    if added:
+        try:
+            # One INSERT; bulk_create skips post_save, so count them here
+            with transaction.atomic():
+                Bookmark.objects.bulk_create([Bookmark(user_id=user_id, blog_id=blog_id) for blog_id in added])
+            counters.adjust_bookmarks(user_id, len(added))
+        except IntegrityError:
+            # Another request bookmarked one since the read: row by row, counted by post_save
+            for blog_id in added:
+                Bookmark.objects.get_or_create(user_id=user_id, blog_id=blog_id)
+    if removed:
+        # Deletes are counted by the post_delete signal
+        Bookmark.objects.filter(user_id=user_id, blog_id__in=removed).delete()
+
+
+def _apply_views(views):
+    by_amount = {}
+    for blog_id, amount in views.items():
+        by_amount.setdefault(amount, []).append(blog_id)
+    for amount, blog_ids in by_amount.items():
+        Blog.objects.filter(id__in=blog_ids).update(views=F("views") + amount)
+
+
+def ingest(user, events):
+    """
+    Apply a batch of interaction events for `user` in one transaction.
+    Raises InvalidEvent for a malformed batch (nothing is applied).
+    Returns (state of every known blog in the batch, reaction summaries of
+    blogs whose reaction changed, ids of unknown blogs).
+    """
+    reaction_targets, bookmark_targets, views = collapse_events(events)
+
+    blog_ids = set(reaction_targets) | set(bookmark_targets) | set(views)
+    blogs = {blog.id: blog for blog in Blog.objects.filter(id__in=blog_ids).only("id", "author_id", "title", "category_id")}
+    missing = sorted(blog_ids - set(blogs))
+    reaction_targets = {pk: value for pk, value in reaction_targets.items() if pk in blogs}
+    bookmark_targets = {pk: value for pk, value in bookmark_targets.items() if pk in blogs}
+    views = Counter({pk: count for pk, count in views.items() if pk in blogs})
+
+    with transaction.atomic():
+        changes = reactions.apply_many(user.id, reaction_targets) if reaction_targets else {}
+        _apply_bookmarks(user.id, bookmark_targets)
+        _apply_views(views)
+
+        # One broadcast (and at most one author notification) per blog
+        for blog_id, change in changes.items():
+            transaction.on_commit(lambda change=change, blog=blogs[blog_id]: reactions.notify(change, blog, user))
+
+    summaries = {blog_id: change.summary for blog_id, change in changes.items()}
+    return interaction_state(user.id, list(blogs)), summaries, missing
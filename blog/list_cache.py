@@ -0,0 +1,38 @@
+from django.conf import settings
+from django.core.cache import cache
+
+
+# ==========================================================
+# 🔹 Cached public blog lists
+# ==========================================================
+# Trending / top blogs are the same for every visitor, so the ranking (not
+# the serialized page, which carries per-user fields) is cached for
+# BLOG_LIST_CACHE_SECONDS. Keys embed a shared version number:
+#   - invalidate() bumps it, so every worker drops every list at once
+#   - called when a blog enters or leaves the published set (signals.py),
+#     once per scheduler batch (blogs_published), not once per row
+# View counts and reactions only move the rankings within the timeout.
+
+VERSION_KEY = "blog_lists:version"
+
+
+def _version():
+    cache.add(VERSION_KEY, 1, None)
+    return cache.get(VERSION_KEY, 1)
+
+
+def get_or_set(name, compute):
+    """The cached value of list `name`, computing (and storing) it on a miss."""
+    key = f"blog_lists:{_version()}:{name}"
+    value = cache.get(key)
+    if value is None:
+        value = compute()
+        cache.set(key, value, getattr(settings, "BLOG_LIST_CACHE_SECONDS", 60))
+    return value
+
+
+def invalidate():
+    try:
+        cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 2, None)
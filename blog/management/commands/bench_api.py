@@ -0,0 +1,133 @@
+import contextlib
+import io
+import random
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import Client
+from rest_framework.throttling import SimpleRateThrottle
+from rest_framework_simplejwt.tokens import AccessToken
+
+from blog.benchmarking import build_report, percentile, summarize, write_report
+from blog.models import Blog, CustomUser
+from blog.profiling import Profile
+
+# name -> (method, path template, authenticated, body)
+ENDPOINTS = {
+    "blog_list": ("get", "/api/blogs/?page={page}", False, None),
+    "trending": ("get", "/api/blogs/trending/", False, None),
+    "feed": ("get", "/api/feed/", True, None),
+    "blog_detail": ("get", "/api/blogs/{blog}/", False, None),
+    "comments": ("get", "/api/blogs/{blog}/comments/", False, None),
+    "reaction_toggle": ("post", "/api/blogs/{blog}/reactions/toggle/", True, {"reaction_type": "like"}),
+    "bookmark_toggle": ("post", "/api/blogs/{blog}/bookmark/", True, None),
+    "notifications": ("get", "/api/user/notifications/", True, None),
+    "unread_count": ("get", "/api/notifications/unread-count/", True, None),
+    "stats": ("get", "/api/stats/", True, None),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the main API endpoints through the test client against seed_benchmark_data rows; "
+        "report p50/p95/p99 latency and queries per request as JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=100, help="Measured requests per endpoint")
+        parser.add_argument("--warmup", type=int, default=5, help="Unmeasured requests per endpoint first")
+        parser.add_argument("--endpoints", nargs="+", choices=sorted(ENDPOINTS), default=list(ENDPOINTS))
+        parser.add_argument("--prefix", default="bench", help="Prefix given to seed_benchmark_data")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--keep-throttles", action="store_true",
+                            help="Leave DEFAULT_THROTTLE_RATES as configured (toggles will hit 429s)")
+        parser.add_argument("--output", help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        user_ids = list(
+            CustomUser.objects.filter(username__startswith=f"{options['prefix']}_user_")
+            .order_by("id").values_list("id", flat=True)
+        )
+        blog_ids = list(
+            Blog.objects.filter(author_id__in=user_ids, status="published").order_by("id").values_list("id", flat=True)
+        )
+        if not user_ids or not blog_ids:
+            raise CommandError(f"No '{options['prefix']}' data found; run seed_benchmark_data first")
+
+        rng = random.Random(options["seed"])
+        tokens = {pk: str(AccessToken.for_user(CustomUser(pk=pk))) for pk in rng.sample(user_ids, min(50, len(user_ids)))}
+        pages = max(1, len(blog_ids) // 9)
+
+        saved_rates = SimpleRateThrottle.THROTTLE_RATES
+        if not options["keep_throttles"]:
+            # Throttles still run (cache round trip), they just never refuse
+            SimpleRateThrottle.THROTTLE_RATES = {scope: "1000000/second" for scope in saved_rates}
+
+        results = []
+        try:
+            # Consumers / signals print on every event; keep the report readable
+            with contextlib.redirect_stdout(io.StringIO()):
+                for name in options["endpoints"]:
+                    results.append(self._endpoint(name, options, rng, tokens, blog_ids, pages))
+        finally:
+            SimpleRateThrottle.THROTTLE_RATES = saved_rates
+
+        report = build_report(
+            "api", results,
+            requests=options["requests"],
+            warmup=options["warmup"],
+            seed=options["seed"],
+            users=len(user_ids),
+            published_blogs=len(blog_ids),
+            engine=connections["default"].vendor,
+        )
+        write_report(report, self.stdout, options.get("output"))
+
+    def _endpoint(self, name, options, rng, tokens, blog_ids, pages):
+        method, template, authenticated, body = ENDPOINTS[name]
+        client = Client()
+        latencies, queries, sql_ms, statuses = [], [], [], {}
+
+        for n in range(options["warmup"] + options["requests"]):
+            blog_id = rng.choice(blog_ids)
+            path = template.format(blog=blog_id, page=rng.randint(1, pages))
+            headers = {}
+            if authenticated:
+                headers["HTTP_AUTHORIZATION"] = f"Bearer {tokens[rng.choice(list(tokens))]}"
+
+            profile = Profile()
+            started = time.perf_counter()
+            with ExitStack() as stack:
+                for connection in connections.all(initialized_only=False):
+                    stack.enter_context(connection.execute_wrapper(profile))
+                if method == "get":
+                    response = client.get(path, **headers)
+                else:
+                    response = client.post(path, body or {}, content_type="application/json", **headers)
+            elapsed = (time.perf_counter() - started) * 1000
+
+            if n < options["warmup"]:
+                continue
+            latencies.append(elapsed)
+            queries.append(profile.queries)
+            sql_ms.append(profile.sql_seconds * 1000)
+            statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        queries.sort()
+        return {
+            "endpoint": name,
+            "method": method.upper(),
+            "path": template,
+            "statuses": statuses,
+            "latency": summarize(latencies),
+            "sql": summarize(sql_ms),
+            "queries": {
+                "mean": round(sum(queries) / len(queries), 2) if queries else None,
+                "p50": percentile(queries, 50),
+                "p95": percentile(queries, 95),
+                "p99": percentile(queries, 99),
+                "max": queries[-1] if queries else None,
+            },
+        }
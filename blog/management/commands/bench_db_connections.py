@@ -0,0 +1,145 @@
+import asyncio
+import contextlib
+import gc
+import io
+import time
+from urllib.parse import urlsplit
+
+from django.core.handlers.asgi import ASGIHandler
+from django.core.handlers.wsgi import WSGIHandler
+from django.core.management.base import BaseCommand
+from django.db import connections
+from django.test import RequestFactory
+
+from blog import db_connections
+from blog.benchmarking import build_report, summarize, write_report
+from blog.db_connections import DatabaseThreadPool
+
+
+class Command(BaseCommand):
+    help = "Benchmark database connection opens and latency per request: per-request vs persistent connections, WSGI and ASGI"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--requests", type=int, default=500, help="Requests per scenario")
+        parser.add_argument("--concurrency", type=int, default=10, help="Concurrent requests in the ASGI scenarios")
+        parser.add_argument("--path", default="/api/blogs/", help="GET endpoint to request")
+        parser.add_argument("--conn-max-age", type=int, default=60,
+                            help="CONN_MAX_AGE for the persistent scenarios")
+        parser.add_argument("--pool-size", type=int, help="DatabaseThreadPool size (default: DB_POOL_SIZE)")
+        parser.add_argument("--output", help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        scenarios = [
+            ("wsgi", "per_request", 0, self._run_wsgi),
+            ("wsgi", "persistent", options["conn_max_age"], self._run_wsgi),
+            # Django's ASGI handler: a new thread (so a new connection) per request
+            ("asgi", "thread_per_request", options["conn_max_age"], self._run_asgi),
+            ("asgi", "thread_pool", options["conn_max_age"], self._run_asgi_pooled),
+        ]
+        saved = {alias: connections.settings[alias].get("CONN_MAX_AGE", 0) for alias in connections.settings}
+
+        results = []
+        try:
+            for server, mode, conn_max_age, run in scenarios:
+                for alias in connections.settings:
+                    connections.settings[alias]["CONN_MAX_AGE"] = conn_max_age
+                connections.close_all()
+                gc.collect()
+
+                connects_before = db_connections.STATS["connects"]
+                started = time.perf_counter()
+                # UserActivityMiddleware / consumers print; keep the report readable
+                with contextlib.redirect_stdout(io.StringIO()):
+                    latencies, errors = run(options)
+                elapsed = time.perf_counter() - started
+                connects = db_connections.STATS["connects"] - connects_before
+
+                results.append({
+                    "server": server,
+                    "mode": mode,
+                    "conn_max_age": conn_max_age,
+                    "connects": connects,
+                    "connects_per_request": round(connects / max(1, len(latencies)), 3),
+                    "errors": errors,
+                    "requests_per_second": round(len(latencies) / elapsed, 1) if elapsed else None,
+                    "latency": summarize(latencies),
+                })
+        finally:
+            for alias, conn_max_age in saved.items():
+                connections.settings[alias]["CONN_MAX_AGE"] = conn_max_age
+            connections.close_all()
+
+        report = build_report(
+            "db_connections", results,
+            path=options["path"],
+            requests=options["requests"],
+            concurrency=options["concurrency"],
+            pool_size=options["pool_size"] or db_connections.metrics()["pool_size"],
+            engine=connections["default"].vendor,
+        )
+        write_report(report, self.stdout, options.get("output"))
+
+    # ----------------------------------------------------------
+    # WSGI: one thread, requests in sequence
+    # ----------------------------------------------------------
+    def _run_wsgi(self, options):
+        handler = WSGIHandler()
+        factory = RequestFactory()
+        latencies, errors = [], 0
+
+        for _ in range(options["requests"]):
+            environ = factory.get(options["path"]).environ
+            status = []
+            started = time.perf_counter()
+            response = handler(environ, lambda code, headers, *args: status.append(code))
+            b"".join(response)
+            response.close()  # request_finished: close or keep the connection
+            latencies.append((time.perf_counter() - started) * 1000)
+            if not status or not status[0].startswith("200"):
+                errors += 1
+        return latencies, errors
+
+    # ----------------------------------------------------------
+    # ASGI: `concurrency` requests in flight
+    # ----------------------------------------------------------
+    def _run_asgi(self, options):
+        return asyncio.run(self._asgi_requests(ASGIHandler(), options))
+
+    def _run_asgi_pooled(self, options):
+        return asyncio.run(self._asgi_requests(DatabaseThreadPool(ASGIHandler(), options["pool_size"]), options))
+
+    async def _asgi_requests(self, app, options):
+        url = urlsplit(options["path"])
+        semaphore = asyncio.Semaphore(options["concurrency"])
+        latencies, errors = [], 0
+
+        async def one():
+            nonlocal errors
+            scope = {
+                "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+                "method": "GET", "scheme": "http", "root_path": "",
+                "path": url.path, "raw_path": url.path.encode(), "query_string": url.query.encode(),
+                "headers": [(b"host", b"localhost")],
+                "client": ("127.0.0.1", 0), "server": ("localhost", 80),
+            }
+            body = [{"type": "http.request", "body": b"", "more_body": False}]
+            status = []
+
+            async def receive():
+                if body:
+                    return body.pop()
+                await asyncio.Event().wait()  # no disconnect; cancelled once the response is sent
+
+            async def send(message):
+                if message["type"] == "http.response.start":
+                    status.append(message["status"])
+
+            async with semaphore:
+                started = time.perf_counter()
+                await app(scope, receive, send)
+                latencies.append((time.perf_counter() - started) * 1000)
+            if status != [200]:
+                errors += 1
+
+        await asyncio.gather(*(one() for _ in range(options["requests"])))
+        return latencies, errors
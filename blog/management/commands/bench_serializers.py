@@ -0,0 +1,88 @@
+import time
+from contextlib import ExitStack
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from rest_framework.test import APIRequestFactory
+from rest_framework.views import APIView
+from taggit.serializers import TagListSerializerField
+
+from blog import fast_serializers
+from blog.benchmarking import build_report, summarize, write_report
+from blog.models import Blog, BlogMedia
+from blog.profiling import Profile
+from blog.serializers import BlogMediaSerializer, BlogSerializer, CategorySerializer, CustomUserSerializer
+
+
+class Command(BaseCommand):
+    help = "Time serializing N blogs with BlogSerializer, its nested serializers and fast_serializers"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--blogs", type=int, default=1000, help="Published blogs serialized per run")
+        parser.add_argument("--repeat", type=int, default=5, help="Timed runs per serializer")
+        parser.add_argument("--output", help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        ids = list(
+            Blog.objects.filter(status="published").order_by("-published_at")
+            .values_list("id", flat=True)[:options["blogs"]]
+        )
+        if not ids:
+            raise CommandError("No published blogs; run seed_benchmark_data first")
+
+        request = APIView().initialize_request(APIRequestFactory().get("/api/blogs/"))
+        context = {"request": request}
+
+        def queryset():
+            return Blog.objects.filter(id__in=ids).order_by("-published_at")
+
+        # Instances for the nested serializers, loaded once outside the timings
+        blogs = list(queryset().select_related("category", "author").prefetch_related("tags"))
+        authors = [blog.author for blog in blogs]
+        categories = [blog.category for blog in blogs if blog.category_id]
+        media = list(BlogMedia.objects.filter(blog_id__in=ids))
+        tag_field = TagListSerializerField()
+
+        scenarios = [
+            # End to end from a queryset, as the list views run them
+            ("BlogSerializer", lambda: BlogSerializer(
+                queryset().select_related("category", "author").prefetch_related("tags"),
+                many=True, context=context).data),
+            ("fast_serializers.serialize_blogs", lambda: fast_serializers.serialize_blogs(
+                fast_serializers.blog_rows(queryset()), request)),
+            # Nested pieces on preloaded instances: serializer overhead only
+            ("CustomUserSerializer", lambda: CustomUserSerializer(authors, many=True).data),
+            ("CategorySerializer", lambda: CategorySerializer(categories, many=True).data),
+            ("BlogMediaSerializer", lambda: BlogMediaSerializer(media, many=True, context=context).data),
+            ("TagListSerializerField", lambda: [tag_field.to_representation(blog.tags) for blog in blogs]),
+        ]
+
+        results = []
+        for name, run in scenarios:
+            run()  # warm up
+            timings, queries = [], 0
+            for _ in range(options["repeat"]):
+                profile = Profile()
+                started = time.perf_counter()
+                with ExitStack() as stack:
+                    for connection in connections.all(initialized_only=False):
+                        stack.enter_context(connection.execute_wrapper(profile))
+                    items = len(run())
+                timings.append((time.perf_counter() - started) * 1000)
+                queries = profile.queries
+            stats = summarize(timings)
+            results.append({
+                "serializer": name,
+                "items": items,
+                "queries": queries,
+                "us_per_item": round(stats["p50_ms"] * 1000 / items, 1) if items else None,
+                "timing": stats,
+            })
+
+        report = build_report(
+            "serializers", results,
+            blogs=len(ids),
+            repeat=options["repeat"],
+            engine=connections["default"].vendor,
+        )
+        write_report(report, self.stdout, options.get("output"))
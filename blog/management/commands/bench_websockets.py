@@ -0,0 +1,149 @@
+import asyncio
+import contextlib
+import io
+import json
+import time
+import uuid
+
+from channels.layers import get_channel_layer
+from channels.routing import URLRouter
+from channels.testing.websocket import WebsocketCommunicator
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.test.utils import override_settings
+
+from blog.benchmarking import build_report, summarize, write_report
+from blog.models import Blog
+from blog.routing import websocket_urlpatterns
+
+IN_MEMORY_LAYERS = {
+    "default": {
+        "BACKEND": "blog.channel_layers.TunedInMemoryChannelLayer",
+        "CONFIG": {"capacity": 1000, "expiry": 60},
+    },
+}
+
+
+class Command(BaseCommand):
+    help = "Benchmark WebSocket connect rate and broadcast fan-out latency for BlogConsumer / NotificationConsumer"
+
+    def add_arguments(self, parser):
+        parser.add_argument("--clients", type=int, nargs="+", default=[1000, 10000],
+                            help="Simulated client counts to run (default: 1000 10000)")
+        parser.add_argument("--consumer", choices=["blog", "notifications", "all"], default="all")
+        parser.add_argument("--broadcasts", type=int, default=5,
+                            help="Broadcasts sent per scenario once all clients are connected")
+        parser.add_argument("--batch", type=int, default=500,
+                            help="Clients connecting concurrently per batch")
+        parser.add_argument("--layer", choices=["memory", "settings"], default="memory",
+                            help="'memory' = in-process layer, 'settings' = CHANNEL_LAYERS from settings")
+        parser.add_argument("--timeout", type=float, default=60)
+        parser.add_argument("--output", help="Also write the JSON report to this file")
+
+    def handle(self, *args, **options):
+        layers = IN_MEMORY_LAYERS if options["layer"] == "memory" else settings.CHANNEL_LAYERS
+        kinds = ["blog", "notifications"] if options["consumer"] == "all" else [options["consumer"]]
+
+        # Consumers read through their own thread's connection, so the fixtures
+        # must be committed (no wrapping transaction to roll back); the user is
+        # deleted afterwards, and the blog and anything the run wrote cascade.
+        User = get_user_model()
+        user = User.objects.create_user(username=f"bench_ws_{uuid.uuid4().hex[:8]}", password=None)
+        try:
+            blog = Blog.objects.create(
+                author=user, title="WebSocket benchmark", content="<p>bench</p>", status="published"
+            )
+            with override_settings(CHANNEL_LAYERS=layers):
+                # Consumers print on every connect/disconnect; keep the report readable.
+                with contextlib.redirect_stdout(io.StringIO()):
+                    results = asyncio.run(self._run_all(kinds, options, blog, user))
+        finally:
+            user.delete()
+
+        report = build_report(
+            "websockets", results,
+            layer=layers["default"]["BACKEND"],
+            clients=options["clients"],
+            broadcasts=options["broadcasts"],
+            batch=options["batch"],
+        )
+        write_report(report, self.stdout, options.get("output"))
+
+    async def _run_all(self, kinds, options, blog, user):
+        results = []
+        for kind in kinds:
+            for clients in options["clients"]:
+                results.append(await self._scenario(kind, clients, options, blog, user))
+        return results
+
+    async def _scenario(self, kind, clients, options, blog, user):
+        application = URLRouter(websocket_urlpatterns)
+        timeout = options["timeout"]
+
+        if kind == "blog":
+            path = f"/ws/blog/{blog.id}/"
+            group = f"blog_{blog.id}"
+            event = {
+                "type": "reaction_update",
+                "reaction_summary": {"like": 1, "love": 0, "laugh": 0, "angry": 0},
+            }
+            frame_type = "reaction_update"
+        else:
+            path = "/ws/notifications/"
+            group = f"user_{user.id}_notifications"
+            event = {
+                "type": "send_notification",
+                "value": {"id": 0, "message": "bench", "type": "announcement", "is_read": False},
+            }
+            frame_type = "new_notification"
+
+        # ---------- Connect ----------
+        communicators = []
+        connected = 0
+        started = time.perf_counter()
+        for offset in range(0, clients, options["batch"]):
+            batch = []
+            for _ in range(min(options["batch"], clients - offset)):
+                communicator = WebsocketCommunicator(application, path)
+                communicator.scope["user"] = user
+                batch.append(communicator)
+            accepted = await asyncio.gather(*(c.connect(timeout=timeout) for c in batch))
+            open_batch = [c for c, (ok, _) in zip(batch, accepted) if ok]
+            # Drain the initial payload every consumer sends after accept()
+            await asyncio.gather(*(c.receive_from(timeout=timeout) for c in open_batch))
+            connected += len(open_batch)
+            communicators.extend(open_batch)
+        connect_seconds = time.perf_counter() - started
+
+        # ---------- Broadcast fan-out ----------
+        layer = get_channel_layer()
+        latencies = []
+        fanout = []
+
+        async def timed_receive(communicator):
+            # Skip anything else the consumer sends meanwhile (BlogConsumer's presence_update)
+            while json.loads(await communicator.receive_from(timeout=timeout)).get("type") != frame_type:
+                pass
+            return time.perf_counter()
+
+        for _ in range(options["broadcasts"]):
+            sent = time.perf_counter()
+            await layer.group_send(group, event)
+            received = await asyncio.gather(*(timed_receive(c) for c in communicators))
+            latencies.extend((t - sent) * 1000 for t in received)
+            fanout.append((max(received) - sent) * 1000 if received else 0)
+
+        # ---------- Teardown ----------
+        for offset in range(0, len(communicators), options["batch"]):
+            await asyncio.gather(*(c.disconnect() for c in communicators[offset:offset + options["batch"]]))
+
+        return {
+            "consumer": kind,
+            "clients": clients,
+            "connected": connected,
+            "connect_seconds": round(connect_seconds, 3),
+            "connects_per_second": round(connected / connect_seconds, 1) if connect_seconds else None,
+            "delivery_latency": summarize(latencies),
+            "fanout_complete": summarize(fanout),
+        }
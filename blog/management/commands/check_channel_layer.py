@@ -0,0 +1,29 @@
+import asyncio
+
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = "Round-trip a message through the configured channel layer (Redis or in-memory)"
+
+    def handle(self, *args, **options):
+        layer = get_channel_layer()
+        if layer is None:
+            raise CommandError("No channel layer configured (CHANNEL_LAYERS is empty).")
+
+        backend = settings.CHANNEL_LAYERS["default"]["BACKEND"]
+        try:
+            message = asyncio.run(self._round_trip(layer))
+        except Exception as e:
+            raise CommandError(f"❌ Channel layer check failed ({backend}): {e}")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"✅ Channel layer OK ({backend}) — received: {message['text']}"
+        ))
+
+    async def _round_trip(self, layer):
+        channel = await layer.new_channel()
+        await layer.send(channel, {"type": "test.message", "text": "Hello channel layer!"})
+        return await asyncio.wait_for(layer.receive(channel), timeout=5)
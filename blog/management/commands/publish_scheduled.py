@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+from django.utils import timezone
+
+from blog.scheduler import next_publish_at, publish_due_blogs
+
+
+class Command(BaseCommand):
+    help = 'Publish scheduled blogs whose publish_at has passed'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--loop', action='store_true',
+                            help='Keep running and publish posts as they become due')
+        parser.add_argument('--interval', type=float, default=30,
+                            help='Max seconds to sleep between checks in --loop mode (default: 30)')
+        parser.add_argument('--batch-size', type=int, default=500,
+                            help='Rows published per UPDATE statement (default: 500)')
+
+    def handle(self, *args, **options):
+        if not options['loop']:
+            self.publish(options['batch_size'])
+            return
+
+        self.stdout.write(f"⏱️ Scheduler running (max interval {options['interval']}s)")
+        try:
+            while True:
+                close_old_connections()
+                self.publish(options['batch_size'])
+                time.sleep(self.seconds_until_next(options['interval']))
+        except KeyboardInterrupt:
+            self.stdout.write("Scheduler stopped")
+
+    def publish(self, batch_size):
+        ids = publish_due_blogs(batch_size=batch_size)
+        if ids:
+            self.stdout.write(self.style.SUCCESS(f"Published {len(ids)} blog(s): {ids}"))
+        return ids
+
+    def seconds_until_next(self, interval):
+        """Sleep until the next scheduled post is due, but never longer than `interval`."""
+        now = timezone.now()
+        upcoming = next_publish_at(now)
+        if upcoming is None:
+            return interval
+        return min(interval, max((upcoming - now).total_seconds(), 0.05))
@@ -0,0 +1,17 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.facets import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recompute the category / tag facet count tables from published blogs'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        categories, tags = rebuild()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {categories} category and {tags} tag facet row(s) in {elapsed:.2f}s"
+        ))
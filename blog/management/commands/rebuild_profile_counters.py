@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.counters import rebuild
+
+
+class Command(BaseCommand):
+    help = 'Recount followers / following / bookmarks for every profile'
+
+    def handle(self, *args, **options):
+        total = rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Recounted {total} profile(s)"))
@@ -0,0 +1,11 @@
+from django.core.management.base import BaseCommand
+
+from blog.reactions import rebuild_counts
+
+
+class Command(BaseCommand):
+    help = 'Recount the per-blog reaction totals (ReactionCount) from Reaction rows'
+
+    def handle(self, *args, **options):
+        total = rebuild_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {total} reaction count row(s)"))
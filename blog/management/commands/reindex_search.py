@@ -0,0 +1,26 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.models import Blog
+from blog.search import reindex_blogs
+
+
+class Command(BaseCommand):
+    help = 'Rebuild Blog.search_text for all (or selected) blogs in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--chunk-size', type=int, default=500,
+                            help='Blogs loaded and written per batch (default: 500)')
+        parser.add_argument('--ids', type=int, nargs='+',
+                            help='Only reindex these blog ids')
+
+    def handle(self, *args, **options):
+        queryset = Blog.objects.all()
+        if options['ids']:
+            queryset = queryset.filter(id__in=options['ids'])
+
+        started = time.perf_counter()
+        total = reindex_blogs(queryset, chunk_size=options['chunk_size'])
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Reindexed {total} blog(s) in {elapsed:.2f}s"))
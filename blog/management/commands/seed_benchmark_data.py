@@ -0,0 +1,243 @@
+import random
+import time
+from datetime import timedelta
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.contenttypes.models import ContentType
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from django.utils import timezone
+from django.utils.text import slugify
+from taggit.models import Tag, TaggedItem
+
+from blog import counters, facets, feed, reactions, search, tag_index
+from blog.models import (
+    Blog, Bookmark, Category, Comment, CustomUser, Notification, NotificationCounter, Profile, Reaction,
+)
+
+WORDS = (
+    "django channels python query index cache latency stream socket async worker thread "
+    "database replica cursor feed timeline comment reaction bookmark notification search "
+    "tag category profile follow publish draft schedule benchmark request response shard"
+).split()
+
+BENCH_PASSWORD = "bench-password"
+
+
+class Command(BaseCommand):
+    help = (
+        "Generate synthetic users, blogs, tags, comments, reactions, bookmarks and notifications "
+        "with bulk_create for bench_api (deterministic for a given --seed)"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--blogs", type=int, default=1000)
+        parser.add_argument("--categories", type=int, default=10)
+        parser.add_argument("--tags", type=int, default=50)
+        parser.add_argument("--tags-per-blog", type=int, default=3)
+        parser.add_argument("--follows", type=int, default=10, help="Authors followed per user")
+        parser.add_argument("--comments", type=int, default=5000)
+        parser.add_argument("--reply-depth", type=int, default=2,
+                            help="Levels of replies below top-level comments")
+        parser.add_argument("--reply-ratio", type=float, default=0.3,
+                            help="Share of comments that are replies")
+        parser.add_argument("--reactions", type=int, default=10000)
+        parser.add_argument("--bookmarks", type=int, default=3000)
+        parser.add_argument("--notifications", type=int, default=5000)
+        parser.add_argument("--content-words", type=int, default=300)
+        parser.add_argument("--prefix", default="bench", help="Username / category / tag prefix of generated rows")
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument("--flush", action="store_true",
+                            help="Delete previously generated data with this prefix first")
+
+    def handle(self, *args, **options):
+        self.rng = random.Random(options["seed"])
+        self.batch_size = options["batch_size"]
+        prefix = options["prefix"]
+
+        if options["flush"]:
+            self._flush(prefix)
+        elif CustomUser.objects.filter(username__startswith=f"{prefix}_").exists():
+            raise CommandError(f"Data with prefix '{prefix}' already exists; pass --flush to replace it")
+
+        started = time.perf_counter()
+        with transaction.atomic():
+            user_ids, profile_ids = self._users(prefix, options["users"])
+            self._follows(profile_ids, options["follows"])
+            category_ids = self._categories(prefix, options["categories"])
+            tag_ids = self._tags(prefix, options["tags"])
+            blog_ids, published_ids = self._blogs(prefix, user_ids, category_ids, options)
+            self._tag_blogs(blog_ids, tag_ids, options["tags_per_blog"])
+            comments = self._comments(user_ids, published_ids, options)
+            reaction_count = self._pairs(Reaction, user_ids, published_ids, options["reactions"],
+                                         reaction_type=lambda: self.rng.choice(reactions.SUMMARY_TYPES))
+            bookmark_count = self._pairs(Bookmark, user_ids, published_ids, options["bookmarks"])
+            notification_count = self._notifications(user_ids, published_ids, options["notifications"])
+        seeded = time.perf_counter() - started
+
+        # bulk_create skips the signals that keep these in sync
+        self.stdout.write("Rebuilding derived data...")
+        reactions.rebuild_counts()
+        counters.rebuild()
+        search.reindex_blogs(Blog.objects.filter(id__in=blog_ids))
+        facets.rebuild()
+        feed.fan_out(published_ids)
+        tag_index.rebuild(from_db=True)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(user_ids)} users, {len(blog_ids)} blogs ({len(published_ids)} published), "
+            f"{len(category_ids)} categories, {len(tag_ids)} tags, {comments} comments, "
+            f"{reaction_count} reactions, {bookmark_count} bookmarks, {notification_count} notifications "
+            f"in {seeded:.1f}s (+{time.perf_counter() - started - seeded:.1f}s rebuilding). "
+            f"Users are {prefix}_user_<n> / '{BENCH_PASSWORD}'."
+        ))
+
+    # ----------------------------------------------------------
+    # Generators
+    # ----------------------------------------------------------
+    def _text(self, words):
+        return " ".join(self.rng.choice(WORDS) for _ in range(words))
+
+    def _users(self, prefix, count):
+        password = make_password(BENCH_PASSWORD)  # hashed once, shared
+        CustomUser.objects.bulk_create([
+            CustomUser(username=f"{prefix}_user_{n}", email=f"{prefix}_user_{n}@example.com",
+                       password=password, role="author" if n % 5 == 0 else "reader")
+            for n in range(count)
+        ], batch_size=self.batch_size)
+        user_ids = list(
+            CustomUser.objects.filter(username__startswith=f"{prefix}_user_").order_by("id").values_list("id", flat=True)
+        )
+        Profile.objects.bulk_create([Profile(user_id=pk) for pk in user_ids], batch_size=self.batch_size)
+        profile_ids = list(Profile.objects.filter(user_id__in=user_ids).order_by("user_id").values_list("id", flat=True))
+        return user_ids, profile_ids
+
+    def _follows(self, profile_ids, per_user):
+        Follow = Profile.following.through
+        rows = []
+        for profile_id in profile_ids:
+            others = [pk for pk in self.rng.sample(profile_ids, min(per_user + 1, len(profile_ids))) if pk != profile_id]
+            rows.extend(Follow(from_profile_id=profile_id, to_profile_id=pk) for pk in others[:per_user])
+        Follow.objects.bulk_create(rows, batch_size=self.batch_size, ignore_conflicts=True)
+
+    def _categories(self, prefix, count):
+        names = [f"{prefix} category {n}" for n in range(count)]
+        Category.objects.bulk_create([Category(name=name, slug=slugify(name)) for name in names])
+        return list(Category.objects.filter(name__in=names).values_list("id", flat=True))
+
+    def _tags(self, prefix, count):
+        names = [f"{prefix}-tag-{n}" for n in range(count)]
+        Tag.objects.bulk_create([Tag(name=name, slug=name) for name in names], ignore_conflicts=True)
+        return list(Tag.objects.filter(name__in=names).values_list("id", flat=True))
+
+    def _blogs(self, prefix, user_ids, category_ids, options):
+        now = timezone.now()
+        authors = user_ids[::5] or user_ids
+        blogs = []
+        for n in range(options["blogs"]):
+            published = self.rng.random() < 0.9
+            blogs.append(Blog(
+                author_id=self.rng.choice(authors),
+                title=f"{prefix} post {n}: {self._text(6)}",
+                content=f"<p>{self._text(options['content_words'])}</p>",
+                status="published" if published else "draft",
+                category_id=self.rng.choice(category_ids) if category_ids else None,
+                views=self.rng.randint(0, 5000),
+                is_featured=self.rng.random() < 0.05,
+                is_approved=True,
+                published_at=now - timedelta(minutes=self.rng.randint(0, 60 * 24 * 180)) if published else None,
+            ))
+        Blog.objects.bulk_create(blogs, batch_size=self.batch_size)
+
+        rows = list(Blog.objects.filter(author_id__in=authors).order_by("id").values_list("id", "status"))
+        return [pk for pk, _ in rows], [pk for pk, status in rows if status == "published"]
+
+    def _tag_blogs(self, blog_ids, tag_ids, per_blog):
+        if not tag_ids:
+            return
+        content_type = ContentType.objects.get_for_model(Blog)
+        TaggedItem.objects.bulk_create([
+            TaggedItem(content_type=content_type, object_id=blog_id, tag_id=tag_id)
+            for blog_id in blog_ids
+            for tag_id in self.rng.sample(tag_ids, min(per_blog, len(tag_ids)))
+        ], batch_size=self.batch_size)
+
+    def _comments(self, user_ids, blog_ids, options):
+        total = options["comments"]
+        if not blog_ids or not total:
+            return 0
+        depth = options["reply_depth"]
+        replies = int(total * options["reply_ratio"]) if depth else 0
+        # Top level first, then each reply level points at the level above
+        levels = [total - replies] + [replies // depth + (1 if n < replies % depth else 0) for n in range(depth)]
+
+        last_id = Comment.objects.order_by("-id").values_list("id", flat=True).first() or 0
+        parents = None
+        for count in levels:
+            if not count:
+                break
+            comments = []
+            for _ in range(count):
+                if parents:
+                    parent_id, blog_id = self.rng.choice(parents)
+                else:
+                    parent_id, blog_id = None, self.rng.choice(blog_ids)
+                comments.append(Comment(blog_id=blog_id, user_id=self.rng.choice(user_ids),
+                                        parent_id=parent_id, content=self._text(self.rng.randint(5, 40))))
+            Comment.objects.bulk_create(comments, batch_size=self.batch_size)
+            parents = list(Comment.objects.filter(id__gt=last_id).order_by("id").values_list("id", "blog_id"))
+            last_id = parents[-1][0]
+        return sum(levels)
+
+    def _pairs(self, model, user_ids, blog_ids, count, **fields):
+        """`count` rows of `model`, each a distinct (user, blog) pair."""
+        count = min(count, len(user_ids) * len(blog_ids))
+        pairs = set()
+        while len(pairs) < count:
+            pairs.add((self.rng.choice(user_ids), self.rng.choice(blog_ids)))
+        model.objects.bulk_create([
+            model(user_id=user_id, blog_id=blog_id, **{name: make() for name, make in fields.items()})
+            for user_id, blog_id in sorted(pairs)
+        ], batch_size=self.batch_size)
+        return count
+
+    def _notifications(self, user_ids, blog_ids, count):
+        if not blog_ids:
+            return 0
+        # Fresh users: number the seqs here and write the counters in one batch
+        # (Notification.objects.bulk_create would reserve a block per user)
+        seqs = dict.fromkeys(user_ids, 0)
+        notifications = []
+        for _ in range(count):
+            user_id = self.rng.choice(user_ids)
+            seqs[user_id] += 1
+            notification_type = self.rng.choice(("comment", "reaction", "announcement"))
+            notifications.append(Notification(
+                user_id=user_id,
+                sender_id=self.rng.choice(user_ids),
+                blog_id=self.rng.choice(blog_ids),
+                notification_type=notification_type,
+                message=f"Benchmark {notification_type}: {self._text(8)}",
+                is_read=self.rng.random() < 0.6,
+                seq=seqs[user_id],
+            ))
+        Notification.objects.bulk_create(notifications, batch_size=self.batch_size)
+        NotificationCounter.objects.bulk_create(
+            [NotificationCounter(user_id=user_id, last_seq=seq) for user_id, seq in seqs.items() if seq],
+            batch_size=self.batch_size,
+        )
+        return count
+
+    def _flush(self, prefix):
+        started = time.perf_counter()
+        with transaction.atomic():
+            users = CustomUser.objects.filter(username__startswith=f"{prefix}_")
+            Blog.objects.filter(author__in=users).delete()
+            users.delete()
+            Category.objects.filter(name__startswith=f"{prefix} category ").delete()
+            Tag.objects.filter(name__startswith=f"{prefix}-tag-").delete()
+        facets.rebuild()
+        tag_index.rebuild(from_db=True)
+        self.stdout.write(f"Removed previous '{prefix}' data in {time.perf_counter() - started:.1f}s")
@@ -0,0 +1,15 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from blog.feed import trim_all
+
+
+class Command(BaseCommand):
+    help = 'Trim home feed timelines to FEED_MAX_ENTRIES (run periodically, e.g. hourly from cron)'
+
+    def handle(self, *args, **options):
+        started = time.perf_counter()
+        owners = trim_all()
+        elapsed = time.perf_counter() - started
+        self.stdout.write(self.style.SUCCESS(f"Trimmed {len(owners)} timeline(s) in {elapsed:.2f}s"))
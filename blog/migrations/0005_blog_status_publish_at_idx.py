@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:51
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0004_alter_customuser_role'),
+        ('taggit', '0006_rename_taggeditem_content_type_object_id_taggit_tagg_content_8fc721_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='blog',
+            index=models.Index(fields=['status', 'publish_at'], name='blog_status_publish_at_idx'),
+        ),
+    ]
@@ -0,0 +1,26 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:53
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0005_blog_status_publish_at_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('frequency', models.PositiveIntegerField(default=1)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_terms', to='blog.blog')),
+            ],
+            options={
+                'unique_together': {('term', 'blog')},
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:59
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def _count(queryset, field):
+    return Coalesce(Subquery(
+        queryset.filter(**{field: OuterRef('pk')}).order_by()
+        .values(field).annotate(n=Count('*')).values('n')
+    ), 0)
+
+
+def merge_bookmarks_and_fill_counters(apps, schema_editor):
+    """Fold Profile.bookmarks and CustomUser.saved_blogs into Bookmark, then count."""
+    Bookmark = apps.get_model('blog', 'Bookmark')
+    Profile = apps.get_model('blog', 'Profile')
+    CustomUser = apps.get_model('blog', 'CustomUser')
+
+    legacy = set(
+        Profile.bookmarks.through.objects.values_list('profile__user_id', 'blog_id')
+    ) | set(
+        CustomUser.saved_blogs.through.objects.values_list('customuser_id', 'blog_id')
+    )
+    Bookmark.objects.bulk_create(
+        [Bookmark(user_id=user_id, blog_id=blog_id) for user_id, blog_id in legacy],
+        batch_size=1000, ignore_conflicts=True,
+    )
+
+    follows = Profile.following.through.objects.all()
+    bookmarks = Bookmark.objects.all()
+    Profile.objects.update(
+        followers_count=_count(follows, 'to_profile_id'),
+        following_count=_count(follows, 'from_profile_id'),
+    )
+    Profile.objects.update(bookmarks_count=Coalesce(Subquery(
+        bookmarks.filter(user_id=OuterRef('user_id')).order_by()
+        .values('user_id').annotate(n=Count('*')).values('n')
+    ), 0))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0008_feedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='bookmarks_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(merge_bookmarks_and_fill_counters, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='customuser',
+            name='saved_blogs',
+        ),
+        migrations.RemoveField(
+            model_name='profile',
+            name='bookmarks',
+        ),
+    ]
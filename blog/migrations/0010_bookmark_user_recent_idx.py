@@ -0,0 +1,17 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0009_profile_counters_bookmark_store'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='bookmark',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='bookmark_user_recent_idx'),
+        ),
+    ]
@@ -0,0 +1,41 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:02
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def fill_reaction_counts(apps, schema_editor):
+    Reaction = apps.get_model('blog', 'Reaction')
+    ReactionCount = apps.get_model('blog', 'ReactionCount')
+    ReactionCount.objects.bulk_create(
+        [
+            ReactionCount(blog_id=blog_id, reaction_type=reaction_type, count=count)
+            for blog_id, reaction_type, count in Reaction.objects.order_by()
+            .values_list('blog_id', 'reaction_type').annotate(count=Count('id'))
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0010_bookmark_user_recent_idx'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReactionCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reaction_type', models.CharField(choices=[('like', '👍 Like'), ('dislike', '👎 Dislike'), ('love', '❤️ Love'), ('laugh', '😂 Laugh'), ('angry', '😡 Angry'), ('wow', '😲 Wow')], max_length=10)),
+                ('count', models.PositiveIntegerField(default=0)),
+                ('blog', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reaction_counts', to='blog.blog')),
+            ],
+            options={
+                'unique_together': {('blog', 'reaction_type')},
+            },
+        ),
+        migrations.RunPython(fill_reaction_counts, migrations.RunPython.noop),
+    ]
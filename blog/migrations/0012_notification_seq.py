@@ -0,0 +1,52 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:15
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def number_existing_notifications(apps, schema_editor):
+    """Give existing notifications seq 1..n per user (oldest first) and seed the counters."""
+    Notification = apps.get_model('blog', 'Notification')
+    NotificationCounter = apps.get_model('blog', 'NotificationCounter')
+
+    last_seq = {}
+    batch = []
+    for pk, user_id in Notification.objects.order_by('user_id', 'created_at', 'id').values_list('id', 'user_id').iterator():
+        last_seq[user_id] = last_seq.get(user_id, 0) + 1
+        batch.append(Notification(id=pk, seq=last_seq[user_id]))
+        if len(batch) >= 1000:
+            Notification.objects.bulk_update(batch, ['seq'])
+            batch = []
+    Notification.objects.bulk_update(batch, ['seq'])
+    NotificationCounter.objects.bulk_create(
+        [NotificationCounter(user_id=user_id, last_seq=seq) for user_id, seq in last_seq.items()],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0011_reactioncount'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationCounter',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_counter', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_seq', models.PositiveBigIntegerField(default=0)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='seq',
+            field=models.PositiveBigIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(number_existing_notifications, migrations.RunPython.noop),
+        migrations.AlterUniqueTogether(
+            name='notification',
+            unique_together={('user', 'seq')},
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 07:10
+
+from django.db import migrations
+from django.db.models import F
+
+
+def fill_published_at(apps, schema_editor):
+    """Published blogs saved before published_at was set on publish: use created_at."""
+    Blog = apps.get_model('blog', 'Blog')
+    Blog.objects.filter(status='published', published_at__isnull=True).update(published_at=F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('blog', '0012_notification_seq'),
+    ]
+
+    operations = [
+        migrations.RunPython(fill_published_at, migrations.RunPython.noop),
+    ]
@@ -1,6 +1,8 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
+from django.db.models import F
 from django.contrib.auth.models import AbstractUser
 from taggit.managers import TaggableManager
+from taggit.models import Tag
 from django.utils import timezone
 from django_ckeditor_5.fields import CKEditor5Field
 from markdownx.models import MarkdownxField
@@ -19,14 +21,17 @@ class CustomUser(AbstractUser):
     email_verified = models.BooleanField(default=True)  # Added field for serializer
     is_active = models.BooleanField(default=True)
 
-    # Add saved blogs
-    saved_blogs = models.ManyToManyField(
-        'Blog', blank=True, related_name='saved_by_users'
-    )
-
     def __str__(self):
         return self.username
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # The username is in the search document of the user's blogs; only a
+        # rename reindexes them (signals.py, blog/search.py)
+        instance._search_name = instance.__dict__.get('username')
+        return instance
+
 
 class UserActivity(models.Model):
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
@@ -44,7 +49,11 @@ class Profile(models.Model):
     profile_pic = models.ImageField(upload_to='profiles/', blank=True)
     social_links = models.JSONField(default=dict, blank=True)
     following = models.ManyToManyField('self', symmetrical=False, related_name='followers', blank=True)
-    bookmarks = models.ManyToManyField('Blog', related_name='bookmarked_users', blank=True)
+
+    # Denormalized counters, kept in sync by blog/counters.py (bookmarks live in Bookmark)
+    followers_count = models.PositiveIntegerField(default=0)
+    following_count = models.PositiveIntegerField(default=0)
+    bookmarks_count = models.PositiveIntegerField(default=0)
 
     def __str__(self):
         return f"{self.user.username}'s Profile"
@@ -60,6 +69,17 @@ class Category(models.Model):
     def __str__(self):
         return self.name
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Same as CustomUser: only a rename reindexes the category's blogs
+        instance._search_name = instance.__dict__.get('name')
+        return instance
+
+
+# Fields the search document (Blog.search_text) is built from, besides tags.
+SEARCH_SOURCE_FIELDS = ('title', 'content', 'category_id', 'author_id')
+
 
 class Blog(models.Model):
     STATUS_CHOICES = (
@@ -96,10 +116,32 @@ class Blog(models.Model):
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Scheduler due-queue: status='draft' AND publish_at <= now
+            models.Index(fields=['status', 'publish_at'], name='blog_status_publish_at_idx'),
+        ]
 
     def __str__(self):
         return self.title
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        # Remember what search_text was built from, so saves that don't touch
+        # these fields (e.g. views += 1) skip the reindex. See blog/search.py.
+        instance._search_state = instance.search_source_state()
+        # Same idea for status / category: facet counts (blog/facets.py) and
+        # feed fan-out (blog/feed.py) only react when these change.
+        instance._facet_state = instance.facet_state()
+        return instance
+
+    def search_source_state(self):
+        # Only loaded values: reading a deferred field here would cost a query.
+        return tuple(self.__dict__.get(field) for field in SEARCH_SOURCE_FIELDS)
+
+    def facet_state(self):
+        return (self.__dict__.get('status'), self.__dict__.get('category_id'))
+
     def publish(self):
         self.status = 'published'
         self.published_at = timezone.now()
@@ -109,24 +151,82 @@ class Blog(models.Model):
         return self.publish_at and self.publish_at > timezone.now()
 
     def save(self, *args, **kwargs):
-        if self.publish_at and self.publish_at <= timezone.now():
+        # Scheduled posts are published in bulk by `manage.py publish_scheduled`;
+        # this only catches a due post that happens to be saved first.
+        if self.status != 'published' and self.publish_at and self.publish_at <= timezone.now():
             self.status = 'published'
+            self.published_at = self.publish_at
+        if self.status == 'published' and not self.published_at:
             self.published_at = timezone.now()
 
-        # Update searchable text safely
-        try:
-            tag_names = ', '.join(self.tags.names()) if self.pk else ''
-        except:
-            tag_names = ''
-        parts = [
-            self.title or '',
-            str(self.content) or '',
-            str(self.category.name if self.category else ''),
-            tag_names,
-            str(self.author.username if self.author else '')
-        ]
-        self.search_text = ' '.join(parts)
+        # search_text is maintained by blog/search.py (post_save + tag m2m_changed)
         super().save(*args, **kwargs)
+        # post_save receivers compare against the pre-save state; reset it now
+        self._facet_state = self.facet_state()
+
+
+# ====================================
+# SEARCH INDEX (term -> blog postings)
+# ====================================
+class SearchTerm(models.Model):
+    term = models.CharField(max_length=64)
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='search_terms')
+    frequency = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        # (term, blog) doubles as the posting-list index for term lookups
+        unique_together = ('term', 'blog')
+
+    def __str__(self):
+        return f"{self.term} → blog {self.blog_id} ({self.frequency})"
+
+
+# ====================================
+# HOME FEED (fan-out-on-write timelines)
+# ====================================
+# One row per (follower, published blog), written by blog/feed.py.
+class FeedEntry(models.Model):
+    owner = models.ForeignKey(CustomUser, on_delete=models.CASCADE, related_name='feed_entries')
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='+')
+    # Copied from the blog so a timeline page is one index range scan
+    published_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('owner', 'blog')
+        indexes = [
+            models.Index(fields=['owner', '-published_at', '-blog'], name='feedentry_owner_timeline_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.owner_id} ← blog {self.blog_id}"
+
+
+# ====================================
+# FACET COUNTS (published blogs per category / tag)
+# ====================================
+# Maintained by blog/facets.py; `manage.py rebuild_facets` recomputes them.
+class CategoryFacet(models.Model):
+    category = models.OneToOneField(Category, on_delete=models.CASCADE, primary_key=True, related_name='facet')
+    blog_count = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.category_id}: {self.blog_count}"
+
+
+class TagFacet(models.Model):
+    tag = models.ForeignKey(Tag, on_delete=models.CASCADE, related_name='+')
+    # NULL = published blogs with this tag and no category
+    category = models.ForeignKey(Category, on_delete=models.CASCADE, null=True, blank=True, related_name='+')
+    blog_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('tag', 'category')
+        indexes = [
+            models.Index(fields=['category', 'tag'], name='tagfacet_category_tag_idx'),
+        ]
+
+    def __str__(self):
+        return f"{self.tag_id} / {self.category_id}: {self.blog_count}"
 
 
 # ====================================
@@ -192,6 +292,19 @@ class Reaction(models.Model):
         return f"{self.user.username} reacted {self.reaction_type} on {self.blog.title}"
 
 
+class ReactionCount(models.Model):
+    """Per-blog reaction totals, adjusted by blog/reactions.py on every write."""
+    blog = models.ForeignKey(Blog, on_delete=models.CASCADE, related_name='reaction_counts')
+    reaction_type = models.CharField(max_length=10, choices=Reaction.REACTION_CHOICES)
+    count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        unique_together = ('blog', 'reaction_type')
+
+    def __str__(self):
+        return f"blog {self.blog_id} {self.reaction_type}: {self.count}"
+
+
 # ====================================
 # BOOKMARKS
 # ====================================
@@ -201,7 +314,12 @@ class Bookmark(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
 
     class Meta:
+        # (user, blog) also answers "which of these blogs did I bookmark?"
         unique_together = ('user', 'blog')
+        indexes = [
+            # user_bookmarks: newest first, keyset cursor
+            models.Index(fields=['user', '-created_at', '-id'], name='bookmark_user_recent_idx'),
+        ]
 
     def __str__(self):
         return f"{self.user.username} bookmarked {self.blog.title}"
@@ -210,6 +328,23 @@ class Bookmark(models.Model):
 # ====================================
 # NOTIFICATIONS
 # ====================================
+class NotificationQuerySet(models.QuerySet):
+    def bulk_create(self, objs, *args, **kwargs):
+        """bulk_create skips save(), so hand out the missing seqs here, a block per user."""
+        objs = list(objs)
+        pending = {}
+        for obj in objs:
+            if not obj.seq:
+                pending.setdefault(obj.user_id, []).append(obj)
+        with transaction.atomic(using=self.db):
+            for user_id in sorted(pending):
+                last_seq = NotificationCounter.reserve(user_id, len(pending[user_id]))
+                first_seq = last_seq - len(pending[user_id]) + 1
+                for seq, obj in enumerate(pending[user_id], start=first_seq):
+                    obj.seq = seq
+            return super().bulk_create(objs, *args, **kwargs)
+
+
 class Notification(models.Model):
     NOTIFICATION_TYPE_CHOICES = [
         ('comment', 'Comment'),
@@ -257,10 +392,25 @@ class Notification(models.Model):
     #  Timestamp
     created_at = models.DateTimeField(auto_now_add=True)
 
+    #  Per-user, strictly increasing (assigned on insert) → resume with ?since=<seq>
+    seq = models.PositiveBigIntegerField(default=0, editable=False)
+
+    objects = NotificationQuerySet.as_manager()
+
     class Meta:
         ordering = ['-created_at']
         verbose_name = 'Notification'
         verbose_name_plural = 'Notifications'
+        unique_together = ('user', 'seq')
+
+    def save(self, *args, **kwargs):
+        if self._state.adding and not self.seq:
+            # The counter row stays locked until the insert commits
+            with transaction.atomic():
+                self.seq = NotificationCounter.next_seq(self.user_id)
+                super().save(*args, **kwargs)
+            return
+        super().save(*args, **kwargs)
 
     def __str__(self):
         sender_name = self.sender.username if self.sender else "System"
@@ -275,4 +425,35 @@ class Notification(models.Model):
     def mark_as_unread(self):
         """Mark this notification as unread"""
         self.is_read = False
-        self.save()
\ No newline at end of file
+        self.save()
+
+
+class NotificationCounter(models.Model):
+    """Last Notification.seq handed out per user (see blog/notifications.py)."""
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL, on_delete=models.CASCADE,
+        primary_key=True, related_name='notification_counter'
+    )
+    last_seq = models.PositiveBigIntegerField(default=0)
+
+    @classmethod
+    def next_seq(cls, user_id):
+        """Increment and return the user's sequence. Call inside a transaction."""
+        return cls.reserve(user_id, 1)
+
+    @classmethod
+    def reserve(cls, user_id, count):
+        """Advance the user's sequence by `count` and return the new last seq. Call inside a transaction."""
+        counters = cls.objects.filter(user_id=user_id)
+        if not counters.update(last_seq=F('last_seq') + count):
+            try:
+                with transaction.atomic():
+                    cls.objects.create(user_id=user_id, last_seq=count)
+                return count
+            except IntegrityError:
+                # A concurrent first notification created the row
+                counters.update(last_seq=F('last_seq') + count)
+        return counters.values_list('last_seq', flat=True).get()
+
+    def __str__(self):
+        return f"user {self.user_id}: {self.last_seq}"
@@ -0,0 +1,185 @@
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import Notification
+
+
+# ==========================================================
+# 🔹 Notification delivery (resumable stream)
+# ==========================================================
+# Every Notification gets a per-user `seq` on insert (models.py:
+# NotificationCounter; bulk_create too, via NotificationQuerySet), so a client that remembers the last seq it saw can
+# reconnect with ws/notifications/?since=<seq> (or GET
+# user/notifications/?since=<seq>) and receive only what it missed: one
+# range read on the (user, seq) unique index instead of re-reading the inbox.
+#
+# push() is the one place that sends to NotificationConsumer. Reactions and
+# comments used to send to "user_<id>" with a "data" key, while the
+# consumer listens on "user_<id>_notifications" and reads "value", so those
+# pushes never arrived.
+#
+# mark_read() / delete() act on an id list and/or everything up to a seq,
+# always scoped to the owner, as single UPDATE / DELETE statements. The
+# unread count is cached per user and adjusted by the rows they touched
+# (and +1 per new notification, signals.py); changes made elsewhere
+# (blog cascades, the admin) heal when the entry expires after
+# NOTIFICATION_UNREAD_CACHE_SECONDS.
+
+MAX_BATCH_IDS = 100
+
+
+def group_name(user_id):
+    return f"user_{user_id}_notifications"
+
+
+def notification_payload(notification, **extra):
+    return {
+        "id": notification.id,
+        "seq": notification.seq,
+        "message": notification.message,
+        "type": notification.notification_type,
+        "blog_id": notification.blog_id,
+        "is_read": notification.is_read,
+        "created_at": notification.created_at.strftime("%Y-%m-%d %H:%M"),
+        **extra,
+    }
+
+
+def push(notification, **extra):
+    """Send `notification` to the user's sockets once the current transaction commits."""
+    payload = notification_payload(notification, **extra)
+
+    def send():
+        try:
+            channel_layer = get_channel_layer()
+            if channel_layer:
+                async_to_sync(channel_layer.group_send)(
+                    group_name(notification.user_id),
+                    {"type": "send_notification", "value": payload},
+                )
+        except Exception as e:
+            print(f"⚠️ Notification push failed: {e}")
+
+    transaction.on_commit(send)
+
+
+def create(user_id, message, notification_type, sender=None, blog=None, **extra):
+    """Store a notification and push it (extra keys, e.g. title, go in the push only)."""
+    notification = Notification.objects.create(
+        user_id=user_id,
+        sender=sender,
+        blog=blog,
+        notification_type=notification_type,
+        message=message,
+    )
+    push(notification, **extra)
+    return notification
+
+
+def recent(user_id, limit=10):
+    return [
+        notification_payload(n)
+        for n in Notification.objects.filter(user_id=user_id).order_by("-seq")[:limit]
+    ]
+
+
+def missed(user_id, since):
+    """
+    Notifications after `since`, oldest first, at most NOTIFICATION_RESUME_LIMIT.
+    Returns (payloads, truncated): truncated means there were more, and the
+    client should reload the inbox instead.
+    """
+    limit = settings.NOTIFICATION_RESUME_LIMIT
+    rows = list(Notification.objects.filter(user_id=user_id, seq__gt=since).order_by("seq")[:limit + 1])
+    return [notification_payload(n) for n in rows[:limit]], len(rows) > limit
+
+
+def parse_selection(data):
+    """
+    (ids, up_to_seq) from {"ids": [...]} and/or {"up_to_seq": n}.
+    Raises ValueError if neither is given or a value is malformed.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Expected an object with 'ids' and/or 'up_to_seq'")
+    ids = data.get("ids")
+    up_to_seq = data.get("up_to_seq")
+    if ids is None and up_to_seq is None:
+        raise ValueError("Pass 'ids' and/or 'up_to_seq'")
+    if ids is not None:
+        if not isinstance(ids, list) or len(ids) > MAX_BATCH_IDS:
+            raise ValueError(f"'ids' must be a list of at most {MAX_BATCH_IDS} ids")
+        try:
+            ids = list({int(pk) for pk in ids})
+        except (TypeError, ValueError):
+            raise ValueError("'ids' must be integers")
+    if up_to_seq is not None:
+        up_to_seq = parse_since(up_to_seq)
+        if up_to_seq is None:
+            raise ValueError("'up_to_seq' must be a non-negative integer")
+    return ids, up_to_seq
+
+
+def _selected(user_id, ids=None, up_to_seq=None):
+    notification_list = Notification.objects.filter(user_id=user_id)
+    if ids is not None:
+        notification_list = notification_list.filter(id__in=ids)
+    if up_to_seq is not None:
+        notification_list = notification_list.filter(seq__lte=up_to_seq)
+    return notification_list
+
+
+def mark_read(user_id, ids=None, up_to_seq=None):
+    """Mark the user's selected notifications (all if no selector) read. Returns rows changed."""
+    changed = _selected(user_id, ids, up_to_seq).filter(is_read=False).update(is_read=True)
+    adjust_unread(user_id, -changed)
+    return changed
+
+
+def delete(user_id, ids=None, up_to_seq=None):
+    """Delete the user's selected notifications. Returns rows deleted."""
+    selected = _selected(user_id, ids, up_to_seq)
+    with transaction.atomic():
+        # Unread rows first, so we know how much the unread count drops
+        unread = selected.filter(is_read=False).delete()[0]
+        read = selected.delete()[0]
+    adjust_unread(user_id, -unread)
+    return unread + read
+
+
+def _unread_key(user_id):
+    return f"notifications:unread:{user_id}"
+
+
+def unread_count(user_id):
+    key = _unread_key(user_id)
+    count = cache.get(key)
+    if count is None:
+        count = Notification.objects.filter(user_id=user_id, is_read=False).count()
+        cache.add(key, count, settings.NOTIFICATION_UNREAD_CACHE_SECONDS)
+    return max(0, count)
+
+
+def adjust_unread(user_id, delta):
+    """Apply `delta` to a cached unread count after commit (nothing to do if not cached)."""
+    if not delta:
+        return
+
+    def apply():
+        try:
+            cache.incr(_unread_key(user_id), delta)
+        except ValueError:
+            pass
+
+    transaction.on_commit(apply)
+
+
+def parse_since(value):
+    """A ?since= value as a non-negative int, or None if absent / malformed."""
+    try:
+        since = int(value)
+    except (TypeError, ValueError):
+        return None
+    return since if since >= 0 else None
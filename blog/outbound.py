@@ -0,0 +1,155 @@
+import asyncio
+import json
+import weakref
+from collections import Counter, deque
+
+from django.conf import settings
+
+from .benchmarking import percentile
+
+try:
+    import orjson
+except ImportError:  # optional: falls back to the stdlib encoder
+    orjson = None
+
+
+# ==========================================================
+# 🔹 Outbound WebSocket queues (backpressure)
+# ==========================================================
+# Consumers used to json.dumps + await send() inside each group message
+# handler. A slow client stalls that handler, the consumer stops reading its
+# channel, and the channel layer's per-channel buffer overflows and drops
+# messages without telling anyone.
+#
+# With OutboundQueueMixin, send_json() only enqueues; a per-connection
+# writer task encodes and sends. Each queue:
+#   - holds at most WS_OUTBOUND_QUEUE_SIZE messages
+#   - coalesces reaction / presence updates per blog: a queued update is
+#     replaced by the newer one (latest reaction_summary or viewer count
+#     wins, reaction deltas are summed)
+#   - closes the socket with OVERFLOW_CLOSE_CODE when it would overflow,
+#     so the client knows to reconnect and resync (initial_data)
+# metrics() reports queue depths for this process (admin/ws-metrics/).
+
+OVERFLOW_CLOSE_CODE = 4008
+COALESCED_TYPES = frozenset({"reaction_update", "presence_update"})
+
+METRICS = Counter()
+_queues = weakref.WeakSet()
+
+
+def dumps(data):
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_NON_STR_KEYS).decode()
+    return json.dumps(data)
+
+
+def coalesce_key(data):
+    """Messages with the same key replace each other while queued (None = never)."""
+    if data.get("type") not in COALESCED_TYPES:
+        return None
+    blog_id = data.get("blog_id")
+    if blog_id is None and isinstance(data.get("data"), dict):
+        blog_id = data["data"].get("blog_id")
+    return None if blog_id is None else (data["type"], blog_id)
+
+
+def _merge(old, new):
+    merged = dict(new)
+    if isinstance(old.get("delta"), dict) and isinstance(new.get("delta"), dict):
+        delta = Counter(old["delta"])
+        delta.update(new["delta"])
+        merged["delta"] = {key: value for key, value in delta.items() if value}
+    if isinstance(old.get("data"), dict) and isinstance(new.get("data"), dict):
+        merged["data"] = _merge(old["data"], new["data"])
+    return merged
+
+
+class OutboundQueue:
+    def __init__(self, consumer, capacity):
+        self.consumer = consumer
+        self.capacity = capacity
+        self.items = deque()     # [key, payload]
+        self.pending = {}        # coalesce key -> queued item
+        self.task = None
+        self.closed = False
+        _queues.add(self)
+
+    def push(self, data):
+        if self.closed:
+            return
+        key = coalesce_key(data)
+        item = self.pending.get(key) if key is not None else None
+        if item is not None:
+            item[1] = _merge(item[1], data)
+            METRICS["coalesced"] += 1
+            return
+        if len(self.items) >= self.capacity:
+            return self.overflow()
+
+        item = [key, data]
+        self.items.append(item)
+        if key is not None:
+            self.pending[key] = item
+        METRICS["peak_depth"] = max(METRICS["peak_depth"], len(self.items))
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self.drain())
+
+    async def drain(self):
+        try:
+            while self.items and not self.closed:
+                key, payload = item = self.items.popleft()
+                if key is not None and self.pending.get(key) is item:
+                    del self.pending[key]
+                await self.consumer.send(text_data=dumps(payload))
+                METRICS["sent"] += 1
+        except Exception as e:
+            METRICS["send_errors"] += 1
+            print(f"⚠️ WebSocket send failed ({self.consumer.channel_name}): {e}")
+            self.stop()
+
+    def overflow(self):
+        METRICS["overflow_closes"] += 1
+        print(f"⚠️ Slow WebSocket client, closing ({self.consumer.channel_name}): {len(self.items)} messages queued")
+        self.stop()
+        asyncio.ensure_future(self.consumer.close(code=OVERFLOW_CLOSE_CODE))
+
+    def stop(self):
+        self.closed = True
+        self.items.clear()
+        self.pending.clear()
+        if self.task is not None and self.task is not asyncio.current_task():
+            self.task.cancel()
+
+
+class OutboundQueueMixin:
+    """send_json() through a bounded, coalescing per-connection queue."""
+
+    async def send_json(self, data):
+        outbound = getattr(self, "outbound", None)
+        if outbound is None:
+            outbound = self.outbound = OutboundQueue(self, settings.WS_OUTBOUND_QUEUE_SIZE)
+        outbound.push(data)
+
+    async def websocket_disconnect(self, message):
+        outbound = getattr(self, "outbound", None)
+        if outbound is not None:
+            outbound.stop()
+        await super().websocket_disconnect(message)
+
+
+def metrics():
+    depths = sorted(len(queue.items) for queue in list(_queues) if not queue.closed)
+    return {
+        "connections": len(depths),
+        "queued_messages": sum(depths),
+        "p95_depth": percentile(depths, 95) or 0,
+        "max_depth": depths[-1] if depths else 0,
+        "capacity": settings.WS_OUTBOUND_QUEUE_SIZE,
+        "encoder": "orjson" if orjson is not None else "json",
+        "peak_depth": METRICS["peak_depth"],
+        "sent": METRICS["sent"],
+        "coalesced": METRICS["coalesced"],
+        "overflow_closes": METRICS["overflow_closes"],
+        "send_errors": METRICS["send_errors"],
+    }
@@ -0,0 +1,117 @@
+import random
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import cache
+
+
+# ==========================================================
+# 🔹 Live "N people reading" per blog (no database writes)
+# ==========================================================
+# The frontend used to poll blog_detail_view for the view count, which
+# incremented Blog.views (a row write) on every poll. Presence now lives in
+# the cache, one counter per blog per time bucket of PRESENCE_WINDOW_SECONDS:
+#   - every BlogConsumer connection counts itself into the current bucket on
+#     connect and again at the start of each new bucket (its heartbeat)
+#   - on disconnect it takes itself back out of the bucket it last marked
+#   - viewers = max(current bucket, previous bucket), so a bucket that is
+#     still filling up never under-reports
+# Buckets expire after two windows, so connections of a worker that died
+# without disconnecting drop out on their own. Departures show up within
+# one window at most. Broadcasts of the count (presence_update) are sent
+# only when it changed, at most once per PRESENCE_BROADCAST_SECONDS per blog;
+# a change refused by that throttle is sent by one trailing flush once the
+# window ends (FLUSH_LATER), so the count never stays stale until the next
+# join / leave / heartbeat. Consumers use the a*() versions at the bottom,
+# which run the cache round trips off the event loop.
+
+SEND = "send"
+FLUSH_LATER = "flush_later"
+
+def _window():
+    return settings.PRESENCE_WINDOW_SECONDS
+
+
+def _bucket(now=None):
+    return int((now if now is not None else time.time()) // _window())
+
+
+def _key(blog_id, bucket):
+    return f"presence:{blog_id}:{bucket}"
+
+
+def mark(blog_id):
+    """Count one connection in the current bucket. Returns the bucket."""
+    bucket = _bucket()
+    key = _key(blog_id, bucket)
+    try:
+        if not cache.add(key, 1, _window() * 2 + 5):
+            cache.incr(key)
+    except Exception as e:
+        print(f"⚠️ Presence mark failed (blog {blog_id}): {e}")
+    return bucket
+
+
+def unmark(blog_id, bucket):
+    """Remove one connection from the bucket it last marked (if still live)."""
+    if bucket is None or bucket < _bucket() - 1:
+        return
+    try:
+        if cache.decr(_key(blog_id, bucket)) < 0:
+            cache.set(_key(blog_id, bucket), 0, _window() * 2 + 5)
+    except ValueError:
+        pass  # expired
+    except Exception as e:
+        print(f"⚠️ Presence unmark failed (blog {blog_id}): {e}")
+
+
+def viewers(blog_id):
+    bucket = _bucket()
+    try:
+        counts = cache.get_many([_key(blog_id, bucket), _key(blog_id, bucket - 1)])
+    except Exception:
+        return 0
+    return max([0, *counts.values()])
+
+
+def seconds_to_next_bucket():
+    """Sleep before the next heartbeat: start of the next bucket plus a little jitter."""
+    window = _window()
+    return window - (time.time() % window) + random.uniform(0, min(5, window / 4))
+
+
+def should_broadcast(blog_id, count):
+    """
+    SEND for one caller per PRESENCE_BROADCAST_SECONDS, and only when `count`
+    changed. When the throttle refuses a changed count, FLUSH_LATER for one
+    caller, which calls again after flush_delay(). None otherwise.
+    """
+    last_key = f"presence:{blog_id}:broadcast"
+    try:
+        if cache.get(last_key) == count:
+            return None
+        if not cache.add(f"presence:{blog_id}:throttle", 1, settings.PRESENCE_BROADCAST_SECONDS):
+            if cache.add(f"presence:{blog_id}:trailing", 1, settings.PRESENCE_BROADCAST_SECONDS):
+                return FLUSH_LATER
+            return None
+        cache.set(last_key, count, _window() * 2)
+        return SEND
+    except Exception:
+        return None
+
+
+def flush_delay():
+    """Seconds until the throttle window that refused a broadcast has ended."""
+    return settings.PRESENCE_BROADCAST_SECONDS + 0.1
+
+
+def presence_event(blog_id, count):
+    return {"type": "presence_update", "blog_id": blog_id, "viewers": count}
+
+
+# Cache round trips (Redis in production) must not block the event loop
+amark = sync_to_async(mark, thread_sensitive=False)
+aunmark = sync_to_async(unmark, thread_sensitive=False)
+aviewers = sync_to_async(viewers, thread_sensitive=False)
+ashould_broadcast = sync_to_async(should_broadcast, thread_sensitive=False)
@@ -0,0 +1,192 @@
+import functools
+import random
+import threading
+import time
+from collections import deque
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db import connections
+
+from .benchmarking import percentile
+
+
+# ==========================================================
+# 🔹 Per-view query count / latency profiling
+# ==========================================================
+# ProfilingMiddleware profiles a request when:
+#   - PROFILING_SAMPLE_RATE picks it (e.g. 0.01 = 1 in 100; cheap enough to
+#     leave on: unsampled requests cost one random() call), or
+#   - it sends "X-Profile: 1" and PROFILING_ALLOW_HEADER is on (DEBUG)
+# A profiled request runs with an execute_wrapper on every connection that
+# counts queries and SQL time; TimedSerializerMixin adds the time spent in
+# top-level serializer.to_representation() calls, and @timed_serializer the
+# time in plain functions that build serializer output (fast_serializers);
+# SQL run while serializing is in both numbers. The response gets a Server-Timing header
+# (shown in the browser devtools), and the numbers are kept per view, the
+# last PROFILING_SAMPLES_PER_VIEW requests, for report() (admin/profiling/).
+
+_current = ContextVar("profile", default=None)
+_lock = threading.Lock()
+_samples = {}  # view name -> deque of sample dicts
+
+
+class Profile:
+    """execute_wrapper that times the queries of one request."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.queries += 1
+            self.sql_seconds += time.perf_counter() - started
+
+
+def current():
+    """The Profile of the request being served, or None if it is not profiled."""
+    return _current.get()
+
+
+class TimedSerializerMixin:
+    """Count to_representation() time towards the request's serializer timing."""
+
+    def to_representation(self, instance):
+        profile = _current.get()
+        if profile is None or profile.serializer_depth:
+            return super().to_representation(instance)
+
+        profile.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return super().to_representation(instance)
+        finally:
+            profile.serializer_seconds += time.perf_counter() - started
+            profile.serializer_depth -= 1
+
+
+def timed_serializer(func):
+    """TimedSerializerMixin for a function that returns serialized data."""
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+        profile = _current.get()
+        if profile is None or profile.serializer_depth:
+            return func(*args, **kwargs)
+
+        profile.serializer_depth += 1
+        started = time.perf_counter()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profile.serializer_seconds += time.perf_counter() - started
+            profile.serializer_depth -= 1
+
+    return wrapper
+
+
+def should_profile(request):
+    if settings.PROFILING_ALLOW_HEADER and request.headers.get("X-Profile") == "1":
+        return True
+    rate = settings.PROFILING_SAMPLE_RATE
+    return rate > 0 and random.random() < rate
+
+
+def view_name(request):
+    match = getattr(request, "resolver_match", None)
+    if match is None:
+        return "<unresolved>"
+    # @api_view names its generated class after the function (blog_list_view)
+    view_class = getattr(match.func, "view_class", None)
+    return view_class.__name__ if view_class is not None else match.func.__name__
+
+
+class ProfilingMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not should_profile(request):
+            return self.get_response(request)
+
+        profile = Profile()
+        token = _current.set(profile)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all(initialized_only=False):
+                    stack.enter_context(connection.execute_wrapper(profile))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        total_ms = (time.perf_counter() - started) * 1000
+
+        sample = {
+            "total_ms": total_ms,
+            "queries": profile.queries,
+            "sql_ms": profile.sql_seconds * 1000,
+            "serializer_ms": profile.serializer_seconds * 1000,
+            "bytes": None if response.streaming else len(response.content),
+            "status": response.status_code,
+        }
+        record(view_name(request), sample)
+        response["Server-Timing"] = (
+            f'sql;dur={sample["sql_ms"]:.1f};desc="{profile.queries} queries", '
+            f'serializer;dur={sample["serializer_ms"]:.1f}, '
+            f'total;dur={total_ms:.1f}'
+        )
+        return response
+
+
+def record(view, sample):
+    with _lock:
+        samples = _samples.get(view)
+        if samples is None:
+            samples = _samples[view] = deque(maxlen=settings.PROFILING_SAMPLES_PER_VIEW)
+        samples.append(sample)
+
+
+def _stats(values):
+    values = sorted(v for v in values if v is not None)
+    if not values:
+        return None
+    return {
+        "p50": round(percentile(values, 50), 2),
+        "p95": round(percentile(values, 95), 2),
+        "p99": round(percentile(values, 99), 2),
+        "max": round(values[-1], 2),
+    }
+
+
+def report():
+    """Percentiles per view, slowest p95 first."""
+    with _lock:
+        snapshot = {view: list(samples) for view, samples in _samples.items()}
+
+    views = []
+    for view, samples in snapshot.items():
+        views.append({
+            "view": view,
+            "samples": len(samples),
+            "errors": sum(1 for s in samples if s["status"] >= 500),
+            **{key: _stats(s[key] for s in samples)
+               for key in ("total_ms", "queries", "sql_ms", "serializer_ms", "bytes")},
+        })
+    views.sort(key=lambda v: v["total_ms"]["p95"], reverse=True)
+    return {
+        "sample_rate": settings.PROFILING_SAMPLE_RATE,
+        "samples_per_view": settings.PROFILING_SAMPLES_PER_VIEW,
+        "views": views,
+    }
+
+
+def reset():
+    with _lock:
+        _samples.clear()
@@ -0,0 +1,165 @@
+import math
+import time
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import checks
+from django.core.cache import cache
+from rest_framework.throttling import SimpleRateThrottle
+
+
+# ==========================================================
+# 🔹 Token-bucket rate limiting (shared through the cache)
+# ==========================================================
+# One bucket per (scope, user or IP), stored as a single integer in the
+# cache: the millisecond timestamp at which the bucket would be full again
+# (GCRA, the "virtual scheduling" form of a token bucket). Taking a token
+# is an atomic cache.incr() of one refill interval; the request is allowed
+# while that timestamp stays within `burst` intervals of now, otherwise the
+# increment is handed back. The key expires exactly when the bucket is full,
+# so idle clients cost nothing. Limits are only shared between workers with
+# CACHE_BACKEND=redis; on locmem each process has its own buckets, so the
+# effective limit is multiplied by the worker count (blog.W001 warns about
+# that when DEBUG is off).
+#
+# Used by:
+#   - the DRF throttles below (rates in REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"],
+#     "10/min" = bursts of 10, refilled over a minute)
+#   - RateLimitedConsumerMixin for WebSocket messages
+#     (WS_MESSAGES_PER_SECOND / WS_MESSAGE_BURST)
+# If the cache is unreachable the limiter fails open rather than taking the
+# site down with it.
+
+KEY_PREFIX = "ratelimit"
+
+
+def take(key, rate, burst):
+    """
+    Take one token from the bucket `key` (`rate` tokens/second, `burst` deep).
+    Returns (allowed, retry_after_seconds).
+    """
+    interval = max(1, int(1000 / rate))
+    limit = burst * interval
+    now = int(time.time() * 1000)
+    key = f"{KEY_PREFIX}:{key}"
+
+    try:
+        try:
+            tat = cache.incr(key, interval)
+        except ValueError:
+            # No bucket yet (or it expired): full, take the first token
+            if cache.add(key, now + interval, _ttl(interval)):
+                return True, 0
+            tat = cache.incr(key, interval)
+
+        if tat <= now + interval:
+            # Idle bucket: the stored time lags behind the clock, catch it up.
+            # (Racing requests here can each get a token; the bucket is full
+            # anyway, so at most a burst is granted.)
+            if tat < now + interval:
+                cache.set(key, now + interval, _ttl(interval))
+            return True, 0
+
+        excess = tat - now - limit
+        if excess > 0:
+            tat = cache.decr(key, interval)
+            cache.touch(key, _ttl(tat - now))
+            return False, excess / 1000
+        cache.touch(key, _ttl(tat - now))
+        return True, 0
+    except Exception as e:
+        print(f"⚠️ Rate limiter unavailable ({key}): {e}")
+        return True, 0
+
+
+def _ttl(ms):
+    return max(1, math.ceil(ms / 1000))
+
+
+@checks.register(checks.Tags.caches)
+def check_shared_cache(app_configs, **kwargs):
+    backend = settings.CACHES["default"]["BACKEND"]
+    if settings.DEBUG or not backend.endswith(("LocMemCache", "DummyCache")):
+        return []
+    return [checks.Warning(
+        "Rate limits are kept in a per-process cache",
+        hint="Each worker has its own token buckets, so the limits grow with the worker count. "
+             "Set CACHE_BACKEND=redis.",
+        id="blog.W001",
+    )]
+
+
+# ----------------------------------------------------------
+# DRF throttles
+# ----------------------------------------------------------
+class TokenBucketThrottle(SimpleRateThrottle):
+    """
+    SimpleRateThrottle keeps a list of request timestamps per client and
+    rewrites it on every request (a read-modify-write that races across
+    workers). This keeps DRF's rate format but takes a token from a shared
+    bucket instead. Subclasses set `scope`.
+    """
+    per_user = True
+
+    def get_cache_key(self, request, view):
+        if self.per_user and request.user and request.user.is_authenticated:
+            ident = f"user:{request.user.pk}"
+        else:
+            ident = f"ip:{self.get_ident(request)}"
+        return f"{self.scope}:{ident}"
+
+    def allow_request(self, request, view):
+        if self.rate is None:
+            return True
+        key = self.get_cache_key(request, view)
+        if key is None:
+            return True
+        allowed, self.retry_after = take(key, self.num_requests / self.duration, self.num_requests)
+        return allowed
+
+    def wait(self):
+        return getattr(self, "retry_after", None) or None
+
+
+class CommentThrottle(TokenBucketThrottle):
+    scope = "comment"
+
+
+class ReactionThrottle(TokenBucketThrottle):
+    scope = "reaction"
+
+
+class RegisterThrottle(TokenBucketThrottle):
+    scope = "register"
+    per_user = False
+
+
+class ContactThrottle(TokenBucketThrottle):
+    scope = "contact"
+    per_user = False
+
+
+# ----------------------------------------------------------
+# WebSocket consumers
+# ----------------------------------------------------------
+class RateLimitedConsumerMixin:
+    """
+    await take_token() for AsyncWebsocketConsumer subclasses. The bucket is per
+    user (shared by all of their sockets, on every worker) or per client IP
+    for anonymous sockets.
+    """
+    rate_limit_scope = "ws"
+
+    def rate_limit_key(self):
+        user = self.scope.get("user")
+        if user is not None and user.is_authenticated:
+            return f"{self.rate_limit_scope}:user:{user.pk}"
+        client = self.scope.get("client") or ("unknown",)
+        return f"{self.rate_limit_scope}:ip:{client[0]}"
+
+    async def take_token(self):
+        # Up to four cache round trips (Redis in production): off the event loop
+        allowed, _ = await sync_to_async(take, thread_sensitive=False)(
+            self.rate_limit_key(), settings.WS_MESSAGES_PER_SECOND, settings.WS_MESSAGE_BURST
+        )
+        return allowed
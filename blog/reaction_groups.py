@@ -0,0 +1,69 @@
+import asyncio
+import zlib
+from urllib.parse import parse_qs
+
+from asgiref.sync import async_to_sync
+from channels.layers import get_channel_layer
+from django.conf import settings
+
+
+# ==========================================================
+# 🔹 Global reaction stream (ReactionConsumer)
+# ==========================================================
+# Every /ws/reactions/ socket used to join one "reactions_group", so each
+# message was a single group_send to every socket in the cluster: one Redis
+# group key holding all members, and one message fanned out to all of them.
+#
+# Sockets are now hashed (by channel name) into REACTIONS_GROUP_SHARDS
+# groups "reactions_group_<n>"; a publish is one group_send per shard, sent
+# concurrently. Each group_send only touches its shard's members, so group
+# size and per-send work stay bounded as connections grow. Clients that
+# pass ?categories=1,2 join "reactions_category_<id>" instead and only get
+# reactions on blogs in those categories.
+#
+# channels_redis has no batch group_send across groups, so "pipelined" here
+# means asyncio.gather over the shards rather than a single Redis pipeline.
+
+MESSAGE_TYPE = "send_reaction_update"
+
+
+def shard_count():
+    return max(1, settings.REACTIONS_GROUP_SHARDS)
+
+
+def shard_group(channel_name):
+    return f"reactions_group_{zlib.crc32(channel_name.encode()) % shard_count()}"
+
+
+def shard_groups():
+    return [f"reactions_group_{n}" for n in range(shard_count())]
+
+
+def category_group(category_id):
+    return f"reactions_category_{category_id}"
+
+
+def parse_categories(query_string):
+    """Category ids from a ?categories=1,2 query string (bytes, as in scope)."""
+    values = parse_qs(query_string.decode(errors="ignore")).get("categories", [])
+    ids = {int(part) for value in values for part in value.split(",") if part.strip().isdigit()}
+    return sorted(ids)[:settings.REACTIONS_MAX_CATEGORIES]
+
+
+async def publish(value, category_id=None, channel_layer=None):
+    """Send `value` to every shard (and to the blog's category topic, if any)."""
+    channel_layer = channel_layer or get_channel_layer()
+    if channel_layer is None:
+        return
+    message = {"type": MESSAGE_TYPE, "value": value}
+    groups = shard_groups()
+    if category_id is not None:
+        groups.append(category_group(category_id))
+    await asyncio.gather(*(channel_layer.group_send(group, message) for group in groups))
+
+
+def publish_sync(value, category_id=None):
+    try:
+        async_to_sync(publish)(value, category_id)
+    except Exception as e:
+        print(f"❌ Error publishing to reaction stream: {e}")
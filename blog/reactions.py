@@ -0,0 +1,245 @@
+from collections import Counter, defaultdict, namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.db import IntegrityError, transaction
+from django.db.models import Count, F
+
+from . import notifications, reaction_groups
+from .models import CustomUser, Reaction, ReactionCount
+
+
+# ==========================================================
+# 🔹 Reaction write path
+# ==========================================================
+# toggle_reaction_view used to get_or_create → delete/save → run four COUNT
+# queries, and a post_save signal counted them all again. Concurrent
+# double-taps raced on unique_together and came back as a 500.
+#
+# Every reaction write now goes through apply() / toggle() / apply_many():
+#   1. lock the reacting user's row, so one user's writes are serialized
+#      (different users never wait on each other)
+#   2. one conditional INSERT / UPDATE / DELETE for the (user, blog) row
+#   3. +/- deltas on ReactionCount for the rows actually changed
+#   4. the summary is read back from ReactionCount (one indexed query)
+# Notifying viewers and the author is a separate step, notify(), to run after
+# the transaction commits.
+#
+# Writes that bypass this module (cascades from a user / blog delete, direct
+# Reaction.objects.create() / .delete()) are counted by the post_save /
+# post_delete guards in signals.py, which skip the writes made here.
+
+SUMMARY_TYPES = ("like", "love", "laugh", "angry")
+REACTION_TYPES = frozenset(choice for choice, _ in Reaction.REACTION_CHOICES)
+
+ReactionChange = namedtuple("ReactionChange", "blog_id user_id previous current summary")
+
+_writing = ContextVar("reactions_writing", default=False)
+
+
+@contextmanager
+def _counting():
+    """Mark writes as counted here, so the signal guards leave them alone."""
+    token = _writing.set(True)
+    try:
+        yield
+    finally:
+        _writing.reset(token)
+
+
+def counted_here():
+    """True while this module is writing Reaction rows (see the guards in signals.py)."""
+    return _writing.get()
+
+
+def reaction_summaries(blog_ids):
+    summaries = {blog_id: dict.fromkeys(SUMMARY_TYPES, 0) for blog_id in blog_ids}
+    for blog_id, reaction_type, count in (
+        ReactionCount.objects.filter(blog_id__in=blog_ids, reaction_type__in=SUMMARY_TYPES)
+        .values_list("blog_id", "reaction_type", "count")
+    ):
+        summaries[blog_id][reaction_type] = count
+    return summaries
+
+
+def reaction_summary(blog_id):
+    return reaction_summaries([blog_id])[blog_id]
+
+
+def _adjust_counts(blog_id, deltas):
+    for reaction_type, delta in deltas.items():
+        if not delta:
+            continue
+        counts = ReactionCount.objects.filter(blog_id=blog_id, reaction_type=reaction_type)
+        if delta < 0:
+            counts.filter(count__gte=-delta).update(count=F("count") + delta)
+            continue
+        if counts.update(count=F("count") + delta):
+            continue
+        try:
+            with transaction.atomic():
+                ReactionCount.objects.create(blog_id=blog_id, reaction_type=reaction_type, count=delta)
+        except IntegrityError:
+            # A concurrent first reaction of this type on this blog won the insert
+            counts.update(count=F("count") + delta)
+
+
+def _lock_user(user_id):
+    list(CustomUser.objects.select_for_update().filter(pk=user_id).values_list("pk", flat=True))
+
+
+def _write(user_id, blog_id, decide):
+    with _counting(), transaction.atomic():
+        _lock_user(user_id)
+
+        rows = Reaction.objects.filter(user_id=user_id, blog_id=blog_id)
+        previous = rows.values_list("reaction_type", flat=True).first()
+        current = decide(previous)
+
+        deltas = Counter()
+        if current == previous:
+            pass
+        elif current is None:
+            if rows.filter(reaction_type=previous).delete()[0]:
+                deltas[previous] -= 1
+        elif previous is None:
+            Reaction.objects.create(user_id=user_id, blog_id=blog_id, reaction_type=current)
+            deltas[current] += 1
+        elif rows.filter(reaction_type=previous).update(reaction_type=current):
+            deltas[previous] -= 1
+            deltas[current] += 1
+
+        _adjust_counts(blog_id, deltas)
+        return ReactionChange(blog_id, user_id, previous, current, reaction_summary(blog_id))
+
+
+def toggle(user_id, blog_id, reaction_type):
+    """Same reaction again removes it; a different one replaces it."""
+    return _write(user_id, blog_id, lambda previous: None if previous == reaction_type else reaction_type)
+
+
+def apply(user_id, blog_id, reaction_type):
+    """Set the user's reaction to `reaction_type` (None removes it). Idempotent."""
+    return _write(user_id, blog_id, lambda previous: reaction_type)
+
+
+def apply_many(user_id, targets):
+    """
+    Batch form of apply(): `targets` maps blog id → reaction type (or None).
+    One lock, one read, then bulk delete / update / create and the counter
+    deltas. Returns {blog id: ReactionChange} for the blogs that changed.
+    """
+    with _counting(), transaction.atomic():
+        _lock_user(user_id)
+        existing = {
+            blog_id: (pk, reaction_type)
+            for pk, blog_id, reaction_type in Reaction.objects.filter(user_id=user_id, blog_id__in=targets)
+            .values_list("id", "blog_id", "reaction_type")
+        }
+
+        previous = {}
+        deltas = defaultdict(Counter)
+        removed, changed, created = [], [], []
+        for blog_id, target in targets.items():
+            pk, current = existing.get(blog_id, (None, None))
+            if target == current:
+                continue
+            previous[blog_id] = current
+            if current:
+                deltas[blog_id][current] -= 1
+            if target:
+                deltas[blog_id][target] += 1
+
+            if target is None:
+                removed.append(pk)
+            elif current is None:
+                created.append(Reaction(user_id=user_id, blog_id=blog_id, reaction_type=target))
+            else:
+                changed.append(Reaction(id=pk, reaction_type=target))
+
+        if removed:
+            Reaction.objects.filter(id__in=removed).delete()
+        if changed:
+            Reaction.objects.bulk_update(changed, ["reaction_type"])
+        if created:
+            Reaction.objects.bulk_create(created)
+        # Blog id order: concurrent batches over the same blogs lock count rows alike
+        for blog_id in sorted(deltas):
+            _adjust_counts(blog_id, deltas[blog_id])
+
+        summaries = reaction_summaries(list(previous))
+        return {
+            blog_id: ReactionChange(blog_id, user_id, previous[blog_id], targets[blog_id], summaries[blog_id])
+            for blog_id in previous
+        }
+
+
+def counted_create(reaction):
+    """A Reaction row created outside this module: count it."""
+    _adjust_counts(reaction.blog_id, {reaction.reaction_type: 1})
+
+
+def counted_delete(reaction):
+    """A Reaction row deleted outside this module (e.g. a cascade): uncount it."""
+    _adjust_counts(reaction.blog_id, {reaction.reaction_type: -1})
+
+
+def rebuild_counts():
+    """Recount ReactionCount from Reaction rows. Returns the number of rows written."""
+    rows = [
+        ReactionCount(blog_id=blog_id, reaction_type=reaction_type, count=count)
+        for blog_id, reaction_type, count in Reaction.objects.order_by()
+        .values_list("blog_id", "reaction_type").annotate(count=Count("id"))
+    ]
+    with transaction.atomic():
+        ReactionCount.objects.all().delete()
+        ReactionCount.objects.bulk_create(rows, batch_size=1000)
+    return len(rows)
+
+
+# ----------------------------------------------------------
+# Notify (after commit)
+# ----------------------------------------------------------
+def reaction_event(change, user):
+    """Payload of the "reaction_update" broadcast for one change."""
+    delta = Counter()
+    if change.previous:
+        delta[change.previous] -= 1
+    if change.current:
+        delta[change.current] += 1
+    return {
+        "type": "reaction_update",
+        "blog_id": change.blog_id,
+        "reaction_summary": change.summary,
+        "delta": dict(delta),
+        "reacted_by": user.username,
+    }
+
+
+def notify_author(change, blog, user):
+    """Notification (row + push) to the blog author for a new or changed reaction."""
+    if change.current is None or change.previous == change.current or blog.author_id == user.id:
+        return
+    try:
+        notifications.create(
+            blog.author_id,
+            f"{user.username} reacted to your post '{blog.title}'.",
+            "reaction",
+            sender=user,
+            blog=blog,
+            title="❤️ New Reaction",
+        )
+    except Exception as e:
+        print(f"⚠️ Notification creation failed: {e}")
+
+
+def notify(change, blog, user):
+    """Broadcast the change to blog viewers and the global stream, and notify the author (sync callers)."""
+    from .signals import broadcast_to_blog
+
+    if change.previous == change.current:
+        return
+    event = reaction_event(change, user)
+    broadcast_to_blog(blog.id, "reaction_update", event)
+    reaction_groups.publish_sync(event, blog.category_id)
+    notify_author(change, blog, user)
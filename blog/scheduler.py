@@ -0,0 +1,61 @@
+from django.db import transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import Blog
+from .signals import blogs_published
+
+
+# ==========================================================
+# 🔹 Scheduled publishing
+# ==========================================================
+def due_blogs(now=None):
+    """Drafts whose publish_at has passed (served by blog_status_publish_at_idx)."""
+    now = now or timezone.now()
+    return Blog.objects.filter(status='draft', publish_at__isnull=False, publish_at__lte=now)
+
+
+def next_publish_at(now=None):
+    """publish_at of the next scheduled draft, or None if nothing is queued."""
+    now = now or timezone.now()
+    return (
+        Blog.objects.filter(status='draft', publish_at__gt=now)
+        .order_by('publish_at')
+        .values_list('publish_at', flat=True)
+        .first()
+    )
+
+
+def publish_due_blogs(now=None, batch_size=500):
+    """
+    Publish every due draft with one UPDATE per batch of `batch_size` rows.
+    `blogs_published` is sent once per batch after commit.
+    Returns the list of published blog ids.
+    """
+    now = now or timezone.now()
+    published = []
+
+    while True:
+        with transaction.atomic():
+            ids = list(
+                due_blogs(now).select_for_update()
+                .order_by('publish_at')
+                .values_list('id', flat=True)[:batch_size]
+            )
+            if not ids:
+                break
+
+            Blog.objects.filter(id__in=ids, status='draft').update(
+                status='published',
+                published_at=F('publish_at'),
+                updated_at=now,
+            )
+            transaction.on_commit(
+                lambda ids=ids: blogs_published.send(sender=Blog, blog_ids=ids)
+            )
+
+        published.extend(ids)
+        if len(ids) < batch_size:
+            break
+
+    return published
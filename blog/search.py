@@ -0,0 +1,270 @@
+import html
+import re
+import unicodedata
+from collections import Counter
+
+from django.db import transaction
+from django.db.models import Count
+from django.utils.html import strip_tags
+
+from .models import Blog, SearchTerm, SEARCH_SOURCE_FIELDS
+
+
+# ==========================================================
+# 🔹 Search document indexer (Blog.search_text + SearchTerm)
+# ==========================================================
+# search_text used to be rebuilt inside Blog.save() on every save, which cost
+# a tags query plus lazy category/author loads even for save(update_fields=
+# ['views']). It is now rebuilt only when its inputs change:
+#   - post_save, when title/content/category/author differ from the loaded row
+#   - m2m_changed on Blog.tags
+#   - Category rename, author username change (name compared with the loaded row)
+#   - `manage.py reindex_search` for bulk rebuilds
+# Receivers are wired in signals.py. Blog deletes drop their SearchTerm rows
+# through the FK cascade.
+#
+# The document is HTML-stripped, accent-folded and lowercased; its stemmed
+# tokens are stored in SearchTerm (term → blog, frequency) so a search is an
+# indexed posting-list intersection instead of a LIKE scan over content.
+
+SEARCH_UPDATE_FIELDS = set(SEARCH_SOURCE_FIELDS) | {'category', 'author'}
+MAX_TERM_LENGTH = 64
+
+STOP_WORDS = frozenset("""
+    a an and are as at be but by for from has have he her his i if in into is it
+    its me my no not of on or our she so than that the their them then there
+    these they this to was we were what when which who will with you your
+""".split())
+
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+
+# ----------------------------------------------------------
+# Text pipeline: strip HTML → fold accents/case → tokens → stems
+# ----------------------------------------------------------
+def normalize_text(text):
+    """Plain, lowercased, accent-free text with collapsed whitespace."""
+    # Space before each tag so "<p>a</p><p>b</p>" doesn't become "ab"
+    text = html.unescape(strip_tags(str(text or '').replace('<', ' <')))
+    text = unicodedata.normalize('NFKD', text)
+    text = ''.join(ch for ch in text if not unicodedata.combining(ch))
+    return ' '.join(text.lower().split())
+
+
+def _is_consonant(word, i):
+    ch = word[i]
+    if ch in 'aeiou':
+        return False
+    if ch == 'y':
+        return i == 0 or not _is_consonant(word, i - 1)
+    return True
+
+
+def _measure(word):
+    """Porter's m: number of vowel→consonant transitions."""
+    m = 0
+    prev_vowel = False
+    for i in range(len(word)):
+        consonant = _is_consonant(word, i)
+        if consonant and prev_vowel:
+            m += 1
+        prev_vowel = not consonant
+    return m
+
+
+def _has_vowel(word):
+    return any(not _is_consonant(word, i) for i in range(len(word)))
+
+
+def _ends_cvc(word):
+    return (
+        len(word) >= 3
+        and _is_consonant(word, len(word) - 3)
+        and not _is_consonant(word, len(word) - 2)
+        and _is_consonant(word, len(word) - 1)
+        and word[-1] not in 'wxy'
+    )
+
+
+def stem(word):
+    """
+    Porter stemmer step 1 (plurals, -ed/-ing, terminal y), e.g.
+    blogs → blog, coding → code, stories / story → stori.
+    """
+    if len(word) <= 2 or word.isdigit():
+        return word
+
+    # Step 1a
+    if word.endswith('sses') or word.endswith('ies'):
+        word = word[:-2]
+    elif word.endswith('s') and not word.endswith('ss'):
+        word = word[:-1]
+
+    # Step 1b
+    if word.endswith('eed'):
+        if _measure(word[:-3]) > 0:
+            word = word[:-1]
+    else:
+        for suffix in ('ed', 'ing'):
+            if word.endswith(suffix) and _has_vowel(word[:-len(suffix)]):
+                word = word[:-len(suffix)]
+                if word.endswith(('at', 'bl', 'iz')):
+                    word += 'e'
+                elif len(word) >= 2 and word[-1] == word[-2] and word[-1] not in 'lsz' \
+                        and _is_consonant(word, len(word) - 1):
+                    word = word[:-1]
+                elif _measure(word) == 1 and _ends_cvc(word):
+                    word += 'e'
+                break
+
+    # Step 1c
+    if word.endswith('y') and _has_vowel(word[:-1]):
+        word = word[:-1] + 'i'
+    return word
+
+
+def tokenize(text):
+    """Stemmed index terms for `text` (already-normalized text is fine)."""
+    return [
+        stem(token)[:MAX_TERM_LENGTH]
+        for token in _TOKEN_RE.findall(normalize_text(text))
+        if token not in STOP_WORDS and len(token) > 1
+    ]
+
+
+def build_search_text(title, content, category_name, tag_names, author_name):
+    parts = [
+        title or '',
+        str(content or ''),
+        category_name or '',
+        ' '.join(tag_names),
+        author_name or '',
+    ]
+    return normalize_text(' '.join(parts))
+
+
+# ----------------------------------------------------------
+# Indexing
+# ----------------------------------------------------------
+def needs_reindex(blog, created=False, update_fields=None):
+    if created:
+        return True
+    if update_fields is not None and not SEARCH_UPDATE_FIELDS.intersection(update_fields):
+        return False
+    return getattr(blog, '_search_state', None) != blog.search_source_state()
+
+
+def _sync_terms(blog_id, frequencies):
+    """
+    Diff the blog's stored postings against `frequencies` and apply the
+    changes. Call it holding the blog row lock (index_blog), so two saves of
+    the same blog don't both insert the same posting.
+    """
+    existing = {
+        term: (pk, freq)
+        for pk, term, freq in SearchTerm.objects.filter(blog_id=blog_id).values_list('id', 'term', 'frequency')
+    }
+
+    stale = [pk for term, (pk, _) in existing.items() if term not in frequencies]
+    added = [
+        SearchTerm(term=term, blog_id=blog_id, frequency=freq)
+        for term, freq in frequencies.items() if term not in existing
+    ]
+    changed = [
+        SearchTerm(id=existing[term][0], frequency=freq)
+        for term, freq in frequencies.items()
+        if term in existing and existing[term][1] != freq
+    ]
+
+    if stale:
+        SearchTerm.objects.filter(id__in=stale).delete()
+    if added:
+        SearchTerm.objects.bulk_create(added, ignore_conflicts=True)
+    if changed:
+        SearchTerm.objects.bulk_update(changed, ['frequency'])
+
+
+def index_blog(blog):
+    """Rebuild search_text and postings for one blog."""
+    category_name, author_name = (
+        Blog.objects.filter(pk=blog.pk)
+        .values_list('category__name', 'author__username')
+        .first() or (None, None)
+    )
+    text = build_search_text(
+        blog.title, blog.content, category_name, list(blog.tags.names()), author_name
+    )
+    with transaction.atomic():
+        # Row lock first: concurrent saves of this blog diff the postings one at a time
+        list(Blog.objects.select_for_update().filter(pk=blog.pk).values_list('pk'))
+        Blog.objects.filter(pk=blog.pk).update(search_text=text)
+        _sync_terms(blog.pk, Counter(tokenize(text)))
+    blog.search_text = text
+    blog._search_state = blog.search_source_state()
+    return text
+
+
+def reindex_blogs(queryset=None, chunk_size=500):
+    """
+    Rebuild search_text and postings for every blog in `queryset` (default:
+    all), walking the table by primary key in chunks so memory stays flat.
+    Returns the number of blogs reindexed.
+    """
+    queryset = Blog.objects.all() if queryset is None else queryset
+    queryset = (
+        queryset.select_related('category', 'author')
+        .prefetch_related('tags')
+        .only('id', 'title', 'content', 'search_text', 'category__name', 'author__username')
+        .order_by('pk')
+    )
+
+    total = 0
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            break
+
+        postings = []
+        for blog in chunk:
+            blog.search_text = build_search_text(
+                blog.title,
+                blog.content,
+                blog.category.name if blog.category else '',
+                [tag.name for tag in blog.tags.all()],
+                blog.author.username,
+            )
+            postings.extend(
+                SearchTerm(term=term, blog_id=blog.pk, frequency=freq)
+                for term, freq in Counter(tokenize(blog.search_text)).items()
+            )
+
+        with transaction.atomic():
+            Blog.objects.bulk_update(chunk, ['search_text'])
+            SearchTerm.objects.filter(blog_id__in=[blog.pk for blog in chunk]).delete()
+            SearchTerm.objects.bulk_create(postings, batch_size=1000)
+
+        total += len(chunk)
+        last_pk = chunk[-1].pk
+    return total
+
+
+# ----------------------------------------------------------
+# Querying
+# ----------------------------------------------------------
+def matching_blog_ids(query):
+    """
+    Subquery of blog ids containing every term of `query` (posting-list
+    intersection via GROUP BY ... HAVING on the (term, blog) index), or None
+    if the query has no indexable terms.
+    """
+    terms = set(tokenize(query))
+    if not terms:
+        return None
+    return (
+        SearchTerm.objects.filter(term__in=terms)
+        .values('blog_id')
+        .annotate(matched=Count('id'))
+        .filter(matched=len(terms))
+        .values('blog_id')
+    )
@@ -295,6 +295,7 @@ from django.contrib.auth import authenticate
 from taggit.serializers import TagListSerializerField, TaggitSerializer
 from django.db.models import Count
 
+from .profiling import TimedSerializerMixin
 from .models import (
     CustomUser, Profile, Category, Blog, BlogMedia, Comment,
     Reaction, Bookmark, Notification, UserActivity
@@ -351,7 +352,7 @@ class LoginSerializer(serializers.Serializer):
         return attrs
 
 
-class CustomUserSerializer(serializers.ModelSerializer):
+class CustomUserSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = CustomUser
         fields = ['id', 'username', 'email', 'role', 'email_verified']
@@ -361,11 +362,8 @@ class CustomUserSerializer(serializers.ModelSerializer):
 # 🔹 PROFILE & CATEGORY SERIALIZERS
 # ====================================
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
-    followers_count = serializers.SerializerMethodField()
-    following_count = serializers.SerializerMethodField()
-    bookmarks_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Profile
@@ -373,18 +371,11 @@ class ProfileSerializer(serializers.ModelSerializer):
             'id', 'user', 'bio', 'profile_pic', 'social_links',
             'followers_count', 'following_count', 'bookmarks_count'
         ]
+        # Maintained by blog/counters.py
+        read_only_fields = ['followers_count', 'following_count', 'bookmarks_count']
 
-    def get_followers_count(self, obj):
-        return obj.followers.count()
 
-    def get_following_count(self, obj):
-        return obj.following.count()
-
-    def get_bookmarks_count(self, obj):
-        return obj.bookmarks.count()
-
-
-class CategorySerializer(serializers.ModelSerializer):
+class CategorySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Category
         fields = ['id', 'name', 'slug']
@@ -394,7 +385,7 @@ class CategorySerializer(serializers.ModelSerializer):
 # 🔹 BLOG MEDIA SERIALIZER
 # ====================================
 
-class BlogMediaSerializer(serializers.ModelSerializer):
+class BlogMediaSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     file = serializers.SerializerMethodField()
 
     class Meta:
@@ -412,7 +403,7 @@ class BlogMediaSerializer(serializers.ModelSerializer):
 # 🔹 BLOG SERIALIZER
 # ====================================
 
-class BlogSerializer(TaggitSerializer, serializers.ModelSerializer):
+class BlogSerializer(TimedSerializerMixin, TaggitSerializer, serializers.ModelSerializer):
     author = CustomUserSerializer(read_only=True)
     category = CategorySerializer(read_only=True)
     tags = TagListSerializerField(required=False)
@@ -484,7 +475,7 @@ class BlogSerializer(TaggitSerializer, serializers.ModelSerializer):
 # 🔹 COMMENT SERIALIZER (with Blog Title)
 # ====================================
 
-class BlogMiniSerializer(serializers.ModelSerializer):
+class BlogMiniSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     class Meta:
         model = Blog
         fields = ['id', 'title']
@@ -496,7 +487,7 @@ class RecursiveCommentSerializer(serializers.Serializer):
         return serializer.data
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
     blog = BlogMiniSerializer(read_only=True)
     replies = RecursiveCommentSerializer(many=True, read_only=True)
@@ -510,7 +501,7 @@ class CommentSerializer(serializers.ModelSerializer):
 # 🔹 BOOKMARK, REACTION, NOTIFICATION
 # ====================================
 
-class BookmarkSerializer(serializers.ModelSerializer):
+class BookmarkSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
     blog_title = serializers.CharField(source='blog.title', read_only=True)
 
@@ -519,7 +510,7 @@ class BookmarkSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'blog', 'blog_title', 'created_at']
 
 
-class ReactionSerializer(serializers.ModelSerializer):
+class ReactionSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
     blog = BlogMiniSerializer(read_only=True)
 
@@ -528,7 +519,7 @@ class ReactionSerializer(serializers.ModelSerializer):
         fields = ['id', 'user', 'blog', 'reaction_type', 'created_at']
 
 
-class NotificationSerializer(serializers.ModelSerializer):
+class NotificationSerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)   # receiver
     sender = CustomUserSerializer(read_only=True) # sender
     blog = BlogMiniSerializer(read_only=True)
@@ -536,7 +527,7 @@ class NotificationSerializer(serializers.ModelSerializer):
     class Meta:
         model = Notification
         fields = [
-            'id', 'user', 'sender', 'notification_type', 'blog',
+            'id', 'seq', 'user', 'sender', 'notification_type', 'blog',
             'message', 'is_read', 'created_at'
         ]
 
@@ -545,7 +536,7 @@ class NotificationSerializer(serializers.ModelSerializer):
 # 🔹 USER ACTIVITY SERIALIZER
 # ====================================
 
-class UserActivitySerializer(serializers.ModelSerializer):
+class UserActivitySerializer(TimedSerializerMixin, serializers.ModelSerializer):
     user = CustomUserSerializer(read_only=True)
 
     class Meta:
@@ -1,10 +1,23 @@
 print("✅ blog.signals module loaded successfully")
 
-from django.db.models.signals import post_save, post_delete
-from django.dispatch import receiver
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete, pre_delete, m2m_changed
+from django.dispatch import receiver, Signal
 from channels.layers import get_channel_layer
 from asgiref.sync import async_to_sync
-from .models import Reaction, Comment, Notification
+from .models import Blog, Bookmark, Category, CustomUser, Profile, Comment, Notification, Reaction
+from taggit.models import Tag, TaggedItem
+from . import counters, facets, feed, list_cache, notifications, reactions, search, tag_index
+
+
+# ==========================================================
+# 🔹 Custom signals
+# ==========================================================
+# Sent once per scheduler batch (blog/scheduler.py) after the bulk UPDATE
+# commits, with `blog_ids` = list of newly published blog ids. Cache / feed
+# invalidation hooks should connect here instead of to Blog post_save, which
+# a bulk UPDATE never fires.
+blogs_published = Signal()
 
 
 # ==========================================================
@@ -28,57 +41,282 @@ def broadcast_to_blog(blog_id, event_type, data=None):
         print(f"❌ Error broadcasting to blog group: {e}")
 
 
+def comment_event(comment):
+    """Payload of the "comment_update" broadcast for one comment."""
+    return {
+        "type": "comment_update",
+        "blog_id": comment.blog_id,
+        "comment_id": comment.id,
+        "user": comment.user.username,
+        "content": comment.content,
+    }
+
+
 # ==========================================================
-# 🔹 Reaction: Created / Deleted → Update + Notify
+# 🔹 Search document maintenance (see search.py)
 # ==========================================================
-@receiver([post_save, post_delete], sender=Reaction)
-def handle_reaction_events(sender, instance, **kwargs):
-    blog = instance.blog
-    user = instance.user
+@receiver(post_save, sender=Blog)
+def update_blog_search_text(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if search.needs_reindex(instance, created, update_fields):
+        search.index_blog(instance)
 
-    # 🟣 Updated Reaction Summary (using related_name='reactions')
-    summary = {
-        "like": blog.reactions.filter(reaction_type="like").count(),
-        "love": blog.reactions.filter(reaction_type="love").count(),
-        "laugh": blog.reactions.filter(reaction_type="laugh").count(),
-        "angry": blog.reactions.filter(reaction_type="angry").count(),
-    }
 
-    # 🟢 Broadcast reaction change to all blog viewers
-    broadcast_to_blog(blog.id, "reaction_update", {
-        "type": "reaction_update",
-        "blog_id": blog.id,
-        "reaction_summary": summary,
-        "reacted_by": user.username,
-    })
+@receiver(m2m_changed, sender=Blog.tags.through)
+def update_search_text_on_tag_change(sender, instance, action, pk_set=None, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not isinstance(instance, Blog) or (action != "post_clear" and not pk_set):
+        return
+    search.index_blog(instance)
 
-    # 🔔 Notify blog author (if not same user)
-    if blog.author != user:
-        try:
-            Notification.objects.create(
-                user=blog.author,
-                sender=user,
-                blog=blog,
-                notification_type="reaction",
-                message=f"{user.username} reacted to your post '{blog.title}'."
-            )
 
-            # 🟣 Real-time author WebSocket push
-            channel_layer = get_channel_layer()
-            if channel_layer:
-                async_to_sync(channel_layer.group_send)(
-                    f"user_{blog.author.id}",
-                    {
-                        "type": "send_notification",
-                        "data": {
-                            "title": "❤️ New Reaction",
-                            "message": f"{user.username} reacted to your post '{blog.title}'.",
-                            "blog_id": blog.id,
-                        },
-                    },
-                )
-        except Exception as e:
-            print(f"⚠️ Notification creation failed: {e}")
+def _renamed(instance, field, update_fields):
+    """Did `field` change since `instance` was loaded? (unknown for unloaded instances → True)"""
+    if update_fields is not None and field not in update_fields:
+        return False
+    loaded = getattr(instance, "_search_name", None)
+    current = getattr(instance, field)
+    instance._search_name = current
+    return loaded is None or loaded != current
+
+
+@receiver(post_save, sender=Category)
+def update_search_text_on_category_rename(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    # _renamed() first: it also records the name of newly created rows
+    if raw or not _renamed(instance, "name", update_fields) or created:
+        return
+    search.reindex_blogs(Blog.objects.filter(category=instance))
+
+
+@receiver(post_save, sender=CustomUser)
+def update_search_text_on_username_change(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or not _renamed(instance, "username", update_fields) or created:
+        return
+    search.reindex_blogs(Blog.objects.filter(author=instance))
+
+
+# ==========================================================
+# 🔹 Tag autocomplete index (see tag_index.py)
+# ==========================================================
+@receiver(m2m_changed, sender=Blog.tags.through)
+def update_tag_index_on_tag_change(sender, instance, action, pk_set=None, **kwargs):
+    if action == "post_clear":
+        transaction.on_commit(tag_index.invalidate)
+        return
+    if action not in ("post_add", "post_remove") or not pk_set:
+        return
+    names = list(Tag.objects.filter(pk__in=pk_set).values_list("name", flat=True))
+    delta = 1 if action == "post_add" else -1
+    transaction.on_commit(lambda: tag_index.record_usage(names, delta))
+
+
+@receiver(pre_delete, sender=Blog)
+def remember_tags_before_blog_delete(sender, instance, **kwargs):
+    # The tagged items go with the blog, without an m2m_changed signal
+    tags = list(instance.tags.values_list("id", "name"))
+    instance._deleted_tag_ids = [pk for pk, _ in tags]
+    instance._deleted_tag_names = [name for _, name in tags]
+
+
+@receiver(post_delete, sender=Blog)
+def update_tag_index_on_blog_delete(sender, instance, **kwargs):
+    names = getattr(instance, "_deleted_tag_names", None)
+    if names:
+        transaction.on_commit(lambda: tag_index.record_usage(names, -1))
+
+
+@receiver([post_save, post_delete], sender=Tag)
+def invalidate_tag_index(sender, **kwargs):
+    transaction.on_commit(tag_index.invalidate)
+
+
+# ==========================================================
+# 🔹 Facet counts (see facets.py)
+# ==========================================================
+FACET_UPDATE_FIELDS = {"status", "category", "category_id"}
+
+
+@receiver(post_save, sender=Blog)
+def update_facets_on_blog_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw:
+        return
+    if update_fields is not None and not FACET_UPDATE_FIELDS.intersection(update_fields):
+        return
+    old_status, old_category = (None, None) if created else getattr(instance, "_facet_state", (None, None))
+    new_status, new_category = instance.facet_state()
+    if "published" not in (old_status, new_status) or (old_status, old_category) == (new_status, new_category):
+        return
+    tag_ids = [] if created else list(instance.tags.values_list("id", flat=True))
+    facets.refresh(category_ids=[old_category, new_category], tag_ids=tag_ids)
+
+
+@receiver(m2m_changed, sender=Blog.tags.through)
+def update_facets_on_tag_change(sender, instance, action, pk_set=None, **kwargs):
+    if not isinstance(instance, Blog):
+        return
+    if action == "pre_clear":
+        instance._cleared_tag_ids = list(instance.tags.values_list("id", flat=True))
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_tag_ids", None)
+    elif action not in ("post_add", "post_remove"):
+        return
+    if pk_set and instance.status == "published":
+        facets.refresh(tag_ids=pk_set)
+
+
+@receiver(post_delete, sender=Blog)
+def update_facets_on_blog_delete(sender, instance, **kwargs):
+    if instance.status == "published":
+        facets.refresh(category_ids=[instance.category_id], tag_ids=getattr(instance, "_deleted_tag_ids", ()))
+
+
+@receiver(pre_delete, sender=Category)
+def remember_tags_before_category_delete(sender, instance, **kwargs):
+    # Its blogs become uncategorized (SET_NULL), which moves their (tag, NULL) counts
+    instance._facet_tag_ids = list(
+        TaggedItem.objects.filter(
+            content_type=facets.blog_content_type(),
+            object_id__in=facets.published_blogs().filter(category=instance).values("id"),
+        ).values_list("tag_id", flat=True).distinct()
+    )
+
+
+@receiver(post_delete, sender=Category)
+def update_facets_on_category_delete(sender, instance, **kwargs):
+    facets.refresh(tag_ids=getattr(instance, "_facet_tag_ids", ()))
+
+
+@receiver(blogs_published)
+def update_facets_on_publish_batch(sender, blog_ids, **kwargs):
+    facets.refresh_blogs(blog_ids)
+
+
+# ==========================================================
+# 🔹 Cached blog lists (see list_cache.py)
+# ==========================================================
+@receiver(post_save, sender=Blog)
+def invalidate_lists_on_blog_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and "status" not in update_fields):
+        return
+    old_status = None if created else getattr(instance, "_facet_state", (None, None))[0]
+    if "published" in (old_status, instance.status) and old_status != instance.status:
+        transaction.on_commit(list_cache.invalidate)
+
+
+@receiver(post_delete, sender=Blog)
+def invalidate_lists_on_blog_delete(sender, instance, **kwargs):
+    transaction.on_commit(list_cache.invalidate)
+
+
+@receiver(blogs_published)
+def invalidate_lists_on_publish_batch(sender, blog_ids, **kwargs):
+    list_cache.invalidate()
+
+
+# ==========================================================
+# 🔹 Home feed fan-out (see feed.py)
+# ==========================================================
+@receiver(post_save, sender=Blog)
+def update_feeds_on_blog_save(sender, instance, created, update_fields=None, raw=False, **kwargs):
+    if raw or (update_fields is not None and "status" not in update_fields):
+        return
+    old_status = None if created else getattr(instance, "_facet_state", (None, None))[0]
+    new_status = instance.facet_state()[0]
+    if new_status == "published" and old_status != "published":
+        transaction.on_commit(lambda: feed.fan_out([instance.pk]))
+    elif old_status == "published" and new_status != "published":
+        feed.retract([instance.pk])
+
+
+@receiver(blogs_published)
+def update_feeds_on_publish_batch(sender, blog_ids, **kwargs):
+    feed.fan_out(blog_ids)
+
+
+def _follow_pairs(instance, reverse, profile_ids):
+    """(follower user id, followed user id) for a Profile.following change."""
+    user_ids = Profile.objects.filter(pk__in=profile_ids).values_list("user_id", flat=True)
+    if reverse:
+        return [(user_id, instance.user_id) for user_id in user_ids]
+    return [(instance.user_id, user_id) for user_id in user_ids]
+
+
+@receiver(m2m_changed, sender=Profile.following.through)
+def update_feed_on_follow(sender, instance, action, reverse, pk_set=None, **kwargs):
+    if action == "pre_clear":
+        related = instance.followers if reverse else instance.following
+        instance._cleared_follow_ids = list(related.values_list("pk", flat=True))
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_follow_ids", None)
+    elif action not in ("post_add", "post_remove"):
+        return
+    if not pk_set:
+        return
+
+    pairs = _follow_pairs(instance, reverse, pk_set)
+    if action == "post_add":
+        feed.backfill(pairs)
+    else:
+        feed.unfollow(pairs)
+
+
+# ==========================================================
+# 🔹 Profile counters (see counters.py)
+# ==========================================================
+@receiver(m2m_changed, sender=Profile.following.through)
+def update_follow_counts(sender, instance, action, pk_set=None, **kwargs):
+    if action == "pre_clear":
+        # Both sides of every cleared edge need recounting
+        instance._cleared_counter_ids = list(
+            sender.objects.filter(from_profile=instance).values_list("to_profile_id", flat=True)
+        ) + list(
+            sender.objects.filter(to_profile=instance).values_list("from_profile_id", flat=True)
+        )
+        return
+    if action == "post_clear":
+        pk_set = instance.__dict__.pop("_cleared_counter_ids", [])
+    elif action not in ("post_add", "post_remove") or not pk_set:
+        return
+    counters.refresh_follow_counts([instance.pk, *pk_set])
+
+
+@receiver(post_save, sender=Profile)
+def fill_counters_on_profile_create(sender, instance, created, raw=False, **kwargs):
+    # Profiles are created lazily, possibly after the user bookmarked posts
+    if created and not raw:
+        counters.fill_bookmarks(instance)
+
+
+@receiver(post_save, sender=Bookmark)
+def count_bookmark_added(sender, instance, created, raw=False, **kwargs):
+    if created and not raw:
+        counters.adjust_bookmarks(instance.user_id, 1)
+
+
+@receiver(post_delete, sender=Bookmark)
+def count_bookmark_removed(sender, instance, **kwargs):
+    counters.adjust_bookmarks(instance.user_id, -1)
+
+
+# ==========================================================
+# 🔹 Reaction counts (writes go through reactions.py)
+# ==========================================================
+# Guards for writes that bypass reactions.py: user / blog delete cascades,
+# direct Reaction.objects.create() / .delete(), scripts.
+@receiver(post_save, sender=Reaction)
+def count_reaction_created_elsewhere(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not reactions.counted_here():
+        reactions.counted_create(instance)
+
+
+@receiver(post_delete, sender=Reaction)
+def count_reaction_deleted_elsewhere(sender, instance, **kwargs):
+    if not reactions.counted_here():
+        reactions.counted_delete(instance)
 
 
 # ==========================================================
@@ -90,62 +328,38 @@ def handle_comment_events(sender, instance, **kwargs):
     user = instance.user
 
     # 🟢 Broadcast new/removed comment to blog viewers
-    broadcast_to_blog(blog.id, "comment_update", {
-        "type": "comment_update",
-        "blog_id": blog.id,
-        "comment_id": instance.id,
-        "user": user.username,
-        "content": instance.content,
-    })
+    # (BlogConsumer sets _skip_broadcast: it sends the update itself)
+    if not getattr(instance, "_skip_broadcast", False):
+        broadcast_to_blog(blog.id, "comment_update", comment_event(instance))
 
     # 🔔 Notify author (only for creation, not deletion)
-    created = kwargs.get("created", True)
+    created = kwargs.get("created", False)  # post_delete has no "created"
     if created and blog.author != user:
         try:
-            Notification.objects.create(
-                user=blog.author,
+            # 🟣 Stored + real-time WebSocket push to blog author (notifications.py)
+            notifications.create(
+                blog.author_id,
+                f"{user.username} commented on your post '{blog.title}'.",
+                "comment",
                 sender=user,
                 blog=blog,
-                notification_type="comment",
-                message=f"{user.username} commented on your post '{blog.title}'."
+                title="💬 New Comment",
+                comment_id=instance.id,
             )
-
-            # 🟣 Real-time WebSocket push to blog author
-            channel_layer = get_channel_layer()
-            if channel_layer:
-                async_to_sync(channel_layer.group_send)(
-                    f"user_{blog.author.id}",
-                    {
-                        "type": "send_notification",
-                        "data": {
-                            "title": "💬 New Comment",
-                            "message": f"{user.username} commented: '{instance.content}'",
-                            "blog_id": blog.id,
-                            "comment_id": instance.id,
-                        },
-                    },
-                )
         except Exception as e:
             print(f"⚠️ Comment notification failed: {e}")
 
 
 
 
+# ==========================================================
+# 🔹 Notification: Created → cached unread count (notifications.py)
+# ==========================================================
+@receiver(post_save, sender=Notification)
+def count_unread_notification(sender, instance, created, raw=False, **kwargs):
+    if created and not raw and not instance.is_read:
+        notifications.adjust_unread(instance.user_id, 1)
+
+
 def send_notification(user, message, notification_type="general"):
-    notification = Notification.objects.create(
-        user=user, message=message, notification_type=notification_type
-    )
-    channel_layer = get_channel_layer()
-    async_to_sync(channel_layer.group_send)(
-        f"user_{user.id}_notifications",
-        {
-            "type": "send_notification",
-            "value": {
-                "id": notification.id,
-                "message": notification.message,
-                "type": notification.notification_type,
-                "is_read": notification.is_read,
-                "created_at": notification.created_at.strftime("%Y-%m-%d %H:%M"),
-            }
-        }
-    )
+    return notifications.create(user.id, message, notification_type)
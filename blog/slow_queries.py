@@ -0,0 +1,169 @@
+import os
+import re
+import sys
+import threading
+import time
+from collections import OrderedDict
+from contextlib import ExitStack
+from datetime import datetime, timezone
+
+from django.conf import settings
+from django.db import connections
+
+from . import profiling
+
+
+# ==========================================================
+# 🔹 Slow-query capture with code attribution
+# ==========================================================
+# With SLOW_QUERY_CAPTURE on, SlowQueryMiddleware wraps every request's
+# connections; a statement taking SLOW_QUERY_MS or longer is recorded with
+#   - the view that ran it (blog_list_view, ...)
+#   - the innermost line of our own code that triggered it
+#     ("BlogSerializer.get_total_reactions (blog/serializers.py:448)")
+# Entries are deduplicated by fingerprint (the SQL with literals, params and
+# IN lists folded), counting how often and from where each one ran, and kept
+# in an LRU buffer of SLOW_QUERY_BUFFER_SIZE fingerprints: the least
+# recently seen one is dropped first. admin/slow-queries/ downloads it.
+#
+# SLOW_QUERY_MS=0 records every statement: a fingerprint with a high count
+# from one serializer method is an N+1.
+
+MAX_ORIGINS = 10
+MAX_STACK = 8
+MAX_SQL_LENGTH = 2000
+
+_lock = threading.Lock()
+_entries = OrderedDict()  # fingerprint -> entry, least recently seen first
+_skipped_files = {os.path.abspath(__file__), os.path.abspath(profiling.__file__)}
+
+_STRING = re.compile(r"'(?:[^'\\]|\\.|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|\?")
+_IN_LIST = re.compile(r"\(\s*\?(?:\s*,\s*\?)*\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    """The statement with values replaced by ?, so repeats of one query share an entry."""
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = _PLACEHOLDER.sub("?", sql)
+    sql = _IN_LIST.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+def _is_app_frame(filename):
+    return (
+        filename.startswith(str(settings.BASE_DIR))
+        and "site-packages" not in filename
+        and filename not in _skipped_files
+    )
+
+
+def app_stack():
+    """Our own frames on the current stack, innermost first: "Qual.name (path:line)"."""
+    base = str(settings.BASE_DIR) + os.sep
+    stack = []
+    frame = sys._getframe(1)
+    while frame is not None and len(stack) < MAX_STACK:
+        code = frame.f_code
+        filename = os.path.abspath(code.co_filename)
+        if _is_app_frame(filename):
+            name = getattr(code, "co_qualname", code.co_name)
+            stack.append(f"{name} ({filename.removeprefix(base)}:{frame.f_lineno})")
+        frame = frame.f_back
+    return stack
+
+
+def capture(sql, duration_ms, view, stack):
+    key = fingerprint(sql)
+    origin = stack[0] if stack else "<unknown>"
+    now = datetime.now(timezone.utc).isoformat()
+
+    with _lock:
+        entry = _entries.get(key)
+        if entry is None:
+            entry = _entries[key] = {
+                "fingerprint": key,
+                "example": sql[:MAX_SQL_LENGTH],
+                "count": 0,
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "first_seen": now,
+                "views": {},
+                "origins": {},
+            }
+            while len(_entries) > settings.SLOW_QUERY_BUFFER_SIZE:
+                _entries.popitem(last=False)
+        else:
+            _entries.move_to_end(key)
+
+        entry["count"] += 1
+        entry["total_ms"] += duration_ms
+        entry["max_ms"] = max(entry["max_ms"], duration_ms)
+        entry["last_seen"] = now
+        entry["stack"] = stack
+        entry["views"][view] = entry["views"].get(view, 0) + 1
+        if origin in entry["origins"] or len(entry["origins"]) < MAX_ORIGINS:
+            entry["origins"][origin] = entry["origins"].get(origin, 0) + 1
+
+
+class SlowQueryWrapper:
+    """execute_wrapper: capture statements of `request` slower than SLOW_QUERY_MS."""
+
+    def __init__(self, request):
+        self.request = request
+        self.threshold = settings.SLOW_QUERY_MS / 1000
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - started
+            if elapsed >= self.threshold:
+                try:
+                    capture(sql, elapsed * 1000, profiling.view_name(self.request), app_stack())
+                except Exception as e:
+                    print(f"⚠️ Slow query capture failed: {e}")
+
+
+class SlowQueryMiddleware:
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.SLOW_QUERY_CAPTURE:
+            return self.get_response(request)
+
+        wrapper = SlowQueryWrapper(request)
+        with ExitStack() as stack:
+            for connection in connections.all(initialized_only=False):
+                stack.enter_context(connection.execute_wrapper(wrapper))
+            return self.get_response(request)
+
+
+def report():
+    """Captured fingerprints, most total time first."""
+    with _lock:
+        entries = [
+            {**entry, "views": dict(entry["views"]), "origins": dict(entry["origins"])}
+            for entry in _entries.values()
+        ]
+    for entry in entries:
+        entry["total_ms"] = round(entry["total_ms"], 3)
+        entry["max_ms"] = round(entry["max_ms"], 3)
+        entry["avg_ms"] = round(entry["total_ms"] / entry["count"], 3)
+    entries.sort(key=lambda e: e["total_ms"], reverse=True)
+    return {
+        "enabled": settings.SLOW_QUERY_CAPTURE,
+        "threshold_ms": settings.SLOW_QUERY_MS,
+        "buffer_size": settings.SLOW_QUERY_BUFFER_SIZE,
+        "queries": entries,
+    }
+
+
+def reset():
+    with _lock:
+        _entries.clear()
@@ -0,0 +1,177 @@
+import heapq
+import threading
+import time
+from bisect import bisect_left, insort
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Count
+from taggit.models import Tag
+
+
+# ==========================================================
+# 🔹 Tag autocomplete prefix index
+# ==========================================================
+# tag_suggestions used to run `name__istartswith` against taggit's table on
+# every keystroke. Instead each worker keeps a sorted list of tag names in
+# memory, weighted by how many items use the tag:
+#   - loaded at server startup (asgi.py / wsgi.py) from a cache snapshot
+#     (or the DB), else lazily on first use
+#   - updated in place when this worker changes tags (signals.py)
+#   - reloaded when another worker bumps the shared version key
+# `manage.py warm_tag_index` rebuilds the snapshot so new workers don't
+# have to hit the DB; `invalidate()` is the hook for bulk tag changes.
+
+VERSION_KEY = "tag_index:version"
+SNAPSHOT_KEY = "tag_index:snapshot"
+MEMO_SIZE = 4096
+
+
+class TagPrefixIndex:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.keys = []       # sorted casefolded names
+        self.entries = {}    # casefolded name -> [display name, usage count]
+        self.memo = {}       # (prefix, limit) -> suggestions
+        self.loaded = False
+        self.version = None
+        self.checked_at = 0.0
+
+    def load(self, rows, version):
+        entries = {}
+        for name, count in rows:
+            # taggit is case-sensitive ("Django" / "django"); suggest them once
+            entry = entries.setdefault(name.casefold(), [name, 0])
+            entry[1] += count
+        with self.lock:
+            self.entries = entries
+            self.keys = sorted(entries)
+            self.memo = {}
+            self.loaded = True
+            self.version = version
+            self.checked_at = time.monotonic()
+
+    def adjust(self, name, delta):
+        key = name.casefold()
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is None:
+                if delta <= 0:
+                    return
+                self.entries[key] = [name, delta]
+                insort(self.keys, key)
+            else:
+                entry[1] = max(entry[1] + delta, 0)
+            self.memo = {}
+
+    def suggest(self, prefix, limit=10):
+        key = prefix.casefold()
+        cached = self.memo.get((key, limit))
+        if cached is not None:
+            return cached
+
+        lo = bisect_left(self.keys, key)
+        hi = bisect_left(self.keys, key + "\U0010ffff", lo)
+        keys, entries = self.keys, self.entries
+        # Index the matching range rather than slice it: no copy of every match per keystroke
+        best = heapq.nsmallest(limit, map(keys.__getitem__, range(lo, hi)), key=lambda k: (-entries[k][1], k))
+        result = [entries[k][0] for k in best]
+
+        if len(self.memo) >= MEMO_SIZE:
+            self.memo = {}
+        self.memo[(key, limit)] = result
+        return result
+
+
+tag_index = TagPrefixIndex()
+
+
+def tag_usage_rows():
+    """(name, usage count) for every tag — one GROUP BY over taggit's tables."""
+    return list(
+        Tag.objects.annotate(usage=Count("taggit_taggeditem_items")).values_list("name", "usage")
+    )
+
+
+def _current_version():
+    cache.add(VERSION_KEY, 1, None)
+    return cache.get(VERSION_KEY, 1)
+
+
+def rebuild(from_db=False):
+    """
+    Reload this worker's index from the shared snapshot, or from the DB when
+    the snapshot is missing. `from_db=True` forces a DB rebuild and bumps the
+    version so every worker picks up the fresh snapshot.
+    """
+    rows = None if from_db else cache.get(SNAPSHOT_KEY)
+    if rows is None:
+        rows = tag_usage_rows()
+        cache.set(SNAPSHOT_KEY, rows, None)
+    version = _bump_version() if from_db else _current_version()
+    tag_index.load(rows, version)
+    return len(rows)
+
+
+def ensure_fresh():
+    interval = getattr(settings, "TAG_INDEX_CHECK_SECONDS", 5)
+    if tag_index.loaded and time.monotonic() - tag_index.checked_at < interval:
+        return
+    version = _current_version()
+    if not tag_index.loaded or version != tag_index.version:
+        rebuild()
+    else:
+        tag_index.checked_at = time.monotonic()
+
+
+def warm():
+    """Load this worker's index at startup (asgi.py / wsgi.py) instead of on the first keystroke."""
+    try:
+        return rebuild()
+    except Exception as e:
+        # Not fatal: suggest() loads it lazily instead
+        print(f"⚠️ Tag index warm-up failed: {e}")
+        return 0
+
+
+def suggest(prefix, limit=10):
+    """Popularity-ranked tag names starting with `prefix` (case-insensitive)."""
+    ensure_fresh()
+    return tag_index.suggest(prefix, limit)
+
+
+def _bump_version():
+    try:
+        return cache.incr(VERSION_KEY)
+    except ValueError:
+        cache.set(VERSION_KEY, 1, None)
+        return 1
+
+
+def record_usage(names, delta):
+    """
+    Apply a +/- usage change for tag `names` (called from tag signals).
+    The DB is the source of truth, so the shared snapshot is dropped and the
+    version bumped; other workers reload, this one patches itself in place
+    when it was up to date (otherwise it reloads too).
+    """
+    if not names:
+        return
+    current = tag_index.loaded and tag_index.version == _current_version()
+    if current:
+        for name in names:
+            tag_index.adjust(name, delta)
+
+    cache.delete(SNAPSHOT_KEY)
+    version = _bump_version()
+    if current and version == tag_index.version + 1:
+        tag_index.version = version
+    else:
+        tag_index.loaded = False
+
+
+def invalidate():
+    """Drop the shared snapshot; every worker reloads from the DB on next use."""
+    cache.delete(SNAPSHOT_KEY)
+    _bump_version()
+    tag_index.loaded = False
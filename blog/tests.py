@@ -1,3 +1,1014 @@
-from django.test import TestCase
+import asyncio
+import io
+import random
+import threading
+from collections import Counter
+from contextlib import redirect_stdout
+from datetime import timedelta
 
-# Create your tests here.
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from channels.db import database_sync_to_async
+from channels.routing import URLRouter
+from channels.testing import WebsocketCommunicator
+from django.contrib import admin
+from django.contrib.auth.models import AnonymousUser
+from django.core.cache import cache
+from django.db import connection
+from django.http import HttpResponse
+from django.test import RequestFactory, SimpleTestCase, TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+from taggit.models import Tag
+
+from . import (
+    db_connections, db_router, facets, fast_serializers, feed, interactions, list_cache, notifications, ratelimit, reactions,
+    scheduler, search, tag_index,
+)
+from .admin import ReactionAdmin
+from .channel_layers import TunedInMemoryChannelLayer
+from .models import (
+    Blog, BlogMedia, Bookmark, Category, Comment, CustomUser, FeedEntry, Notification, NotificationCounter,
+    Profile, Reaction, ReactionCount,
+)
+from .routing import websocket_urlpatterns
+from .signals import blogs_published
+from .serializers import BlogSerializer
+
+
+def stored_counts(blog):
+    return {
+        reaction_type: count
+        for reaction_type, count in ReactionCount.objects.filter(blog=blog).values_list("reaction_type", "count")
+        if count
+    }
+
+
+def actual_counts(blog):
+    return dict(Counter(Reaction.objects.filter(blog=blog).values_list("reaction_type", flat=True)))
+
+
+# ==========================================================
+# 🔹 Reactions (blog/reactions.py)
+# ==========================================================
+class ReactionToggleTests(TestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(username="author", email="author@example.com", password="x")
+        self.reader = CustomUser.objects.create_user(username="reader", email="reader@example.com", password="x")
+        self.blog = Blog.objects.create(author=self.author, title="Post", content="<p>Body</p>", status="published")
+
+    def test_toggle_adds_then_removes(self):
+        change = reactions.toggle(self.reader.id, self.blog.id, "like")
+        self.assertEqual((change.previous, change.current), (None, "like"))
+        self.assertEqual(change.summary["like"], 1)
+
+        change = reactions.toggle(self.reader.id, self.blog.id, "like")
+        self.assertIsNone(change.current)
+        self.assertEqual(change.summary["like"], 0)
+        self.assertFalse(Reaction.objects.filter(blog=self.blog).exists())
+
+    def test_toggle_other_type_moves_the_count(self):
+        reactions.toggle(self.reader.id, self.blog.id, "like")
+        change = reactions.toggle(self.reader.id, self.blog.id, "love")
+        self.assertEqual(change.summary, {"like": 0, "love": 1, "laugh": 0, "angry": 0})
+        self.assertEqual(stored_counts(self.blog), actual_counts(self.blog))
+
+    def test_apply_is_idempotent(self):
+        for _ in range(3):
+            change = reactions.apply(self.reader.id, self.blog.id, "laugh")
+        self.assertEqual(change.summary["laugh"], 1)
+        reactions.apply(self.reader.id, self.blog.id, None)
+        reactions.apply(self.reader.id, self.blog.id, None)
+        self.assertEqual(stored_counts(self.blog), {})
+
+    def test_deleting_a_user_drops_their_reactions_from_the_counts(self):
+        reactions.toggle(self.reader.id, self.blog.id, "angry")
+        reactions.toggle(self.author.id, self.blog.id, "angry")
+        self.reader.delete()
+        self.assertEqual(stored_counts(self.blog), {"angry": 1})
+
+    def test_writes_bypassing_reactions_py_are_counted(self):
+        reaction = Reaction.objects.create(user=self.reader, blog=self.blog, reaction_type="love")
+        self.assertEqual(stored_counts(self.blog), {"love": 1})
+        reaction.delete()
+        self.assertEqual(stored_counts(self.blog), {})
+
+    def test_admin_writes_go_through_reactions_py(self):
+        model_admin = ReactionAdmin(Reaction, admin.site)
+        request = RequestFactory().post("/admin/")
+
+        added = Reaction(user=self.reader, blog=self.blog, reaction_type="like")
+        model_admin.save_model(request, added, None, change=False)
+        self.assertIsNotNone(added.pk)
+        model_admin.save_model(request, Reaction(pk=added.pk, user=self.reader, blog=self.blog, reaction_type="laugh"),
+                               None, change=True)
+        Reaction.objects.create(user=self.author, blog=self.blog, reaction_type="laugh")
+        self.assertEqual(stored_counts(self.blog), {"laugh": 2})
+
+        model_admin.delete_model(request, Reaction.objects.get(user=self.author))
+        self.assertEqual(stored_counts(self.blog), {"laugh": 1})
+        model_admin.delete_queryset(request, Reaction.objects.filter(blog=self.blog))
+        self.assertEqual(stored_counts(self.blog), {})
+        self.assertEqual(actual_counts(self.blog), {})
+
+
+class ReactionCountInvariantTests(TestCase):
+    """Serialized random toggles / applies / user deletes; runs on SQLite too."""
+    STEPS = 300
+
+    def test_stored_counts_match_reactions_after_every_write(self):
+        author = CustomUser.objects.create_user(username="author", email="author@example.com", password="x")
+        blog = Blog.objects.create(author=author, title="Post", content="<p>Body</p>", status="published")
+        users = [
+            CustomUser.objects.create_user(username=f"reader{i}", email=f"reader{i}@example.com", password="x")
+            for i in range(6)
+        ]
+        rng = random.Random(0)
+
+        for step in range(self.STEPS):
+            user = rng.choice(users)
+            action = rng.random()
+            if action < 0.5:
+                reactions.toggle(user.id, blog.id, rng.choice(reactions.SUMMARY_TYPES))
+            elif action < 0.95:
+                reactions.apply(user.id, blog.id, rng.choice((None, *reactions.SUMMARY_TYPES)))
+            else:
+                users.remove(user)
+                user.delete()
+                users.append(CustomUser.objects.create_user(
+                    username=f"reader-{step}", email=f"reader-{step}@example.com", password="x"))
+            self.assertEqual(stored_counts(blog), actual_counts(blog), f"step {step}")
+
+        self.assertEqual(
+            reactions.reaction_summary(blog.id),
+            {key: actual_counts(blog).get(key, 0) for key in reactions.SUMMARY_TYPES},
+        )
+
+
+def supports_threaded_writes():
+    """Row locks (MySQL), or a SQLite file in IMMEDIATE mode (blog_project/test_settings.py)."""
+    if connection.features.has_select_for_update:
+        return True
+    return (
+        connection.vendor == "sqlite"
+        and connection.settings_dict["OPTIONS"].get("transaction_mode") == "IMMEDIATE"
+        and not connection.is_in_memory_db()
+    )
+
+
+# Runs under test_settings (SQLite serializes the writers) and against MySQL with
+# the regular settings:  python manage.py test blog.tests.ReactionConcurrencyTests
+class ReactionConcurrencyTests(TransactionTestCase):
+    THREADS_PER_USER = 3
+    USERS = 6
+    ROUNDS = 10
+
+    def setUp(self):
+        if not supports_threaded_writes():
+            self.skipTest("needs row locks or SQLite in IMMEDIATE mode on a file")
+
+    def test_concurrent_batches_over_the_same_blogs(self):
+        author = CustomUser.objects.create_user(username="author", email="author@example.com", password="x")
+        blogs = [
+            Blog.objects.create(author=author, title=f"Post {i}", content="<p>Body</p>", status="published")
+            for i in range(4)
+        ]
+        users = [
+            CustomUser.objects.create_user(username=f"batcher{i}", email=f"batcher{i}@example.com", password="x")
+            for i in range(self.USERS)
+        ]
+        barrier = threading.Barrier(len(users))
+        errors = []
+
+        def batch(i, user):
+            # Same blogs, opposite orders: count rows must be locked in one order
+            ordered = blogs if i % 2 else blogs[::-1]
+            try:
+                barrier.wait()
+                for n in range(self.ROUNDS):
+                    reaction_type = reactions.SUMMARY_TYPES[(i + n) % len(reactions.SUMMARY_TYPES)]
+                    reactions.apply_many(user.id, {blog.id: reaction_type if n % 3 else None for blog in ordered})
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=batch, args=(i, user)) for i, user in enumerate(users)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        for blog in blogs:
+            self.assertEqual(stored_counts(blog), actual_counts(blog))
+
+    def test_concurrent_toggles_keep_counts_exact(self):
+        author = CustomUser.objects.create_user(username="author", email="author@example.com", password="x")
+        blog = Blog.objects.create(author=author, title="Hot post", content="<p>Body</p>", status="published")
+        users = [
+            CustomUser.objects.create_user(username=f"reader{i}", email=f"reader{i}@example.com", password="x")
+            for i in range(self.USERS)
+        ]
+
+        # Several threads per user = double taps racing on the same (user, blog) row
+        jobs = [
+            (user, reactions.SUMMARY_TYPES[(i + n) % len(reactions.SUMMARY_TYPES)])
+            for i, user in enumerate(users)
+            for n in range(self.THREADS_PER_USER)
+        ]
+        barrier = threading.Barrier(len(jobs))
+        errors = []
+
+        def hammer(user, reaction_type):
+            try:
+                barrier.wait()
+                for _ in range(self.ROUNDS):
+                    reactions.toggle(user.id, blog.id, reaction_type)
+            except Exception as e:
+                errors.append(e)
+            finally:
+                connection.close()
+
+        threads = [threading.Thread(target=hammer, args=job) for job in jobs]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(errors, [])
+        self.assertLessEqual(Reaction.objects.filter(blog=blog).count(), self.USERS)
+        self.assertEqual(stored_counts(blog), actual_counts(blog))
+        self.assertEqual(
+            reactions.reaction_summary(blog.id),
+            {key: actual_counts(blog).get(key, 0) for key in reactions.SUMMARY_TYPES},
+        )
+
+
+# ==========================================================
+# 🔹 Batch interaction ingest (blog/interactions.py)
+# ==========================================================
+class CollapseEventsTests(SimpleTestCase):
+    def test_last_state_wins_and_views_add_up(self):
+        reaction_targets, bookmark_targets, views = interactions.collapse_events([
+            {"blog_id": 1, "type": "reaction", "reaction_type": "like"},
+            {"blog_id": 1, "type": "bookmark", "bookmarked": True},
+            {"blog_id": 1, "type": "view"},
+            {"blog_id": 2, "type": "view"},
+            {"blog_id": 1, "type": "reaction", "reaction_type": None},
+            {"blog_id": 1, "type": "bookmark", "bookmarked": False},
+            {"blog_id": 1, "type": "view"},
+        ])
+        self.assertEqual(reaction_targets, {1: None})
+        self.assertEqual(bookmark_targets, {1: False})
+        self.assertEqual(views, {1: 2, 2: 1})
+
+    def test_errors_name_the_offending_event(self):
+        cases = [
+            ({"blog_id": 1}, "type must be one of"),
+            ({"blog_id": True, "type": "view"}, "blog_id must be an integer"),
+            ({"blog_id": 1, "type": "reaction"}, "reaction_type must be one of"),
+            ({"blog_id": 1, "type": "reaction", "reaction_type": "meh"}, "reaction_type must be one of"),
+            ({"blog_id": 1, "type": "bookmark", "bookmarked": "yes"}, "bookmarked must be true or false"),
+            ("view", "expected an object"),
+        ]
+        for event, message in cases:
+            with self.subTest(event=event):
+                with self.assertRaisesMessage(interactions.InvalidEvent, f"events[1]: {message}"):
+                    interactions.collapse_events([{"blog_id": 9, "type": "view"}, event])
+
+    def test_rejects_non_lists_and_oversized_batches(self):
+        with self.assertRaises(interactions.InvalidEvent):
+            interactions.collapse_events({"blog_id": 1, "type": "view"})
+        with self.assertRaises(interactions.InvalidEvent):
+            interactions.collapse_events([{"blog_id": 1, "type": "view"}] * (interactions.MAX_BATCH_EVENTS + 1))
+
+
+class IngestTests(TestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(username="author", email="author@example.com", password="x")
+        self.user = CustomUser.objects.create_user(username="reader", email="reader@example.com", password="x")
+        Profile.objects.create(user=self.user)
+        self.blogs = [
+            Blog.objects.create(author=self.author, title=f"Post {i}", content="<p>Body</p>", status="published")
+            for i in range(3)
+        ]
+
+    def bookmarks_count(self):
+        return Profile.objects.get(user=self.user).bookmarks_count
+
+    def test_applies_a_batch(self):
+        first, second, third = self.blogs
+        Bookmark.objects.create(user=self.user, blog=third)
+        state, summaries, missing = interactions.ingest(self.user, [
+            {"blog_id": first.id, "type": "reaction", "reaction_type": "love"},
+            {"blog_id": first.id, "type": "bookmark", "bookmarked": True},
+            {"blog_id": second.id, "type": "bookmark", "bookmarked": True},
+            {"blog_id": third.id, "type": "bookmark", "bookmarked": False},
+            {"blog_id": second.id, "type": "view"},
+            {"blog_id": second.id, "type": "view"},
+            {"blog_id": 0, "type": "view"},
+        ])
+        self.assertEqual(missing, [0])
+        self.assertEqual(state[first.id], {"is_bookmarked": True, "user_reaction": "love"})
+        self.assertEqual(state[third.id], {"is_bookmarked": False, "user_reaction": None})
+        self.assertEqual(summaries[first.id]["love"], 1)
+        self.assertEqual(stored_counts(first), {"love": 1})
+        self.assertEqual(Blog.objects.get(pk=second.pk).views, 2)
+        self.assertEqual(self.bookmarks_count(), 2)
+
+    def test_replaying_a_batch_changes_nothing(self):
+        events = [{"blog_id": blog.id, "type": "bookmark", "bookmarked": True} for blog in self.blogs]
+        interactions.ingest(self.user, events)
+        interactions.ingest(self.user, events)
+        self.assertEqual(Bookmark.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(self.bookmarks_count(), 3)
+
+    def test_a_bookmark_added_since_the_read_is_counted_once(self):
+        create_many = Bookmark.objects.bulk_create
+
+        def racing(objs, **kwargs):
+            Bookmark.objects.create(user=self.user, blog=self.blogs[0])  # another request wins
+            return create_many(objs, **kwargs)
+
+        events = [{"blog_id": blog.id, "type": "bookmark", "bookmarked": True} for blog in self.blogs]
+        with mock.patch.object(Bookmark.objects, "bulk_create", side_effect=racing):
+            interactions.ingest(self.user, events)
+        self.assertEqual(Bookmark.objects.filter(user=self.user).count(), 3)
+        self.assertEqual(self.bookmarks_count(), 3)
+
+    def test_an_invalid_batch_applies_nothing(self):
+        with self.assertRaises(interactions.InvalidEvent):
+            interactions.ingest(self.user, [
+                {"blog_id": self.blogs[0].id, "type": "bookmark", "bookmarked": True},
+                {"blog_id": self.blogs[0].id, "type": "share"},
+            ])
+        self.assertFalse(Bookmark.objects.exists())
+
+
+# ==========================================================
+# 🔹 Bookmark list (views.user_bookmarks)
+# ==========================================================
+class UserBookmarksTests(TransactionTestCase):
+    # GETs read from the replica alias when one is configured, which only sees committed rows
+    databases = "__all__"
+
+    def setUp(self):
+        self.user = CustomUser.objects.create_user(username="reader", email="reader@example.com", password="x")
+        self.blogs = [
+            Blog.objects.create(author=self.user, title=f"Post {i}", content="<p>Body</p>", status="published")
+            for i in range(5)
+        ]
+        start = timezone.now() - timedelta(hours=1)
+        for minutes, blog in enumerate(self.blogs):
+            bookmark = Bookmark.objects.create(user=self.user, blog=blog)
+            Bookmark.objects.filter(pk=bookmark.pk).update(created_at=start + timedelta(minutes=minutes))
+        self.client = APIClient()
+        self.client.force_authenticate(self.user)
+
+    def get(self, **params):
+        return self.client.get("/api/user/bookmarks/", params)
+
+    def test_without_cursor_returns_the_bare_list(self):
+        response = self.get()
+        self.assertIsInstance(response.data, list)
+        self.assertEqual([row["id"] for row in response.data], [blog.id for blog in reversed(self.blogs)])
+        self.assertEqual(set(response.data[0]), {"id", "title", "created_at"})
+
+    def test_cursor_pages_cover_every_bookmark_once(self):
+        seen, params = [], {"cursor": "", "page_size": 2}
+        while True:
+            response = self.get(**params)
+            seen.extend(row["id"] for row in response.data["results"])
+            if not response.data["next_cursor"]:
+                break
+            params["cursor"] = response.data["next_cursor"]
+        self.assertEqual(seen, [blog.id for blog in reversed(self.blogs)])
+
+    def test_rejects_a_bad_cursor(self):
+        self.assertEqual(self.get(cursor="nope").status_code, 400)
+
+
+# ==========================================================
+# 🔹 Search index (blog/search.py)
+# ==========================================================
+class StemTests(SimpleTestCase):
+    # Porter step 1 reference outputs
+    CASES = [
+        ("caresses", "caress"), ("ponies", "poni"), ("ties", "ti"), ("caress", "caress"), ("cats", "cat"),
+        ("feed", "feed"), ("agreed", "agree"), ("plastered", "plaster"), ("bled", "bled"),
+        ("motoring", "motor"), ("sing", "sing"), ("conflated", "conflate"), ("troubled", "trouble"),
+        ("sized", "size"), ("hopping", "hop"), ("tanned", "tan"), ("falling", "fall"), ("hissing", "hiss"),
+        ("fizzed", "fizz"), ("failing", "fail"), ("filing", "file"), ("happy", "happi"), ("sky", "sky"),
+        ("blogs", "blog"), ("coding", "code"), ("stories", "stori"), ("story", "stori"),
+        ("is", "is"), ("2024", "2024"),
+    ]
+
+    def test_stem(self):
+        for word, expected in self.CASES:
+            with self.subTest(word=word):
+                self.assertEqual(search.stem(word), expected)
+
+    def test_tokenize_strips_html_accents_and_stop_words(self):
+        self.assertEqual(search.tokenize("<p>The Café&amp;Blogs</p><p>are running!</p>"), ["cafe", "blog", "run"])
+
+
+class SearchQueryTests(TestCase):
+    def setUp(self):
+        author = CustomUser.objects.create_user(username="writer", email="writer@example.com", password="x")
+        self.both = Blog.objects.create(author=author, title="Caching in Django", content="<p>Views</p>")
+        self.django = Blog.objects.create(author=author, title="Django forms", content="<p>Widgets</p>")
+        self.cache = Blog.objects.create(author=author, title="Redis caches", content="<p>Keys</p>")
+
+    def matches(self, query):
+        ids = search.matching_blog_ids(query)
+        return None if ids is None else set(ids.values_list("blog_id", flat=True))
+
+    def test_every_term_must_match(self):
+        self.assertEqual(self.matches("django cached"), {self.both.id})
+        self.assertEqual(self.matches("django"), {self.both.id, self.django.id})
+        self.assertEqual(self.matches("django redis"), set())
+
+    def test_stop_words_are_ignored(self):
+        self.assertEqual(self.matches("the caching of the django"), {self.both.id})
+        self.assertIsNone(self.matches("the and of"))
+
+    def test_edits_are_reindexed(self):
+        self.django.title = "Flask forms"
+        self.django.save()
+        self.assertEqual(self.matches("django"), {self.both.id})
+        self.assertEqual(self.matches("flask form"), {self.django.id})
+        self.assertEqual(self.matches("writer"), {self.both.id, self.django.id, self.cache.id})
+
+
+# ==========================================================
+# 🔹 Tag autocomplete (blog/tag_index.py)
+# ==========================================================
+class TagPrefixIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.index = tag_index.TagPrefixIndex()
+        self.index.load([("Django", 5), ("django", 2), ("docker", 9), ("dart", 1), ("python", 20)], version=1)
+
+    def test_ranks_matches_by_usage_then_name(self):
+        self.assertEqual(self.index.suggest("d"), ["docker", "Django", "dart"])
+        self.assertEqual(self.index.suggest("D", limit=2), ["docker", "Django"])
+        self.assertEqual(self.index.suggest("dj"), ["Django"])
+        self.assertEqual(self.index.suggest("z"), [])
+
+    def test_adjust_updates_the_ranking(self):
+        self.assertEqual(self.index.suggest("d", limit=1), ["docker"])
+        self.index.adjust("dart", 10)
+        self.index.adjust("deno", 1)
+        self.assertEqual(self.index.suggest("d", limit=1), ["dart"])
+        self.assertEqual(self.index.suggest("de"), ["deno"])
+
+
+# ==========================================================
+# 🔹 Facet counts (blog/facets.py)
+# ==========================================================
+class FacetCountTests(TestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(username="writer", email="writer@example.com", password="x")
+        self.python = Category.objects.create(name="Python", slug="python")
+        self.web = Category.objects.create(name="Web", slug="web")
+
+    def post(self, category, *tags, status="published"):
+        blog = Blog.objects.create(author=self.author, title="Post", content="<p>Body</p>",
+                                   status=status, category=category)
+        blog.tags.add(*tags)
+        return Blog.objects.get(pk=blog.pk)
+
+    def tag_ids(self, *names):
+        return list(Tag.objects.filter(name__in=names).values_list("id", flat=True))
+
+    def counts(self, category_ids=None, tag_ids=None):
+        """{category name: n}, {tag name: n} from the tables, checked against a live GROUP BY."""
+        stored = facets.facet_counts(category_ids, tag_ids)
+        live = facets.live_facet_counts(facets.published_blogs(), category_ids, tag_ids)
+        result = (
+            {row["name"]: row["count"] for row in stored["categories"]},
+            {row["name"]: row["count"] for row in stored["tags"]},
+        )
+        self.assertEqual(result, (
+            {row["name"]: row["count"] for row in live["categories"]},
+            {row["name"]: row["count"] for row in live["tags"]},
+        ))
+        return result
+
+    def test_publish_and_unpublish(self):
+        draft = self.post(self.python, "django", status="draft")
+        self.assertEqual(self.counts(), ({}, {}))
+
+        draft.status = "published"
+        draft.save()
+        self.assertEqual(self.counts(), ({"Python": 1}, {"django": 1}))
+
+        draft.status = "draft"
+        draft.save()
+        self.assertEqual(self.counts(), ({}, {}))
+
+    def test_category_change_moves_the_counts(self):
+        blog = self.post(self.python, "django")
+        blog.category = self.web
+        blog.save()
+        self.assertEqual(self.counts(), ({"Web": 1}, {"django": 1}))
+        self.assertEqual(self.counts(category_ids=[self.python.id]), ({"Web": 1}, {}))
+
+    def test_tag_add_remove_and_clear(self):
+        blog = self.post(self.python, "django")
+        blog.tags.add("orm")
+        self.assertEqual(self.counts()[1], {"django": 1, "orm": 1})
+        blog.tags.remove("django")
+        self.assertEqual(self.counts()[1], {"orm": 1})
+        blog.tags.clear()
+        self.assertEqual(self.counts(), ({"Python": 1}, {}))
+
+    def test_multi_tag_filter_counts_each_blog_once(self):
+        self.post(self.python, "django", "orm")
+        self.post(self.python, "django")
+        self.post(self.web, "orm")
+        categories, _ = self.counts(tag_ids=self.tag_ids("django", "orm"))
+        self.assertEqual(categories, {"Python": 2, "Web": 1})
+        categories, _ = self.counts(tag_ids=self.tag_ids("orm"))
+        self.assertEqual(categories, {"Python": 1, "Web": 1})
+
+
+# ==========================================================
+# 🔹 Token buckets (blog/ratelimit.py)
+# ==========================================================
+class FrozenClock:
+    def __init__(self, now=1_000_000.0):
+        self.now = now
+
+    def time(self):
+        return self.now
+
+
+class TokenBucketTests(SimpleTestCase):
+    def setUp(self):
+        cache.clear()
+        self.clock = FrozenClock()
+        patcher = mock.patch.object(ratelimit, "time", self.clock)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def take(self, rate=2, burst=3):
+        return ratelimit.take("test", rate, burst)
+
+    def test_burst_then_refused_with_retry_after(self):
+        self.assertEqual([self.take()[0] for _ in range(3)], [True, True, True])
+        allowed, retry_after = self.take()
+        self.assertFalse(allowed)
+        self.assertAlmostEqual(retry_after, 0.5)
+
+    def test_refused_requests_do_not_drain_the_bucket(self):
+        for _ in range(10):
+            self.take()
+        self.clock.now += 0.5
+        self.assertEqual(self.take(), (True, 0))
+        self.assertFalse(self.take()[0])
+
+    def test_refills_one_token_per_interval_up_to_the_burst(self):
+        for _ in range(3):
+            self.take()
+        self.clock.now += 1.0  # 2 tokens at 2/s
+        self.assertEqual([self.take()[0] for _ in range(3)], [True, True, False])
+
+        self.clock.now += 60  # idle: full again, never more than the burst
+        self.assertEqual([self.take()[0] for _ in range(4)], [True, True, True, False])
+
+    def test_fails_open_when_the_cache_is_down(self):
+        with mock.patch.object(ratelimit, "cache") as broken:
+            broken.incr.side_effect = ConnectionError("cache down")
+            with redirect_stdout(io.StringIO()):
+                self.assertEqual(self.take(), (True, 0))
+
+    @override_settings(DEBUG=False, CACHES={"default": {"BACKEND": "django.core.cache.backends.locmem.LocMemCache"}})
+    def test_per_process_cache_is_flagged(self):
+        self.assertEqual([w.id for w in ratelimit.check_shared_cache(None)], ["blog.W001"])
+
+
+# ==========================================================
+# 🔹 Home feed (blog/feed.py)
+# ==========================================================
+class FeedTests(TestCase):
+    def setUp(self):
+        self.start = timezone.now() - timedelta(days=1)
+        self.reader = self.user("reader")
+        self.author = self.user("author")
+        self.celebrity = self.user("celebrity")
+
+    def user(self, name):
+        user = CustomUser.objects.create_user(username=name, email=f"{name}@example.com", password="x")
+        Profile.objects.create(user=user)
+        return user
+
+    def post(self, author, minutes, status="published"):
+        return Blog.objects.create(
+            author=author, title=f"{author.username} {minutes}", content="<p>Body</p>", status=status,
+            published_at=self.start + timedelta(minutes=minutes) if status == "published" else None,
+        )
+
+    def follow(self, user, *authors):
+        user.profile.following.add(*(author.profile for author in authors))
+
+    def timeline_ids(self, user):
+        return list(FeedEntry.objects.filter(owner=user).order_by("blog_id").values_list("blog_id", flat=True))
+
+    def test_publish_fans_out_and_unpublish_retracts(self):
+        self.follow(self.reader, self.author)
+        with self.captureOnCommitCallbacks(execute=True):
+            blog = self.post(self.author, 1)
+        self.assertEqual(self.timeline_ids(self.reader), [blog.id])
+        self.assertEqual(self.timeline_ids(self.celebrity), [])
+
+        blog = Blog.objects.get(pk=blog.pk)
+        blog.status = "draft"
+        blog.save()
+        self.assertEqual(self.timeline_ids(self.reader), [])
+
+    def test_follow_backfills_and_unfollow_removes(self):
+        first, second = self.post(self.author, 1), self.post(self.author, 2)
+        self.post(self.author, 3, status="draft")
+        undated = self.post(self.author, 4)
+        Blog.objects.filter(pk=undated.pk).update(published_at=None)  # older row: skipped
+
+        self.follow(self.reader, self.author)
+        self.assertEqual(self.timeline_ids(self.reader), [first.id, second.id])
+        self.assertEqual(feed.fan_out([undated.id]), 0)
+
+        self.reader.profile.following.remove(self.author.profile)
+        self.assertEqual(self.timeline_ids(self.reader), [])
+
+    @override_settings(FEED_CELEBRITY_THRESHOLD=1)
+    def test_timeline_merges_celebrity_posts_by_cursor_without_duplicates(self):
+        regular = [self.post(self.author, minutes) for minutes in (1, 4, 5)]
+        famous = [self.post(self.celebrity, minutes) for minutes in (2, 3, 6)]
+        self.follow(self.reader, self.author, self.celebrity)
+        # Fanned out while the celebrity was below the threshold: also in FeedEntry
+        feed.backfill([(self.reader.id, self.celebrity.id)])
+        Profile.objects.filter(user=self.celebrity).update(followers_count=5)
+
+        pages, cursor = [], None
+        # Over the cap on purpose: reading must not trim (or write anything)
+        with self.settings(FEED_MAX_ENTRIES=3), CaptureQueriesContext(connection) as queries:
+            while True:
+                ids, cursor = feed.timeline(self.reader.id, cursor, limit=2)
+                pages.append(ids)
+                if cursor is None:
+                    break
+        newest_first = [blog.id for blog in sorted(regular + famous, key=lambda blog: blog.published_at, reverse=True)]
+        self.assertEqual(pages, [newest_first[0:2], newest_first[2:4], newest_first[4:6]])
+        self.assertFalse([q for q in queries.captured_queries if not q["sql"].lstrip().upper().startswith("SELECT")])
+
+    @override_settings(FEED_MAX_ENTRIES=2)
+    def test_trim_keeps_the_newest_entries(self):
+        blogs = [self.post(self.author, minutes) for minutes in range(4)]
+        FeedEntry.objects.bulk_create(
+            FeedEntry(owner=self.reader, blog=blog, published_at=blog.published_at) for blog in blogs
+        )
+        self.assertEqual(feed.trim_all(), [self.reader.id])
+        self.assertEqual(self.timeline_ids(self.reader), [blogs[2].id, blogs[3].id])
+        self.assertEqual(feed.trim_all(), [])
+
+
+# ==========================================================
+# 🔹 Scheduled publishing (blog/scheduler.py)
+# ==========================================================
+class SchedulerTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.author = CustomUser.objects.create_user(username="author", email="author@example.com", password="x")
+        self.now = timezone.now()
+        self.batches = []
+        blogs_published.connect(self.record, dispatch_uid="scheduler-tests")
+        self.addCleanup(blogs_published.disconnect, dispatch_uid="scheduler-tests")
+
+    def record(self, sender, blog_ids, **kwargs):
+        self.batches.append(sorted(blog_ids))
+
+    def draft(self, minutes):
+        # Scheduled in the future so Blog.save() leaves it a draft
+        blog = Blog.objects.create(
+            author=self.author, title=f"Post {minutes}", content="<p>Body</p>", status="draft",
+            publish_at=self.now + timedelta(days=1),
+        )
+        Blog.objects.filter(pk=blog.pk).update(publish_at=self.now + timedelta(minutes=minutes))
+        return blog
+
+    def test_publishes_due_drafts_in_batches_after_commit(self):
+        due = [self.draft(-30), self.draft(-20), self.draft(-10)]
+        later = self.draft(10)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            published = scheduler.publish_due_blogs(self.now, batch_size=2)
+        self.assertEqual(published, [blog.id for blog in due])
+        self.assertEqual(self.batches, [])  # nothing is sent before commit
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.batches, [[due[0].id, due[1].id], [due[2].id]])
+
+        for blog in Blog.objects.filter(pk__in=published):
+            self.assertEqual(blog.status, "published")
+            self.assertEqual(blog.published_at, blog.publish_at)
+        self.assertEqual(Blog.objects.get(pk=later.pk).status, "draft")
+        self.assertEqual(scheduler.next_publish_at(self.now), self.now + timedelta(minutes=10))
+        self.assertEqual(scheduler.publish_due_blogs(self.now), [])
+
+    def test_a_batch_drops_the_cached_lists(self):
+        blog = self.draft(-5)
+        self.assertEqual(list_cache.get_or_set("trending", lambda: []), [])
+        with self.captureOnCommitCallbacks(execute=True):
+            scheduler.publish_due_blogs(self.now)
+        self.assertEqual(list_cache.get_or_set("trending", lambda: [blog.id]), [blog.id])
+
+
+# ==========================================================
+# 🔹 Notifications (blog/notifications.py, NotificationConsumer)
+# ==========================================================
+def seqs(user):
+    return list(Notification.objects.filter(user=user).order_by("seq").values_list("seq", flat=True))
+
+
+class NotificationSeqTests(TestCase):
+    def setUp(self):
+        self.alice = CustomUser.objects.create_user(username="alice", email="alice@example.com", password="x")
+        self.bob = CustomUser.objects.create_user(username="bob", email="bob@example.com", password="x")
+
+    def test_each_user_gets_their_own_sequence(self):
+        for i in range(3):
+            notifications.create(self.alice.id, f"a{i}", "announcement")
+        notifications.create(self.bob.id, "b0", "announcement")
+        self.assertEqual(seqs(self.alice), [1, 2, 3])
+        self.assertEqual(seqs(self.bob), [1])
+
+    def test_bulk_create_continues_each_sequence(self):
+        notifications.create(self.alice.id, "a0", "announcement")
+        Notification.objects.bulk_create([
+            Notification(user=self.alice, notification_type="announcement", message="a1"),
+            Notification(user=self.bob, notification_type="announcement", message="b0"),
+            Notification(user=self.alice, notification_type="announcement", message="a2"),
+        ])
+        self.assertEqual(seqs(self.alice), [1, 2, 3])
+        self.assertEqual(seqs(self.bob), [1])
+        self.assertEqual(NotificationCounter.objects.get(user=self.alice).last_seq, 3)
+        self.assertEqual(notifications.create(self.alice.id, "a3", "announcement").seq, 4)
+
+
+@override_settings(CHANNEL_LAYERS={"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}})
+class NotificationConsumerTests(TransactionTestCase):
+    def setUp(self):
+        cache.clear()
+        self.alice = CustomUser.objects.create_user(username="alice", email="alice@example.com", password="x")
+        self.bob = CustomUser.objects.create_user(username="bob", email="bob@example.com", password="x")
+        self.mine = [notifications.create(self.alice.id, f"a{i}", "announcement") for i in range(4)]
+        self.theirs = [notifications.create(self.bob.id, f"b{i}", "announcement") for i in range(2)]
+
+    async def connect(self, user, query=""):
+        communicator = WebsocketCommunicator(URLRouter(websocket_urlpatterns), f"/ws/notifications/{query}")
+        communicator.scope["user"] = user
+        connected, _ = await communicator.connect()
+        self.assertTrue(connected)
+        return communicator, await communicator.receive_json_from()
+
+    async def test_since_replays_only_what_was_missed(self):
+        communicator, frame = await self.connect(self.alice, "?since=2")
+        await communicator.disconnect()
+        self.assertEqual(frame["type"], "resume")
+        self.assertEqual(frame["since"], 2)
+        self.assertEqual([n["seq"] for n in frame["notifications"]], [3, 4])
+        self.assertFalse(frame["truncated"])
+        self.assertEqual(frame["unread_count"], 4)
+
+    @override_settings(NOTIFICATION_RESUME_LIMIT=2)
+    async def test_long_gaps_are_truncated(self):
+        communicator, frame = await self.connect(self.alice, "?since=0")
+        await communicator.disconnect()
+        self.assertEqual([n["seq"] for n in frame["notifications"]], [1, 2])
+        self.assertTrue(frame["truncated"])
+
+    async def test_without_since_sends_the_recent_inbox(self):
+        communicator, frame = await self.connect(self.alice, "?since=oops")
+        await communicator.disconnect()
+        self.assertEqual(frame["type"], "initial_notifications")
+        self.assertEqual([n["seq"] for n in frame["notifications"]], [4, 3, 2, 1])
+
+    async def test_bulk_mark_read_only_touches_the_senders_notifications(self):
+        communicator, _ = await self.connect(self.alice)
+        await communicator.send_json_to({
+            "action": "mark_read", "ids": [self.mine[0].id, self.theirs[0].id], "up_to_seq": 1,
+        })
+        frame = await communicator.receive_json_from()
+        await communicator.send_json_to({"action": "mark_read", "up_to_seq": 3})
+        later = await communicator.receive_json_from()
+        await communicator.disconnect()
+
+        self.assertEqual(frame["type"], "notifications_read")
+        self.assertEqual(frame["unread_count"], 3)
+        self.assertEqual(later["unread_count"], 1)
+        read = await database_sync_to_async(
+            lambda: set(Notification.objects.filter(is_read=True).values_list("user__username", "seq"))
+        )()
+        self.assertEqual(read, {("alice", 1), ("alice", 2), ("alice", 3)})
+
+    async def test_bulk_delete_only_touches_the_senders_notifications(self):
+        communicator, _ = await self.connect(self.alice)
+        await communicator.send_json_to({"action": "delete", "ids": [n.id for n in self.theirs] + [self.mine[1].id]})
+        frame = await communicator.receive_json_from()
+        await communicator.send_json_to({"action": "delete", "up_to_seq": 10})
+        later = await communicator.receive_json_from()
+        await communicator.send_json_to({"action": "delete"})
+        error = await communicator.receive_json_from()
+        await communicator.disconnect()
+
+        self.assertEqual((frame["type"], frame["unread_count"]), ("notifications_deleted", 3))
+        self.assertEqual(later["unread_count"], 0)
+        self.assertEqual(error["type"], "error")
+        self.assertEqual(await database_sync_to_async(seqs)(self.alice), [])
+        self.assertEqual(await database_sync_to_async(seqs)(self.bob), [1, 2])
+
+
+# ==========================================================
+# 🔹 In-memory channel layer (blog/channel_layers.py)
+# ==========================================================
+class TunedInMemoryChannelLayerTests(SimpleTestCase):
+    def test_group_send_copies_once_and_isolates_top_level_keys(self):
+        async def exchange():
+            layer = TunedInMemoryChannelLayer()
+            channels = [await layer.new_channel() for _ in range(2)]
+            for channel in channels:
+                await layer.group_add("room", channel)
+            message = {"type": "reaction_update", "reaction_summary": {"like": 1}}
+            await layer.group_send("room", message)
+            first, second = [await layer.receive(channel) for channel in channels]
+            first["type"] = "changed"
+            return message, first, second
+
+        message, first, second = asyncio.run(exchange())
+        self.assertEqual(second["type"], "reaction_update")
+        self.assertIsNot(first["reaction_summary"], message["reaction_summary"])  # the sender's copy is untouched
+        self.assertIs(first["reaction_summary"], second["reaction_summary"])  # shared: handlers mustn't mutate
+
+
+# ==========================================================
+# 🔹 Database thread pool (blog/db_connections.py)
+# ==========================================================
+class DatabaseThreadPoolTests(TransactionTestCase):
+    def setUp(self):
+        self.seen = []
+        self.pool = db_connections.DatabaseThreadPool(self.app, size=2)
+        self.addCleanup(self.call, "/close")
+
+    def probe(self, path):
+        if path == "/close":
+            return connection.close()
+        connection.ensure_connection()
+        self.seen.append((threading.get_ident(), id(connection.connection)))
+
+    async def app(self, scope, receive, send):
+        await sync_to_async(self.probe)(scope["path"])
+        if scope["path"] == "/hold":
+            await self.release.wait()
+
+    def call(self, path="/"):
+        # A fresh loop, as under a server: inside async_to_sync, asgiref would
+        # run sync code back on this (the calling) thread instead
+        asyncio.run(self.pool({"type": "http", "path": path}, None, None))
+
+    def test_requests_on_one_slot_reuse_its_thread_and_connection(self):
+        self.call()
+        self.call()
+        (first_thread, first_connection), (second_thread, second_connection) = self.seen
+        self.assertNotEqual(first_thread, threading.get_ident())
+        self.assertEqual(first_thread, second_thread)
+        self.assertEqual(first_connection, second_connection)
+        self.assertEqual(self.pool.load, [0, 0])
+
+    def test_concurrent_requests_spread_over_the_slots(self):
+        async def overlapping():
+            self.release = asyncio.Event()
+            held = [asyncio.create_task(self.pool({"type": "http", "path": "/hold"}, None, None)) for _ in range(2)]
+            while len(self.seen) < 2:
+                await asyncio.sleep(0.01)
+            self.assertEqual(self.pool.load, [1, 1])
+            self.release.set()
+            await asyncio.gather(*held)
+
+        asyncio.run(overlapping())
+        self.call()
+        self.assertEqual(len({thread for thread, _ in self.seen[:2]}), 2)
+        self.assertIn(self.seen[2], self.seen[:2])
+
+
+# ==========================================================
+# 🔹 Primary / replica routing (blog/db_router.py)
+# ==========================================================
+# Needs a "replica" alias: python manage.py test blog --settings=blog_project.test_settings
+@skipUnless(db_router.replica_configured(), "no replica alias in DATABASES")
+class ReplicaRoutingTests(TransactionTestCase):
+    databases = "__all__"
+
+    def setUp(self):
+        cache.clear()
+        self.user = CustomUser.objects.create_user(username="reader", email="reader@example.com", password="x")
+        self.factory = RequestFactory()
+        self.middleware = db_router.ReplicaRoutingMiddleware(
+            lambda request: HttpResponse(Blog.objects.all().db)
+        )
+
+    def request(self, method, user=None):
+        request = getattr(self.factory, method)("/api/blogs/")
+        request.user = user or AnonymousUser()
+        return self.middleware(request).content.decode()
+
+    def test_reads_outside_requests_use_the_primary(self):
+        self.assertEqual(Blog.objects.all().db, "default")
+
+    def test_safe_requests_read_from_the_replica(self):
+        self.assertEqual(self.request("get", self.user), "replica")
+        self.assertEqual(self.request("head", self.user), "replica")
+
+    def test_unsafe_requests_use_the_primary(self):
+        self.assertEqual(self.request("post", self.user), "default")
+
+    def test_user_is_pinned_to_the_primary_after_a_write(self):
+        other = CustomUser.objects.create_user(username="other", email="other@example.com", password="x")
+        self.request("post", self.user)
+        self.assertEqual(self.request("get", self.user), "default")
+        self.assertEqual(self.request("get", other), "replica")
+
+        with override_settings(REPLICA_PIN_SECONDS=0):
+            self.request("delete", self.user)
+        self.assertEqual(self.request("get", self.user), "replica")
+
+    def test_write_switches_the_rest_of_the_request_to_the_primary(self):
+        with db_router.reads_from(db_router.REPLICA):
+            self.assertEqual(Blog.objects.all().db, "replica")
+            CustomUser.objects.filter(pk=self.user.pk).update(role="author")
+            self.assertEqual(Blog.objects.all().db, "default")
+        self.assertEqual(Blog.objects.all().db, "default")
+
+    def test_replica_mirrors_the_primary_in_tests(self):
+        with db_router.reads_from(db_router.REPLICA):
+            self.assertTrue(CustomUser.objects.filter(pk=self.user.pk).exists())
+
+
+# ==========================================================
+# 🔹 Fast list serialization (blog/fast_serializers.py)
+# ==========================================================
+class FastBlogSerializerTests(TestCase):
+    def setUp(self):
+        self.author = CustomUser.objects.create_user(username="author", email="author@example.com", password="x")
+        self.reader = CustomUser.objects.create_user(username="reader", email="reader@example.com", password="x")
+        category = Category.objects.create(name="Python")
+
+        self.full = Blog.objects.create(
+            author=self.author, title="Full", content="<p>Body</p>", markdown_content="**Body**",
+            status="published", category=category, is_featured=True,
+            featured_image="blogs/cover.png", attachments="blog_files/notes.pdf",
+        )
+        self.full.tags.add("django", "python", "orm")
+        BlogMedia.objects.create(blog=self.full, file="blog_media/one.png")
+        BlogMedia.objects.create(blog=self.full, file="blog_media/two.png")
+        Reaction.objects.create(user=self.reader, blog=self.full, reaction_type="wow")
+        Reaction.objects.create(user=self.author, blog=self.full, reaction_type="like")
+        Comment.objects.create(blog=self.full, user=self.reader, content="Nice")
+        Bookmark.objects.create(user=self.reader, blog=self.full)
+
+        self.bare = Blog.objects.create(author=self.reader, title="Bare", content="<p>Short</p>", status="published")
+
+    def request(self, user=None):
+        request = APIRequestFactory().get("/api/blogs/")
+        if user is not None:
+            force_authenticate(request, user=user)
+        return APIView().initialize_request(request)
+
+    def assertSameJSON(self, request):
+        blogs = Blog.objects.order_by("-id")
+        expected = BlogSerializer(
+            blogs.select_related("category", "author").prefetch_related("tags"),
+            many=True, context={"request": request},
+        ).data
+        actual = fast_serializers.serialize_blogs(fast_serializers.blog_rows(blogs), request)
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_matches_blog_serializer_for_anonymous_users(self):
+        self.assertSameJSON(self.request())
+
+    def test_matches_blog_serializer_for_the_reacting_user(self):
+        self.assertSameJSON(self.request(self.reader))
+
+    def test_matches_blog_serializer_without_a_request(self):
+        blogs = Blog.objects.order_by("-id")
+        expected = BlogSerializer(blogs, many=True).data
+        actual = fast_serializers.serialize_blogs(fast_serializers.blog_rows(blogs))
+        self.assertEqual(JSONRenderer().render(actual), JSONRenderer().render(expected))
+
+    def test_query_count_does_not_grow_with_the_page(self):
+        rows = list(fast_serializers.blog_rows(Blog.objects.all()))
+        with self.assertNumQueries(5):
+            fast_serializers.serialize_blogs(rows, self.request())
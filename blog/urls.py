@@ -99,7 +99,9 @@ urlpatterns = [
     # ---------------- Blogs CRUD
     path('blogs/', views.blog_list_view, name='blog-list'),
     path('blogs/trending/', views.trending_blogs_view, name='trending-blogs'),
+    path('feed/', views.feed_view, name='feed'),
     path('blogs/<int:pk>/', views.blog_detail_view, name='blog-detail'),
+    path('blogs/<int:pk>/viewers/', views.blog_viewers_view, name='blog-viewers'),
     path('blogs/create/', views.blog_create_view, name='blog-create'),
     path('blogs/<int:pk>/update/', views.blog_update_view, name='blog-update'),
     path('blogs/<int:pk>/delete/', views.blog_delete_view, name='blog-delete'),
@@ -144,6 +146,8 @@ urlpatterns = [
     path('blogs/<int:blog_id>/bookmark/',
          views.toggle_bookmark, name='toggle-bookmark'),
     path('user/bookmarks/', views.user_bookmarks, name='user-bookmarks'),
+    path('user/interactions/', views.user_interactions_view, name='user-interactions'),
+    path('interactions/batch/', views.interaction_batch_view, name='interaction-batch'),
 
     # ---------------- Notifications
     path('user/notifications/', views.user_notifications_view,
@@ -154,6 +158,12 @@ urlpatterns = [
          name='notification-mark-all-read'),
     path('notifications/<int:pk>/delete/',
          views.delete_notification_view, name='notification-delete'),
+    path('notifications/bulk/mark-read/', views.bulk_mark_notifications_read_view,
+         name='notification-bulk-mark-read'),
+    path('notifications/bulk/delete/', views.bulk_delete_notifications_view,
+         name='notification-bulk-delete'),
+    path('notifications/unread-count/', views.unread_notifications_count_view,
+         name='notification-unread-count'),
 
     # ---------------- Admin Dashboard
     path('admin/dashboard/', views.admin_dashboard, name='admin-dashboard'),
@@ -164,6 +174,11 @@ urlpatterns = [
          views.most_active_users, name='most-active-users'),
     path('admin/trending-blogs/', views.trending_blogs_admin,
          name='trending-blogs-admin'),
+    path('admin/ws-metrics/', views.websocket_metrics_view, name='websocket-metrics'),
+    path('admin/db-metrics/', views.db_connection_metrics_view, name='db-connection-metrics'),
+    path('admin/profiling/', views.profiling_report_view, name='profiling-report'),
+    path('admin/slow-queries/', views.slow_queries_view, name='slow-queries'),
+    path('admin/export/<str:kind>.<str:fmt>', views.export_view, name='admin-export'),
 
 
      path("admin/blogs/", views.admin_blog_list_view, name="admin-blog-list"),
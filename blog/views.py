@@ -3,6 +3,8 @@
 # -------------------------
 from .views_helpers import get_tokens_for_user, clean_user_data
 from django.shortcuts import get_object_or_404
+from django.http import Http404, StreamingHttpResponse
+from django.core.handlers.asgi import ASGIRequest
 from django.utils import timezone
 from django.core.mail import send_mail
 from django.conf import settings
@@ -12,7 +14,7 @@ from django.utils.http import urlsafe_base64_encode, urlsafe_base64_decode
 from django.utils.encoding import force_bytes, force_str
 from django.contrib.auth.tokens import PasswordResetTokenGenerator
 
-from rest_framework.decorators import api_view, permission_classes
+from rest_framework.decorators import api_view, permission_classes, throttle_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny, IsAdminUser
 from rest_framework.response import Response
 from rest_framework import status,permissions
@@ -36,7 +38,7 @@ from asgiref.sync import async_to_sync
 from channels.layers import get_channel_layer
 
 # trnasactions from the db
-from django.db import transaction
+from django.db import router, transaction
 
 # -------------------------
 # Tags & Notifications
@@ -58,6 +60,9 @@ from .serializers import (
     NotificationSerializer, RegisterSerializer, LoginSerializer
 )
 from .utils import profile_completion
+from .search import matching_blog_ids
+from . import cursors, db_connections, exports, facets, fast_serializers, feed, interactions, list_cache, notifications, outbound, presence, profiling, reactions, slow_queries, tag_index
+from .ratelimit import CommentThrottle, ContactThrottle, ReactionThrottle, RegisterThrottle
 from .tokens import account_activation_token
 from django.contrib.auth import get_user_model
 
@@ -92,16 +97,19 @@ def approve_blog(request, blog_id):
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def top_blogs_api(request):
-    top_blogs = Blog.objects.annotate(reactions_count=Count(
-        'reaction')).order_by('-reactions_count')[:5]
-    data = [{
-        'id': blog.id,
-        'title': blog.title,
-        'author': blog.author.username,
-        'reactions_count': blog.reactions_count,
-        'created_at': blog.created_at,
-    } for blog in top_blogs]
-    return Response(data)
+    def top_blogs():
+        ranked = Blog.objects.annotate(reactions_count=Count(
+            'reactions')).order_by('-reactions_count').select_related('author')[:5]
+        return [{
+            'id': blog.id,
+            'title': blog.title,
+            'author': blog.author.username,
+            'reactions_count': blog.reactions_count,
+            'created_at': blog.created_at,
+        } for blog in ranked]
+
+    # Same for everyone: cached (see list_cache.py)
+    return Response(list_cache.get_or_set('top', top_blogs))
 
 
 @api_view(['GET'])
@@ -110,9 +118,12 @@ def tag_suggestions(request):
     q = request.query_params.get('q', '').strip()
     if not q:
         return Response([])
-    tags = Tag.objects.filter(name__istartswith=q).values_list(
-        'name', flat=True)[:10]
-    return Response(list(tags))
+    try:
+        limit = min(max(int(request.query_params.get('limit', 10)), 1), 50)
+    except ValueError:
+        limit = 10
+    # In-memory prefix index ranked by usage (see tag_index.py)
+    return Response(tag_index.suggest(q, limit))
 
 # -------------------------
 # PROFILE & ACTIVITY
@@ -136,6 +147,7 @@ def profile(request):
 
 # Contact Views
 @api_view(['POST'])
+@throttle_classes([ContactThrottle])
 def contact_view(request):
     name = request.data.get("name")
     email = request.data.get("email")
@@ -203,6 +215,7 @@ User = get_user_model()
 
 @api_view(['POST'])
 @permission_classes([AllowAny])
+@throttle_classes([RegisterThrottle])
 def register_view(request):
     username = request.data.get('username')
     email = request.data.get('email')
@@ -567,6 +580,7 @@ def blog_list_view(request):
     """
     ✅ Blog List API with Full Filters + Pagination Support
     Supports: search, category (name or slug), tag, author
+    `?facets=true` adds per-category / per-tag counts for the current filters.
     """
 
     # --- Get query params ---
@@ -574,45 +588,88 @@ def blog_list_view(request):
     category_param = request.query_params.get("category", "").strip()
     tag_param = request.query_params.get("tag", "").strip()
     author_param = request.query_params.get("author", "").strip()
+    want_facets = request.query_params.get("facets", "").lower() in ("1", "true", "yes")
 
     # --- Base queryset (only published blogs) ---
-    blogs = Blog.objects.filter(status="published").select_related("category", "author").prefetch_related("tags").order_by("-published_at")
+    blogs = Blog.objects.filter(status="published")
 
-    # --- Search Filter ---
+    # --- Search Filter (token index, see search.py) ---
     if search:
-        blogs = blogs.filter(
-            Q(title__icontains=search) |
-            Q(content__icontains=search) |
-            Q(author__username__icontains=search)
-        )
+        matches = matching_blog_ids(search)
+        if matches is not None:
+            blogs = blogs.filter(id__in=matches)
+        else:
+            # Nothing indexable (stop words / punctuation only)
+            blogs = blogs.filter(title__icontains=search)
+
+    # --- Author Filter ---
+    if author_param:
+        blogs = blogs.filter(author__username__iexact=author_param)
+
+    # Search / author narrowed set, before the faceted filters
+    unfaceted = blogs
 
     # --- Category Filter (matches by name or slug, case-insensitive) ---
+    category_ids = None
     if category_param and category_param.lower() not in ["all", ""]:
-        blogs = blogs.filter(
-            Q(category__name__iexact=category_param) |
-            Q(category__slug__iexact=category_param)
+        category_ids = list(
+            Category.objects.filter(Q(name__iexact=category_param) | Q(slug__iexact=category_param))
+            .values_list("id", flat=True)
         )
+        blogs = blogs.filter(category_id__in=category_ids)
 
-    # --- Tag Filter ---
+    # --- Tag Filter (semi-join on tag ids, so no DISTINCT needed) ---
+    tag_ids = None
     if tag_param:
-        blogs = blogs.filter(tags__name__iexact=tag_param)
-
-    # --- Author Filter ---
-    if author_param:
-        blogs = blogs.filter(author__username__iexact=author_param)
+        tag_ids = list(Tag.objects.filter(name__iexact=tag_param).values_list("id", flat=True))
+        blogs = facets.filter_by_tags(blogs, tag_ids) if tag_ids else blogs.none()
 
-    # --- Remove Duplicates ---
-    blogs = blogs.distinct()
+    blogs = blogs.order_by("-published_at")
 
-    # --- Pagination ---
+    # --- Pagination (over value rows, see fast_serializers.py) ---
     paginator = BlogPagination()
-    paginated_blogs = paginator.paginate_queryset(blogs, request)
+    paginated_blogs = paginator.paginate_queryset(fast_serializers.blog_rows(blogs), request)
 
-    # --- Serialization ---
-    serializer = BlogSerializer(paginated_blogs, many=True, context={"request": request})
+    # --- Serialization (same JSON as BlogSerializer, a few queries per page) ---
+    data = fast_serializers.serialize_blogs(paginated_blogs, request)
 
     # --- Return Paginated Response ---
-    return paginator.get_paginated_response(serializer.data)
+    response = paginator.get_paginated_response(data)
+
+    # --- Facets: precomputed tables unless search / author narrow the set ---
+    if want_facets:
+        if search or author_param:
+            response.data["facets"] = facets.live_facet_counts(unfaceted, category_ids, tag_ids)
+        else:
+            response.data["facets"] = facets.facet_counts(category_ids, tag_ids)
+    return response
+
+# -------------------------------
+# HOME FEED (followed authors)
+# -------------------------------
+@api_view(["GET"])
+@permission_classes([IsAuthenticated])
+def feed_view(request):
+    """
+    Posts from the authors the user follows, newest first (see feed.py).
+    Cursor-paginated: pass back `next_cursor` as ?cursor= for the next page.
+    """
+    try:
+        limit = min(int(request.query_params.get("page_size", feed.PAGE_SIZE)), feed.MAX_PAGE_SIZE)
+    except ValueError:
+        limit = feed.PAGE_SIZE
+    limit = max(limit, 1)
+
+    try:
+        blog_ids, next_cursor = feed.timeline(request.user.id, request.query_params.get("cursor"), limit)
+    except ValueError:
+        return Response({"error": "Invalid cursor"}, status=status.HTTP_400_BAD_REQUEST)
+
+    rows = fast_serializers.blog_rows(Blog.objects.filter(id__in=blog_ids))
+    by_id = {row["id"]: row for row in rows}
+    ordered = [by_id[pk] for pk in blog_ids if pk in by_id]
+
+    return Response({"results": fast_serializers.serialize_blogs(ordered, request), "next_cursor": next_cursor})
 
 # -------------------------------
 # BLOG DETAILS
@@ -633,6 +690,13 @@ def blog_detail_view(request, pk):
     return Response(serializer.data, status=status.HTTP_200_OK)
 
 
+# Live viewer count (for clients without the blog WebSocket; no DB access)
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def blog_viewers_view(request, pk):
+    return Response({"blog_id": pk, "viewers": presence.viewers(pk)})
+
+
 # myblogs list views
 @api_view(["GET"])
 @permission_classes([IsAuthenticated])
@@ -710,9 +774,13 @@ def trending_blogs_view(request):
     """
     Fetch top 10 trending blogs by view count.
     """
-    blogs = Blog.objects.filter(status='published').order_by('-views')[:10]
-    serializer = BlogSerializer(blogs, many=True, context={'request': request})
-    return Response(serializer.data, status=status.HTTP_200_OK)
+    # The ranking is cached (see list_cache.py); the rows carry per-user fields
+    blog_ids = list_cache.get_or_set('trending', lambda: list(
+        Blog.objects.filter(status='published').order_by('-views').values_list('id', flat=True)[:10]
+    ))
+    by_id = {row["id"]: row for row in fast_serializers.blog_rows(Blog.objects.filter(id__in=blog_ids))}
+    data = fast_serializers.serialize_blogs([by_id[pk] for pk in blog_ids if pk in by_id], request)
+    return Response(data, status=status.HTTP_200_OK)
 
 
 # -------------------------------
@@ -897,49 +965,35 @@ def category_update_delete_view(request, pk):
 
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([ReactionThrottle])
 def toggle_reaction_view(request, blog_id):
     """
     Toggle reaction (like/love/laugh/angry)
-    Real-time update handled automatically via signals.
+    Counts and real-time updates are handled by blog/reactions.py.
     """
     try:
         # 🟣 Step 1: Validate Input
         reaction_type = request.data.get('reaction_type') or request.data.get('reactionType')
-        if reaction_type not in ['like', 'love', 'laugh', 'angry']:
+        if reaction_type not in reactions.SUMMARY_TYPES:
             return Response({"error": "Invalid reaction type"}, status=status.HTTP_400_BAD_REQUEST)
 
         # 🟣 Step 2: Get Blog + User
-        blog = get_object_or_404(Blog, pk=blog_id)
+        blog = get_object_or_404(Blog.objects.only("id", "author_id", "title", "category_id"), pk=blog_id)
         user = request.user
 
-        # 🟣 Step 3: Create or Toggle Reaction
-        reaction, created = Reaction.objects.get_or_create(blog=blog, user=user)
-
-        if not created and reaction.reaction_type == reaction_type:
-            # Same reaction → remove
-            reaction.delete()
-            user_reaction = None
-        else:
-            # Different or new reaction → update
-            reaction.reaction_type = reaction_type
-            reaction.save()
-            user_reaction = reaction_type
-
-        # 🟣 Step 4: Reaction Summary (use blog.reactions instead of reaction_set)
-        summary = {
-            "like": blog.reactions.filter(reaction_type="like").count(),
-            "love": blog.reactions.filter(reaction_type="love").count(),
-            "laugh": blog.reactions.filter(reaction_type="laugh").count(),
-            "angry": blog.reactions.filter(reaction_type="angry").count(),
-        }
+        # 🟣 Step 3: Toggle (one locked write + counter deltas, summary from ReactionCount)
+        change = reactions.toggle(user.id, blog.id, reaction_type)
+        transaction.on_commit(lambda: reactions.notify(change, blog, user))
 
-        # ✅ Step 5: Return Response
+        # ✅ Step 4: Return Response
         return Response({
             "message": "Reaction updated successfully",
-            "reaction_summary": summary,
-            "user_reaction": user_reaction,
+            "reaction_summary": change.summary,
+            "user_reaction": change.current,
         }, status=status.HTTP_200_OK)
 
+    except Http404:
+        raise
     except Exception as e:
         print("❌ Reaction Error:", str(e))
         return Response({"error": str(e)}, status=status.HTTP_500_INTERNAL_SERVER_ERROR)
@@ -1009,6 +1063,7 @@ def comment_list_view(request, blog_id):
 # new Add Comment logic for the Websocket
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
+@throttle_classes([CommentThrottle])
 def add_comment(request, blog_id):
     """
     Add a new comment or reply to a blog.
@@ -1107,16 +1162,88 @@ def toggle_bookmark(request, blog_id):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_bookmarks(request):
-    bookmarks = Bookmark.objects.filter(
-        user=request.user).select_related('blog')
+    """
+    The user's bookmarks, newest first.
+    With ?cursor= (empty for the first page) or ?page_size=: cursor-paginated,
+    {"results": [...], "next_cursor": ...}; pass back `next_cursor` as ?cursor=.
+    Without either: the whole list as a bare array, as before pagination.
+    """
+    bookmarks = Bookmark.objects.filter(user=request.user)
+    if 'cursor' not in request.query_params and 'page_size' not in request.query_params:
+        # Legacy shape for clients that predate pagination (one query, no N+1)
+        return Response([
+            {'id': blog_id, 'title': title, 'created_at': blog_created_at}
+            for blog_id, title, blog_created_at in bookmarks.order_by('-created_at', '-id')
+            .values_list('blog_id', 'blog__title', 'blog__created_at')
+        ])
+
+    try:
+        limit = min(max(int(request.query_params.get('page_size', 20)), 1), 100)
+    except ValueError:
+        limit = 20
+
+    cursor = request.query_params.get('cursor')
+    if cursor:
+        try:
+            bookmarks = bookmarks.filter(cursors.before(*cursors.decode_cursor(cursor), 'created_at', 'id'))
+        except ValueError:
+            return Response({'error': 'Invalid cursor'}, status=status.HTTP_400_BAD_REQUEST)
+
+    page = list(
+        bookmarks.order_by('-created_at', '-id')
+        .values_list('id', 'created_at', 'blog_id', 'blog__title', 'blog__created_at')[:limit + 1]
+    )
+    next_cursor = cursors.encode_cursor(page[limit - 1][1], page[limit - 1][0]) if len(page) > limit else None
+
     data = [
         {
-            'id': b.blog.id,
-            'title': b.blog.title,
-            'created_at': b.blog.created_at
-        } for b in bookmarks
+            'id': blog_id,
+            'title': title,
+            'created_at': blog_created_at,
+            'bookmarked_at': bookmarked_at,
+        } for _, bookmarked_at, blog_id, title, blog_created_at in page[:limit]
     ]
-    return Response(data)
+    return Response({'results': data, 'next_cursor': next_cursor})
+
+
+# Bookmark / reaction state for a page of blogs
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def user_interactions_view(request):
+    """
+    ?ids=1,2,3 → {"1": {"is_bookmarked": true, "user_reaction": "like"}, ...}
+    One query for the whole page instead of a request per card.
+    """
+    try:
+        blog_ids = interactions.parse_blog_ids(request.query_params.getlist('ids'))
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response(interactions.interaction_state(request.user.id, blog_ids))
+
+
+# Batch interaction ingest (offline / flaky clients)
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def interaction_batch_view(request):
+    """
+    POST {"events": [{"blog_id": 1, "type": "reaction", "reaction_type": "like"},
+                     {"blog_id": 1, "type": "bookmark", "bookmarked": true},
+                     {"blog_id": 2, "type": "view"}]}
+    or the bare list of events.
+    Applies the whole batch in one transaction (see interactions.ingest).
+    """
+    events = request.data.get('events') if isinstance(request.data, dict) else request.data
+    try:
+        state, summaries, missing = interactions.ingest(request.user, events)
+    except interactions.InvalidEvent as e:
+        return Response({'error': str(e), 'index': e.index}, status=status.HTTP_400_BAD_REQUEST)
+
+    return Response({
+        'state': state,
+        'reaction_summaries': summaries,
+        'unknown_blog_ids': missing,
+    }, status=status.HTTP_200_OK)
 
 
 # -----------------------------
@@ -1128,9 +1255,18 @@ def user_bookmarks(request):
 @api_view(['GET'])
 @permission_classes([IsAuthenticated])
 def user_notifications_view(request):
-    notifications = Notification.objects.filter(
+    """
+    ?since=<seq> → only newer notifications, oldest first (at most
+    NOTIFICATION_RESUME_LIMIT; "truncated" says there were more).
+    """
+    since = notifications.parse_since(request.query_params.get('since'))
+    if since is not None:
+        missed, truncated = notifications.missed(request.user.id, since)
+        return Response({'results': missed, 'truncated': truncated})
+
+    notification_list = Notification.objects.filter(
         user=request.user).order_by('-created_at')
-    serializer = NotificationSerializer(notifications, many=True)
+    serializer = NotificationSerializer(notification_list, many=True)
     return Response(serializer.data)
 
 
@@ -1140,9 +1276,8 @@ def user_notifications_view(request):
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def mark_notification_read_view(request, pk):
-    notification = get_object_or_404(Notification, pk=pk, user=request.user)
-    notification.is_read = True
-    notification.save()
+    if not notifications.mark_read(request.user.id, ids=[pk]):
+        get_object_or_404(Notification, pk=pk, user=request.user)  # 404 unless already read
     return Response({'message': ' Notification marked as read successfully'})
 
 
@@ -1152,10 +1287,7 @@ def mark_notification_read_view(request, pk):
 @api_view(['PUT'])
 @permission_classes([IsAuthenticated])
 def mark_all_notifications_read_view(request):
-    notifications = Notification.objects.filter(
-        user=request.user, is_read=False)
-    count = notifications.count()
-    notifications.update(is_read=True)
+    count = notifications.mark_read(request.user.id)
     return Response({'message': f' {count} notifications marked as read'})
 
 
@@ -1165,11 +1297,45 @@ def mark_all_notifications_read_view(request):
 @api_view(['DELETE'])
 @permission_classes([IsAuthenticated])
 def delete_notification_view(request, pk):
-    notification = get_object_or_404(Notification, pk=pk, user=request.user)
-    notification.delete()
+    if not notifications.delete(request.user.id, ids=[pk]):
+        raise Http404
     return Response({'message': ' Notification deleted successfully'})
 
 
+# ----------------------------------------------------------
+# 5️ Bulk mark-read / delete ({"ids": [...]} and/or {"up_to_seq": n})
+# ----------------------------------------------------------
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_mark_notifications_read_view(request):
+    try:
+        ids, up_to_seq = notifications.parse_selection(request.data)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    updated = notifications.mark_read(request.user.id, ids, up_to_seq)
+    return Response({'updated': updated, 'unread_count': notifications.unread_count(request.user.id)})
+
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def bulk_delete_notifications_view(request):
+    try:
+        ids, up_to_seq = notifications.parse_selection(request.data)
+    except ValueError as e:
+        return Response({'error': str(e)}, status=status.HTTP_400_BAD_REQUEST)
+    deleted = notifications.delete(request.user.id, ids, up_to_seq)
+    return Response({'deleted': deleted, 'unread_count': notifications.unread_count(request.user.id)})
+
+
+# ----------------------------------------------------------
+# 6️ Unread count (cached)
+# ----------------------------------------------------------
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def unread_notifications_count_view(request):
+    return Response({'unread_count': notifications.unread_count(request.user.id)})
+
+
 # -----------------------------
 # GENERAL STATS
 # -----------------------------
@@ -1248,6 +1414,62 @@ def trending_blogs_admin(request):
     return Response(serializer.data)
 
 
+# WebSocket outbound queue metrics (this worker process)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def websocket_metrics_view(request):
+    return Response(outbound.metrics())
+
+
+# Database connection reuse (this worker process)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def db_connection_metrics_view(request):
+    return Response(db_connections.metrics())
+
+
+# Per-view latency / query percentiles (this worker process); DELETE starts over
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def profiling_report_view(request):
+    if request.method == 'DELETE':
+        profiling.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    return Response(profiling.report())
+
+
+# Captured slow queries as a JSON download (this worker process); DELETE clears
+@api_view(['GET', 'DELETE'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def slow_queries_view(request):
+    if request.method == 'DELETE':
+        slow_queries.reset()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+    response = Response(slow_queries.report())
+    response['Content-Disposition'] = 'attachment; filename="slow-queries.json"'
+    return response
+
+
+# Streaming export: admin/export/<blogs|comments|reactions|users>.<ndjson|csv>
+# Same filters as the admin list views (blogs: ?search= ?status= ?sort=)
+@api_view(['GET'])
+@permission_classes([IsAuthenticated, IsAdmin])
+def export_view(request, kind, fmt):
+    if kind not in exports.EXPORTS or fmt not in exports.FORMATS:
+        return Response({'error': 'Unknown export'}, status=status.HTTP_404_NOT_FOUND)
+
+    params = request.query_params.copy()
+    using = router.db_for_read(Blog)  # replica unless this user is pinned to the primary
+    if isinstance(request._request, ASGIRequest):
+        content = exports.aencode(kind, fmt, params, using)
+    else:
+        content = exports.encode(kind, fmt, params, using)
+
+    response = StreamingHttpResponse(content, content_type=f"{exports.FORMATS[fmt]}; charset=utf-8")
+    response['Content-Disposition'] = f'attachment; filename="{kind}-{timezone.now():%Y%m%d-%H%M%S}.{fmt}"'
+    return response
+
+
 
 
 #  admin_blog_list_view
@@ -1260,25 +1482,8 @@ def admin_blog_list_view(request):
     """
     blogs = Blog.objects.all().select_related("category", "author").prefetch_related("tags").order_by("-created_at")
 
-    search = request.query_params.get("search", "")
-    status = request.query_params.get("status", "")
-    sort = request.query_params.get("sort", "")  # ✅ New
-
-    if search:
-        blogs = blogs.filter(Q(title__icontains=search) | Q(author__username__icontains=search))
-
-    if status:
-        blogs = blogs.filter(status=status)
-
-    # ✅ Sorting Logic
-    if sort == "asc":
-        blogs = blogs.order_by("created_at")
-    elif sort == "desc":
-        blogs = blogs.order_by("-created_at")
-    elif sort == "a-z":
-        blogs = blogs.order_by("title")
-    elif sort == "z-a":
-        blogs = blogs.order_by("-title")
+    # ?search= / ?status= / ?sort= (shared with admin/export/blogs.*)
+    blogs = exports.filter_blogs(blogs, request.query_params).order_by(exports.blog_ordering(request.query_params))
 
     paginator = BlogPagination()
     paginated_blogs = paginator.paginate_queryset(blogs, request)
@@ -1456,7 +1661,8 @@ def reaction_delete(request, pk):
     """
     try:
         reaction = Reaction.objects.get(pk=pk)
-        reaction.delete()
+        # Through reactions.py so ReactionCount stays in step
+        reactions.apply(reaction.user_id, reaction.blog_id, None)
         return Response({"detail": "Reaction deleted successfully"}, status=status.HTTP_204_NO_CONTENT)
     except Reaction.DoesNotExist:
         return Response({"detail": "Reaction not found"}, status=status.HTTP_404_NOT_FOUND)
@@ -4,19 +4,26 @@ from channels.routing import ProtocolTypeRouter, URLRouter
 from django.core.asgi import get_asgi_application
 from channels.auth import AuthMiddlewareStack
 from channels.security.websocket import AllowedHostsOriginValidator
-from blog.routing import websocket_urlpatterns  # 👈 import your websocket routes
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
 
 # Django setup must happen before importing anything using ORM
 django.setup()
 
+from blog.db_connections import DatabaseThreadPool  # noqa: E402
+from blog.routing import websocket_urlpatterns  # noqa: E402  👈 import your websocket routes
+from blog import tag_index  # noqa: E402
+
+# Server processes only (not migrate / other management commands)
+tag_index.warm()
+
 # ✅ ASGI application definition
-application = ProtocolTypeRouter({
+# DatabaseThreadPool: sync code runs on DB_POOL_SIZE long-lived threads, so DB connections persist
+application = DatabaseThreadPool(ProtocolTypeRouter({
     "http": get_asgi_application(),
     "websocket": AllowedHostsOriginValidator(   #  prevents cross-origin issues
         AuthMiddlewareStack(
             URLRouter(websocket_urlpatterns)
         )
     ),
-})
+}))
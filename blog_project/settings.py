@@ -3,6 +3,7 @@ import os
 from datetime import timedelta
 from decouple import config
 from corsheaders.defaults import default_headers  # for CORS headers
+from django.core.exceptions import ImproperlyConfigured
 from decouple import config
 
 
@@ -48,11 +49,15 @@ SITE_ID = 1
 MIDDLEWARE = [
     'corsheaders.middleware.CorsMiddleware',  # ⚡ must be top
     'django.middleware.security.SecurityMiddleware',
+    'blog.profiling.ProfilingMiddleware',  # early, so its timing covers the rest
+    'blog.slow_queries.SlowQueryMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'allauth.account.middleware.AccountMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'blog.db_router.ReplicaRoutingMiddleware',
+    'blog.db_connections.ConnectionStatsMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
     'blog.middleware.UserActivityMiddleware',  # ✅ Add this line
@@ -86,17 +91,53 @@ FRONTEND_URL = config("FRONTEND_URL", default="http://localhost:5173")
 SITE_URL = FRONTEND_URL
 
 
+REDIS_HOST = config("REDIS_HOST", default="127.0.0.1")
+REDIS_PORT = config("REDIS_PORT", cast=int, default=6379)
+
 # # Channels (WebSocket Layer Config)
-CHANNEL_LAYERS = {
-    "default": {
-        "BACKEND": "channels_redis.core.RedisChannelLayer",
-        "CONFIG": {
-            "hosts": [
-                (config("REDIS_HOST", default="127.0.0.1"), config("REDIS_PORT", cast=int, default=6379))
-            ],
+# CHANNEL_LAYER_BACKEND = "redis" (multi-node) or "memory" (single process / tests, no Redis needed)
+CHANNEL_LAYER_BACKEND = config("CHANNEL_LAYER_BACKEND", default="redis")
+
+if CHANNEL_LAYER_BACKEND == "memory":
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "blog.channel_layers.TunedInMemoryChannelLayer",
+            "CONFIG": {
+                "capacity": config("CHANNEL_LAYER_CAPACITY", cast=int, default=1000),
+                "expiry": config("CHANNEL_LAYER_EXPIRY", cast=int, default=60),
+            },
         },
-    },
-}
+    }
+else:
+    CHANNEL_LAYERS = {
+        "default": {
+            "BACKEND": "channels_redis.core.RedisChannelLayer",
+            "CONFIG": {
+                "hosts": [(REDIS_HOST, REDIS_PORT)],
+            },
+        },
+    }
+
+# WebSocket messages a user (or anonymous IP) may send, across all sockets (blog/ratelimit.py)
+WS_MESSAGES_PER_SECOND = config("WS_MESSAGES_PER_SECOND", cast=float, default=2)
+WS_MESSAGE_BURST = config("WS_MESSAGE_BURST", cast=int, default=10)
+
+# /ws/reactions/ global stream (blog/reaction_groups.py): sockets are spread over
+# this many groups; a client may follow up to REACTIONS_MAX_CATEGORIES category topics
+REACTIONS_GROUP_SHARDS = config("REACTIONS_GROUP_SHARDS", cast=int, default=16)
+REACTIONS_MAX_CATEGORIES = config("REACTIONS_MAX_CATEGORIES", cast=int, default=20)
+
+# Messages queued per WebSocket before a slow client is disconnected (blog/outbound.py)
+WS_OUTBOUND_QUEUE_SIZE = config("WS_OUTBOUND_QUEUE_SIZE", cast=int, default=100)
+
+# Live viewer counts (blog/presence.py): heartbeat bucket length, and the minimum
+# gap between presence_update broadcasts for one blog
+PRESENCE_WINDOW_SECONDS = config("PRESENCE_WINDOW_SECONDS", cast=int, default=30)
+PRESENCE_BROADCAST_SECONDS = config("PRESENCE_BROADCAST_SECONDS", cast=int, default=2)
+
+# Most missed notifications replayed on ?since= resume (blog/notifications.py)
+NOTIFICATION_RESUME_LIMIT = config("NOTIFICATION_RESUME_LIMIT", cast=int, default=200)
+NOTIFICATION_UNREAD_CACHE_SECONDS = config("NOTIFICATION_UNREAD_CACHE_SECONDS", cast=int, default=300)
 
 # CHANNEL_LAYERS = {
 #     "default": {
@@ -107,6 +148,37 @@ CHANNEL_LAYERS = {
 #     },
 # }
 
+# Cache (shared state: tag index snapshot, ...)
+# CACHE_BACKEND = "redis" (shared across workers) or "locmem" (per process)
+CACHE_BACKEND = config("CACHE_BACKEND", default="locmem")
+
+if CACHE_BACKEND == "redis":
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": f"redis://{REDIS_HOST}:{REDIS_PORT}/{config('REDIS_CACHE_DB', cast=int, default=1)}",
+        },
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+        },
+    }
+
+# Tag autocomplete: seconds between checks for index changes made by other workers
+TAG_INDEX_CHECK_SECONDS = config("TAG_INDEX_CHECK_SECONDS", cast=float, default=5)
+
+# Home feed (blog/feed.py)
+# Authors with more followers than this aren't fanned out on publish; their
+# posts are merged into each reader's timeline at read time instead.
+FEED_CELEBRITY_THRESHOLD = config("FEED_CELEBRITY_THRESHOLD", cast=int, default=1000)
+FEED_MAX_ENTRIES = config("FEED_MAX_ENTRIES", cast=int, default=800)   # timeline cap per user
+FEED_BACKFILL = config("FEED_BACKFILL", cast=int, default=20)          # recent posts copied on follow
+
+# Trending / top blog rankings are cached this long (blog/list_cache.py)
+BLOG_LIST_CACHE_SECONDS = config("BLOG_LIST_CACHE_SECONDS", cast=int, default=60)
+
 # Database
 DATABASES = {
     'default': {
@@ -119,8 +191,46 @@ DATABASES = {
         'OPTIONS': {
             'init_command': "SET sql_mode='STRICT_TRANS_TABLES'"
         },
+        # Keep connections between requests, ping before reusing (blog/db_connections.py)
+        'CONN_MAX_AGE': config('DB_CONN_MAX_AGE', cast=int, default=60),
+        'CONN_HEALTH_CHECKS': True,
     }
 }
+# Threads (= connections per alias) per ASGI worker for sync views and consumer DB calls;
+# keep workers * DB_POOL_SIZE under MySQL's max_connections
+DB_POOL_SIZE = config('DB_POOL_SIZE', cast=int, default=10)
+# Add X-DB-Connects (connections opened while serving the request) to responses
+DB_CONNECTS_HEADER = config('DB_CONNECTS_HEADER', cast=bool, default=DEBUG)
+
+# Per-view profiling (blog/profiling.py): fraction of requests profiled, "X-Profile: 1" opt-in,
+# requests kept per view for the admin/profiling/ percentiles
+PROFILING_SAMPLE_RATE = config('PROFILING_SAMPLE_RATE', cast=float, default=0.01)
+PROFILING_ALLOW_HEADER = config('PROFILING_ALLOW_HEADER', cast=bool, default=DEBUG)
+PROFILING_SAMPLES_PER_VIEW = config('PROFILING_SAMPLES_PER_VIEW', cast=int, default=500)
+# Slow-query capture (blog/slow_queries.py): statements >= SLOW_QUERY_MS (0 = all, to find N+1s),
+# at most SLOW_QUERY_BUFFER_SIZE distinct fingerprints kept
+SLOW_QUERY_CAPTURE = config('SLOW_QUERY_CAPTURE', cast=bool, default=False)
+SLOW_QUERY_MS = config('SLOW_QUERY_MS', cast=float, default=100)
+SLOW_QUERY_BUFFER_SIZE = config('SLOW_QUERY_BUFFER_SIZE', cast=int, default=500)
+# Rows per query / response chunk in the streaming admin exports (blog/exports.py)
+EXPORT_CHUNK_SIZE = config('EXPORT_CHUNK_SIZE', cast=int, default=1000)
+
+# Read replica (blog/db_router.py): safe-method requests read from it when set
+DB_REPLICA_HOST = config('DB_REPLICA_HOST', default='')
+if DB_REPLICA_HOST:
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'HOST': DB_REPLICA_HOST,
+        'PORT': config('DB_REPLICA_PORT', cast=int, default=DATABASES['default']['PORT']),
+        'TEST': {'MIRROR': 'default'},
+    }
+    # The read-your-writes pin lives in the cache: with locmem only the worker that
+    # served the write would know about it, and the next read could hit the replica
+    if CACHE_BACKEND != 'redis':
+        raise ImproperlyConfigured("DB_REPLICA_HOST needs a shared cache: set CACHE_BACKEND=redis")
+DATABASE_ROUTERS = ['blog.db_router.PrimaryReplicaRouter']
+# Seconds a user keeps reading from the primary after a write (read-your-writes)
+REPLICA_PIN_SECONDS = config('REPLICA_PIN_SECONDS', cast=int, default=5)
 
 # Password Validators
 AUTH_PASSWORD_VALIDATORS = [
@@ -155,6 +265,13 @@ REST_FRAMEWORK = {
     ),
     'DEFAULT_PAGINATION_CLASS': 'blog.pagination.BlogPagination',
     'PAGE_SIZE': 9,
+    # Token buckets (blog/ratelimit.py): "N/period" = bursts of N, refilled over the period
+    'DEFAULT_THROTTLE_RATES': {
+        'comment': config('THROTTLE_COMMENT', default='10/min'),
+        'reaction': config('THROTTLE_REACTION', default='60/min'),
+        'register': config('THROTTLE_REGISTER', default='5/hour'),
+        'contact': config('THROTTLE_CONTACT', default='3/hour'),
+    },
 }
 
 
@@ -14,3 +14,7 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
 
 application = get_wsgi_application()
+
+from blog import tag_index  # noqa: E402
+
+tag_index.warm()  # server processes only, not management commands